@@ -3,33 +3,36 @@
 """
 check_price.py - Polymarket代币价格查询工具
 
-此工具用于查询Polymarket代币的当前市场价格，支持Python 3.12+版本。
-它使用直接HTTP请求获取订单簿信息，不依赖于py-clob-client库。
+此工具用于查询Polymarket代币的当前市场价格，包括最低卖价、最高买价和价差信息，
+支持Python 3.12+版本。
+单个和多个代币都通过/books批量请求获取订单簿，复用同一个连接池(requests.Session)，
+也可以使用--clob-client改用py-clob-client库查询单个代币。
 
 使用方法:
-    python check_price.py <token_id> [--host HOST] [--env-file ENV_FILE]
+    python check_price.py <token_id> [--host HOST] [--env-file ENV_FILE] [--clob-client]
+    python check_price.py <token_id> <token_id> ... [--file TOKENS_FILE] [--json] [--chunk-size N]
 
 依赖项:
     - python-dotenv>=1.0.0
     - urllib3>=2.4.0
     - requests>=2.32.3
 
-该工具用于查询Polymarket代币的当前市场价格，包括最低卖价、最高买价和价差信息。
-通过直接HTTP请求或py-clob-client库查询Polymarket API获取订单簿数据。
-
-使用方法：
-    python check_price.py <token_id> [--host HOST] [--env-file ENV_FILE]
-
 参数：
-    token_id: 要查询的代币ID
+    token_id: 要查询的代币ID，可以有多个
+    --file: 代币ID文件，每行一个，#开头的行为注释(可选)
+    --json: 每个代币输出一行JSON，便于脚本处理(可选)
+    --chunk-size: 每次/books请求的代币数量(可选，默认500)
     --host: API主机地址(可选，默认使用.env中的CLOB_HOST)
     --env-file: 环境变量文件路径(可选，默认为当前目录的.env)
+    --clob-client: 使用py-clob-client库查询(可选，仅单个代币)
 """
 
 import os
 import sys
 import json
+import logging
 import argparse
+import heapq
 import urllib3
 import requests
 from dotenv import load_dotenv
@@ -40,10 +43,33 @@ try:
 except ImportError:
     HAS_CLOB_CLIENT = False
 
+# 作为模块被监控程序导入时只写日志，查询结果由命令行入口打印
+logger = logging.getLogger(__name__)
+
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-def get_token_price(token_id, host=None, proxies=None, use_clob_client=False):
+# /books每次请求的最大代币数量
+BOOKS_CHUNK_SIZE = 500
+
+# 所有HTTP查询共用的连接池，首次使用时创建
+_session = None
+
+# JSON输出的字段
+JSON_FIELDS = (
+    "token_id",
+    "success",
+    "lowest_ask",
+    "lowest_ask_quantity",
+    "highest_bid",
+    "highest_bid_quantity",
+    "spread",
+    "spread_percentage",
+    "timestamp",
+    "error",
+)
+
+def get_token_price(token_id, host=None, proxies=None, use_clob_client=False, client=None):
     """
     获取代币价格信息
     
@@ -52,6 +78,7 @@ def get_token_price(token_id, host=None, proxies=None, use_clob_client=False):
         host: API主机地址(可选)
         proxies: 代理设置(可选)
         use_clob_client: 是否使用py-clob-client库(可选)
+        client: 已初始化的ClobClient(可选)，传入时使用py-clob-client库并复用该客户端
         
     Returns:
         包含价格信息的字典
@@ -88,28 +115,54 @@ def get_token_price(token_id, host=None, proxies=None, use_clob_client=False):
                     proxies["https"] = https_proxy
                     os.environ['HTTPS_PROXY'] = https_proxy
                 
-                print(f"使用代理: HTTP={http_proxy}, HTTPS={https_proxy}")
+                logger.info(f"使用代理: HTTP={http_proxy}, HTTPS={https_proxy}")
         
         # 判断是否使用py-clob-client库
-        if use_clob_client and HAS_CLOB_CLIENT:
-            print(f"使用py-clob-client库获取价格信息...")
-            result = get_price_with_clob_client(token_id, clob_host)
+        if client is not None or (use_clob_client and HAS_CLOB_CLIENT):
+            logger.debug("使用py-clob-client库获取价格信息...")
+            result = get_price_with_clob_client(token_id, clob_host, client)
         else:
-            print(f"使用HTTP请求获取价格信息...")
+            logger.debug("使用HTTP请求获取价格信息...")
             result = get_price_with_http(token_id, clob_host, proxies)
         
     except Exception as e:
-        import traceback
         result["error"] = f"查询价格时出错: {str(e)}"
-        print(f"错误: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"查询价格时出错: {str(e)}")
     
     return result
 
-def get_price_with_http(token_id, host, proxies=None):
-    """使用直接HTTP请求获取价格"""
+def level_size(level):
+    """档位数量 (API返回size字段，兼容旧的amount字段)"""
+    return float(level.get("size", level.get("amount", 0)))
+
+def best_level(levels, highest):
+    """
+    单次遍历找出最优档位(O(n)，不排序)
+    
+    Args:
+        levels: /book返回的档位列表
+        highest: True取最高价(买单)，False取最低价(卖单)
+        
+    Returns:
+        (价格, 档位)，没有档位时为(None, None)
+    """
+    best_price = None
+    best = None
+    for level in levels:
+        price = float(level.get("price", 0))
+        if best_price is None or (price > best_price if highest else price < best_price):
+            best_price = price
+            best = level
+    return best_price, best
+
+def summarize_raw_book(book_data, depth=5):
+    """
+    由/book或/books返回的原始订单簿计算价格信息
+    
+    最优价格单次遍历得到，前depth档用heapq选出，不对整个订单簿排序
+    """
     result = {
-        "success": False,
+        "success": True,
         "lowest_ask": None,
         "lowest_ask_quantity": None,
         "highest_bid": None,
@@ -118,66 +171,81 @@ def get_price_with_http(token_id, host, proxies=None):
         "spread_percentage": None,
         "asks": [],
         "bids": [],
+        "timestamp": book_data.get("timestamp"),
         "error": None
     }
     
-    try:
-        # 构建请求URL
-        book_url = f"{host}/book?token_id={token_id}"
-        print(f"请求URL: {book_url}")
-        
-        # 发送请求
-        response = requests.get(book_url, proxies=proxies)
+    asks = book_data.get("asks") or []
+    bids = book_data.get("bids") or []
+    
+    # 最低卖价
+    lowest_ask, ask = best_level(asks, highest=False)
+    if ask is not None:
+        result["lowest_ask"] = lowest_ask
+        result["lowest_ask_quantity"] = level_size(ask)
+    
+    # 最高买价
+    highest_bid, bid = best_level(bids, highest=True)
+    if bid is not None:
+        result["highest_bid"] = highest_bid
+        result["highest_bid_quantity"] = level_size(bid)
+    
+    if depth:
+        result["asks"] = heapq.nsmallest(depth, asks, key=lambda x: float(x.get("price", 0)))
+        result["bids"] = heapq.nlargest(depth, bids, key=lambda x: float(x.get("price", 0)))
+    
+    # 计算价差
+    if result["lowest_ask"] is not None and result["highest_bid"] is not None:
+        result["spread"] = round(result["lowest_ask"] - result["highest_bid"], 4)
+        if result["lowest_ask"] > 0:
+            result["spread_percentage"] = round(result["spread"] / result["lowest_ask"] * 100, 2)
+    
+    return result
+
+def get_price_with_http(token_id, host, proxies=None):
+    """使用直接HTTP请求获取价格，与批量查询走同一条/books路径和连接池"""
+    return get_token_prices([token_id], host, proxies, depth=5)[0]
+
+def summarize_book(book, depth=5):
+    """
+    由订单簿快照(NumericBook)计算价格信息
+    
+    快照只解析一次，监控程序用同一份快照报价、计算投资金额并传给create_market_order
+    
+    Args:
+        book: client.get_book_snapshot返回的订单簿快照
+        depth: 返回的档位数量
         
-        # 检查响应状态
-        if response.status_code == 200:
-            book_data = response.json()
-            
-            # 提取asks和bids数据
-            asks = book_data.get("asks", [])
-            bids = book_data.get("bids", [])
-            
-            # 处理asks (卖单)
-            if asks and len(asks) > 0:
-                # 排序asks (从低价到高价)
-                sorted_asks = sorted(asks, key=lambda x: float(x.get("price", 0)))
-                result["asks"] = sorted_asks[:5]  # 只获取前5个
-                
-                # 获取最低卖价
-                lowest_ask = sorted_asks[0]
-                result["lowest_ask"] = float(lowest_ask.get("price", 0))
-                result["lowest_ask_quantity"] = float(lowest_ask.get("amount", 0))
-            
-            # 处理bids (买单)
-            if bids and len(bids) > 0:
-                # 排序bids (从高价到低价)
-                sorted_bids = sorted(bids, key=lambda x: float(x.get("price", 0)), reverse=True)
-                result["bids"] = sorted_bids[:5]  # 只获取前5个
-                
-                # 获取最高买价
-                highest_bid = sorted_bids[0]
-                result["highest_bid"] = float(highest_bid.get("price", 0))
-                result["highest_bid_quantity"] = float(highest_bid.get("amount", 0))
-            
-            # 计算价差
-            if result["lowest_ask"] is not None and result["highest_bid"] is not None:
-                result["spread"] = round(result["lowest_ask"] - result["highest_bid"], 4)
-                if result["lowest_ask"] > 0:
-                    result["spread_percentage"] = round(result["spread"] / result["lowest_ask"] * 100, 2)
-            
-            result["success"] = True
-        else:
-            result["error"] = f"HTTP错误: {response.status_code}, {response.text}"
+    Returns:
+        与get_token_price相同格式的结果字典，"book"为快照本身
+    """
+    asks = heapq.nsmallest(depth, zip(book.buy.prices, book.buy.sizes))
+    bids = heapq.nlargest(depth, zip(book.sell.prices, book.sell.sizes))
     
-    except Exception as e:
-        result["error"] = f"获取价格时出错: {str(e)}"
-        import traceback
-        traceback.print_exc()
+    result = {
+        "success": True,
+        "lowest_ask": asks[0][0] if asks else None,
+        "lowest_ask_quantity": asks[0][1] if asks else None,
+        "highest_bid": bids[0][0] if bids else None,
+        "highest_bid_quantity": bids[0][1] if bids else None,
+        "spread": None,
+        "spread_percentage": None,
+        "asks": [{"price": p, "amount": s} for p, s in asks],
+        "bids": [{"price": p, "amount": s} for p, s in bids],
+        "error": None,
+        "book": book,
+    }
+    
+    # 计算价差
+    if result["lowest_ask"] is not None and result["highest_bid"] is not None:
+        result["spread"] = round(result["lowest_ask"] - result["highest_bid"], 4)
+        if result["lowest_ask"] > 0:
+            result["spread_percentage"] = round(result["spread"] / result["lowest_ask"] * 100, 2)
     
     return result
 
-def get_price_with_clob_client(token_id, host):
-    """使用py-clob-client库获取价格"""
+def get_price_with_clob_client(token_id, host, client=None):
+    """使用py-clob-client库获取价格(client可选，传入时复用已初始化的客户端)"""
     result = {
         "success": False,
         "lowest_ask": None,
@@ -192,73 +260,110 @@ def get_price_with_clob_client(token_id, host):
     }
     
     try:
-        # 设置API凭据
-        creds = ApiCreds(
-            api_key=os.getenv("CLOB_API_KEY"),
-            api_secret=os.getenv("CLOB_SECRET"),
-            api_passphrase=os.getenv("CLOB_PASS_PHRASE"),
-        )
-        
-        # 初始化客户端
-        chain_id = 137  # Polygon Mainnet
-        client = ClobClient(host, chain_id=chain_id, creds=creds)
-        
-        # 获取订单簿
-        book = client.get_order_book(token_id)
-        
-        # 处理asks和bids
-        if isinstance(book, dict):
-            # 处理字典格式的响应
-            asks = book.get("asks", [])
-            bids = book.get("bids", [])
-        else:
-            # 处理对象格式的响应
-            asks = book.asks if hasattr(book, 'asks') else []
-            bids = book.bids if hasattr(book, 'bids') else []
-        
-        # 处理asks (卖单)
-        if asks and len(asks) > 0:
-            # 获取asks列表
-            result["asks"] = asks[:5]  # 只获取前5个
+        if client is None:
+            # 设置API凭据
+            creds = ApiCreds(
+                api_key=os.getenv("CLOB_API_KEY"),
+                api_secret=os.getenv("CLOB_SECRET"),
+                api_passphrase=os.getenv("CLOB_PASS_PHRASE"),
+            )
             
-            # 获取最低卖价
-            lowest_ask = asks[0]
-            if isinstance(lowest_ask, dict):
-                result["lowest_ask"] = float(lowest_ask.get("price", 0))
-                result["lowest_ask_quantity"] = float(lowest_ask.get("amount", 0))
-            else:
-                result["lowest_ask"] = float(lowest_ask.price if hasattr(lowest_ask, 'price') else 0)
-                result["lowest_ask_quantity"] = float(lowest_ask.amount if hasattr(lowest_ask, 'amount') else 0)
-        
-        # 处理bids (买单)
-        if bids and len(bids) > 0:
-            # 获取bids列表
-            result["bids"] = bids[:5]  # 只获取前5个
-            
-            # 获取最高买价
-            highest_bid = bids[0]
-            if isinstance(highest_bid, dict):
-                result["highest_bid"] = float(highest_bid.get("price", 0))
-                result["highest_bid_quantity"] = float(highest_bid.get("amount", 0))
-            else:
-                result["highest_bid"] = float(highest_bid.price if hasattr(highest_bid, 'price') else 0)
-                result["highest_bid_quantity"] = float(highest_bid.amount if hasattr(highest_bid, 'amount') else 0)
+            # 初始化客户端
+            chain_id = 137  # Polygon Mainnet
+            client = ClobClient(host, chain_id=chain_id, creds=creds)
         
-        # 计算价差
-        if result["lowest_ask"] is not None and result["highest_bid"] is not None:
-            result["spread"] = round(result["lowest_ask"] - result["highest_bid"], 4)
-            if result["lowest_ask"] > 0:
-                result["spread_percentage"] = round(result["spread"] / result["lowest_ask"] * 100, 2)
-        
-        result["success"] = True
+        # 获取订单簿快照
+        result = summarize_book(client.get_book_snapshot(token_id))
         
     except Exception as e:
         result["error"] = f"使用py-clob-client获取价格时出错: {str(e)}"
-        import traceback
-        traceback.print_exc()
+        logger.exception(result["error"])
     
     return result
 
+def proxies_from_env():
+    """从环境变量读取代理设置"""
+    proxies = {}
+    if os.getenv("HTTP_PROXY"):
+        proxies["http"] = os.getenv("HTTP_PROXY")
+    if os.getenv("HTTPS_PROXY"):
+        proxies["https"] = os.getenv("HTTPS_PROXY")
+    return proxies or None
+
+def get_session():
+    """返回所有HTTP查询共用的requests.Session，代理默认读取环境变量"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.proxies.update(proxies_from_env() or {})
+    return _session
+
+def get_token_prices(token_ids, host=None, proxies=None, chunk_size=BOOKS_CHUNK_SIZE, session=None, depth=0):
+    """
+    批量获取多个代币的价格信息
+    
+    通过/books按chunk_size分批请求，所有请求复用同一个连接池(requests.Session)
+    
+    Args:
+        token_ids: 代币ID列表
+        host: API主机地址(可选)
+        proxies: 代理设置(可选，默认读取环境变量)
+        chunk_size: 每次请求的代币数量
+        session: 复用的requests.Session(可选，默认为get_session())
+        depth: 每个结果返回的档位数量(可选，默认不返回档位)
+        
+    Returns:
+        与token_ids顺序相同的结果字典列表，每个结果包含token_id
+    """
+    clob_host = host if host else os.getenv("CLOB_HOST", "https://clob.polymarket.com")
+    if session is None:
+        session = get_session()
+    
+    books = {}
+    errors = {}
+    for i in range(0, len(token_ids), chunk_size):
+        chunk = token_ids[i:i + chunk_size]
+        try:
+            response = session.post(
+                f"{clob_host}/books",
+                json=[{"token_id": token_id} for token_id in chunk],
+                proxies=proxies,
+                timeout=30,
+            )
+            if response.status_code != 200:
+                raise Exception(f"HTTP错误: {response.status_code}, {response.text}")
+            for book in response.json():
+                books[str(book.get("asset_id"))] = book
+        except Exception as e:
+            for token_id in chunk:
+                errors[token_id] = f"获取价格时出错: {str(e)}"
+    
+    results = []
+    for token_id in token_ids:
+        if token_id in books:
+            result = summarize_raw_book(books[token_id], depth=depth)
+        else:
+            result = summarize_raw_book({}, depth=0)
+            result["success"] = False
+            result["error"] = errors.get(token_id, "未找到订单簿")
+        result["token_id"] = token_id
+        results.append(result)
+    return results
+
+def read_token_file(path):
+    """读取代币ID文件，每行一个，忽略空行和#开头的注释"""
+    token_ids = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                token_ids.append(line)
+    return token_ids
+
+def to_json_line(result):
+    """将结果转换为一行JSON"""
+    return json.dumps({field: result.get(field) for field in JSON_FIELDS}, ensure_ascii=False)
+
 def display_price_info(result):
     """显示价格信息"""
     if result["success"]:
@@ -282,7 +387,7 @@ def display_price_info(result):
             for i, ask in enumerate(result["asks"]):
                 if isinstance(ask, dict):
                     price = ask.get("price", "N/A")
-                    amount = ask.get("amount", "N/A")
+                    amount = ask.get("amount", ask.get("size", "N/A"))
                 else:
                     price = ask.price if hasattr(ask, 'price') else "N/A"
                     amount = ask.amount if hasattr(ask, 'amount') else "N/A"
@@ -294,7 +399,7 @@ def display_price_info(result):
             for i, bid in enumerate(result["bids"]):
                 if isinstance(bid, dict):
                     price = bid.get("price", "N/A")
-                    amount = bid.get("amount", "N/A")
+                    amount = bid.get("amount", bid.get("size", "N/A"))
                 else:
                     price = bid.price if hasattr(bid, 'price') else "N/A"
                     amount = bid.amount if hasattr(bid, 'amount') else "N/A"
@@ -306,11 +411,19 @@ def display_price_info(result):
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description="查询Polymarket代币价格")
-    parser.add_argument("token_id", help="代币ID")
+    parser.add_argument("token_ids", nargs="*", metavar="token_id", help="代币ID，可以有多个")
+    parser.add_argument("--file", help="代币ID文件，每行一个")
     parser.add_argument("--host", help="API主机地址")
     parser.add_argument("--env-file", help=".env文件路径")
     parser.add_argument("--clob-client", action="store_true", help="使用py-clob-client库")
-    return parser.parse_args()
+    parser.add_argument("--json", action="store_true", help="每个代币输出一行JSON")
+    parser.add_argument("--chunk-size", type=int, default=BOOKS_CHUNK_SIZE, help="每次/books请求的代币数量")
+    args = parser.parse_args()
+    if args.file:
+        args.token_ids = args.token_ids + read_token_file(args.file)
+    if not args.token_ids:
+        parser.error("至少需要一个代币ID")
+    return args
 
 def main():
     """主函数"""
@@ -320,11 +433,23 @@ def main():
     env_file = args.env_file if args.env_file else ".env"
     load_dotenv(env_file)
     
+    # 多个代币或JSON输出: 通过/books批量查询
+    if len(args.token_ids) > 1 or args.json:
+        results = get_token_prices(args.token_ids, args.host, chunk_size=args.chunk_size)
+        for result in results:
+            if args.json:
+                print(to_json_line(result))
+            else:
+                print(f"\n代币ID: {result['token_id']}")
+                display_price_info(result)
+        return 0 if all(result["success"] for result in results) else 1
+    
+    token_id = args.token_ids[0]
     print(f"=== Polymarket 价格查询 ===")
-    print(f"代币ID: {args.token_id}")
+    print(f"代币ID: {token_id}")
     
     # 获取价格信息
-    result = get_token_price(args.token_id, args.host, use_clob_client=args.clob_client)
+    result = get_token_price(token_id, args.host, use_clob_client=args.clob_client)
     
     # 显示价格信息
     display_price_info(result)
@@ -332,4 +457,5 @@ def main():
     return 0 if result["success"] else 1
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     sys.exit(main()) 
\ No newline at end of file
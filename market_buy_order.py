@@ -1,64 +1,68 @@
 #!/usr/bin/env python3.12
 import os
 import sys
+import logging
 import argparse
 import urllib3
 from dotenv import load_dotenv
 
+# 作为模块被监控程序导入时只写日志，不直接打印，也不退出进程
+logger = logging.getLogger(__name__)
+
 # 设置项目根目录
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
-print(f"项目根目录: {PROJECT_ROOT}")
+logger.debug(f"项目根目录: {PROJECT_ROOT}")
 
 # 确保项目根目录在Python路径中
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
-    print(f"添加根目录到Python路径: {PROJECT_ROOT}")
+    logger.debug(f"添加根目录到Python路径: {PROJECT_ROOT}")
 
 # 添加py-clob-client目录到Python路径
 PY_CLOB_CLIENT_DIR = os.path.join(PROJECT_ROOT, "py-clob-client")
 if os.path.exists(PY_CLOB_CLIENT_DIR) and PY_CLOB_CLIENT_DIR not in sys.path:
     sys.path.append(PY_CLOB_CLIENT_DIR)
-    print(f"添加模块路径: {PY_CLOB_CLIENT_DIR}")
+    logger.debug(f"添加模块路径: {PY_CLOB_CLIENT_DIR}")
 
 # 禁用SSL警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-# 导入py-clob-client相关模块
+# 导入py-clob-client相关模块，失败时记录错误，到创建客户端时再报错
+IMPORT_ERROR = None
 try:
     from py_clob_client.client import ClobClient
     from py_clob_client.clob_types import ApiCreds, MarketOrderArgs, OrderType
     from py_clob_client.order_builder.constants import BUY
-    print("成功导入py-clob-client模块")
+    logger.debug("成功导入py-clob-client模块")
 except ImportError as e:
-    print(f"导入py-clob-client模块失败: {str(e)}")
-    print("尝试使用备用导入方式...")
+    logger.warning(f"导入py-clob-client模块失败: {str(e)}，尝试使用备用导入方式...")
     try:
         # 尝试直接导入子模块
         sys.path.append(os.path.join(PY_CLOB_CLIENT_DIR, "py_clob_client"))
         from client import ClobClient
         from clob_types import ApiCreds, MarketOrderArgs, OrderType
         from order_builder.constants import BUY
-        print("使用备用方式成功导入py-clob-client模块")
+        logger.debug("使用备用方式成功导入py-clob-client模块")
     except ImportError as e:
-        print(f"备用导入方式也失败: {str(e)}")
-        sys.exit(1)
+        logger.error(f"备用导入方式也失败: {str(e)}")
+        IMPORT_ERROR = e
 
-def execute_market_buy(token_id, amount, host=None, level=None, profit=None):
+def create_client(clob_host):
     """
-    执行市场买单
+    创建带L2凭据的ClobClient，监控程序可以复用它执行多笔交易
     
     Args:
-        token_id: 代币ID
-        amount: 要投入的USDC金额
-        host: API主机地址(可选)
-        level: 交易级别(可选)
-        profit: 目标利润(可选)
+        clob_host: API主机地址
     
     Returns:
-        订单响应
+        ClobClient
+    
+    Raises:
+        ImportError: 无法导入py-clob-client时
     """
-    # 读取环境变量
-    clob_host = host if host else os.getenv("CLOB_HOST")
+    if IMPORT_ERROR is not None:
+        raise ImportError(f"无法导入py-clob-client模块: {IMPORT_ERROR}")
+    
     private_key = os.getenv("PRIVATE_KEY")
     
     # 设置API凭据
@@ -77,31 +81,56 @@ def execute_market_buy(token_id, amount, host=None, level=None, profit=None):
         os.environ['HTTP_PROXY'] = http_proxy
         os.environ['HTTPS_PROXY'] = https_proxy
         
-        # 打印代理设置
-        print(f"使用HTTP代理: {http_proxy}")
-        print(f"使用HTTPS代理: {https_proxy}")
+        # 记录代理设置
+        logger.info(f"使用HTTP代理: {http_proxy}")
+        logger.info(f"使用HTTPS代理: {https_proxy}")
+    
+    # 初始化客户端
+    chain_id = 137  # Polygon Mainnet
+    # 资金钱包地址
+    funder_wallet = os.getenv("WALLET_ADDRESS")
+    logger.info(f"使用资金钱包: {funder_wallet}")
+    
+    client = ClobClient(
+        clob_host, 
+        key=private_key,
+        chain_id=chain_id, 
+        creds=creds,
+        funder=funder_wallet,  # 指定提供资金的钱包地址
+        signature_type=1  # 使用Email/Magic账户关联的签名类型
+    )
+    
+    return client
+
+def execute_market_buy(token_id, amount, host=None, level=None, profit=None, client=None, book=None):
+    """
+    执行市场买单
+    
+    Args:
+        token_id: 代币ID
+        amount: 要投入的USDC金额
+        host: API主机地址(可选)
+        level: 交易级别(可选)
+        profit: 目标利润(可选)
+        client: 已初始化的ClobClient(可选)，监控程序复用同一个客户端
+        book: client.get_book_snapshot返回的订单簿快照(可选)，
+              市价直接由该快照计算，不再重复请求订单簿；超过BOOK_MAX_AGE秒时自动重新获取
     
-    print(f"正在初始化Polymarket客户端...")
-    print(f"主机: {clob_host}")
+    Returns:
+        订单响应
+    """
+    # 读取环境变量
+    clob_host = host if host else os.getenv("CLOB_HOST")
+    
+    logger.info(f"正在初始化Polymarket客户端...")
+    logger.info(f"主机: {clob_host}")
     
     try:
-        # 初始化客户端
-        chain_id = 137  # Polygon Mainnet
-        # 资金钱包地址
-        funder_wallet = os.getenv("WALLET_ADDRESS")
-        print(f"使用资金钱包: {funder_wallet}")
-        
-        client = ClobClient(
-            clob_host, 
-            key=private_key,
-            chain_id=chain_id, 
-            creds=creds,
-            funder=funder_wallet,  # 指定提供资金的钱包地址
-            signature_type=1  # 使用Email/Magic账户关联的签名类型
-        )
+        if client is None:
+            client = create_client(clob_host)
         
-        print(f"正在创建市场买单...")
-        print(f"买入金额: {amount:.4f} USDC (由math_utils.py计算得出)")
+        logger.info(f"正在创建市场买单...")
+        logger.info(f"买入金额: {amount:.4f} USDC (由math_utils.py计算得出)")
         
         # 创建买单参数
         order_args = MarketOrderArgs(
@@ -111,24 +140,23 @@ def execute_market_buy(token_id, amount, host=None, level=None, profit=None):
         )
         
         # 创建并签名订单
-        signed_order = client.create_market_order(order_args)
+        signed_order = client.create_market_order(order_args, book=book)
         
-        print(f"正在提交FOK买单...")
+        logger.info(f"正在提交FOK买单...")
         
         # 发送FOK买单
         resp = client.post_order(signed_order, orderType=OrderType.FOK)
         
-        print(f"订单响应:")
-        print(resp)
+        logger.info(f"订单响应: {resp}")
         
         if resp.get("success") == True:
-            print(f"订单执行成功!")
-            print(f"订单ID: {resp.get('orderID')}")
-            print(f"状态: {resp.get('status')}")
-            print(f"买入数量: {resp.get('makingAmount')}")
-            print(f"花费金额: {resp.get('takingAmount')}")
+            logger.info(f"订单执行成功!")
+            logger.info(f"订单ID: {resp.get('orderID')}")
+            logger.info(f"状态: {resp.get('status')}")
+            logger.info(f"买入数量: {resp.get('makingAmount')}")
+            logger.info(f"花费金额: {resp.get('takingAmount')}")
             if 'transactionsHashes' in resp:
-                print(f"交易哈希: {resp.get('transactionsHashes')}")
+                logger.info(f"交易哈希: {resp.get('transactionsHashes')}")
                 
             # 如果提供了级别，则记录交易信息
             try:
@@ -148,20 +176,18 @@ def execute_market_buy(token_id, amount, host=None, level=None, profit=None):
                     trade = trade_records.create_trade(token_id, market_name, profit, market_price, amount)
                     
                     if trade:
-                        print(f"交易记录已保存，ID: {trade.get('trade_id')}")
+                        logger.info(f"交易记录已保存，ID: {trade.get('trade_id')}")
                     else:
-                        print(f"警告: 无法保存交易记录")
+                        logger.warning(f"无法保存交易记录")
             except Exception as e:
-                print(f"记录交易信息时出错: {str(e)}")
+                logger.error(f"记录交易信息时出错: {str(e)}")
         else:
             error_msg = resp.get("errorMsg", resp.get("error", "未知错误"))
-            print(f"订单执行失败: {error_msg}")
+            logger.error(f"订单执行失败: {error_msg}")
         
         return resp
     except Exception as e:
-        import traceback
-        print(f"执行市场买单时出错: {str(e)}")
-        traceback.print_exc()
+        logger.exception(f"执行市场买单时出错: {str(e)}")
         return {"error": str(e)}
 
 def parse_arguments():
@@ -194,5 +220,8 @@ def main():
     print(f"完成!")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if IMPORT_ERROR is not None:
+        sys.exit(1)
     print(f"=== Polymarket 交易程序 ===")
     main() 
\ No newline at end of file
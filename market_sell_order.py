@@ -43,7 +43,7 @@ except ImportError as e:
         print(f"备用导入方式也失败: {str(e)}")
         sys.exit(1)
 
-def execute_market_sell(token_id, amount, host=None):
+def execute_market_sell(token_id, amount, host=None, client=None, book=None):
     """
     执行市场卖单
     
@@ -51,6 +51,9 @@ def execute_market_sell(token_id, amount, host=None):
         token_id: 代币ID
         amount: 要卖出的shares数量
         host: API主机地址(可选)
+        client: 已初始化的ClobClient(可选)，监控程序复用同一个客户端
+        book: client.get_book_snapshot返回的订单簿快照(可选)，
+              市价直接由该快照计算，不再重复请求订单簿；超过BOOK_MAX_AGE秒时自动重新获取
     
     Returns:
         订单响应
@@ -83,21 +86,22 @@ def execute_market_sell(token_id, amount, host=None):
     print(f"主机: {clob_host}")
     
     try:
-        # 初始化客户端
-        chain_id = 137  # Polygon Mainnet
-        # 资金钱包地址
-        funder_wallet = os.getenv("WALLET_ADDRESS")
-        print(f"使用资金钱包: {funder_wallet}")
+        if client is None:
+            # 初始化客户端
+            chain_id = 137  # Polygon Mainnet
+            # 资金钱包地址
+            funder_wallet = os.getenv("WALLET_ADDRESS")
+            print(f"使用资金钱包: {funder_wallet}")
         
-        # 尝试不使用API凭据，只使用L1认证
-        client = ClobClient(
-            clob_host, 
-            key=private_key,
-            chain_id=chain_id, 
-            creds=creds,  # 使用API凭据
-            funder=funder_wallet,  # 指定提供资金的钱包地址
-            signature_type=1  # 使用Email/Magic账户关联的签名类型
-        )
+            # 尝试不使用API凭据，只使用L1认证
+            client = ClobClient(
+                clob_host, 
+                key=private_key,
+                chain_id=chain_id, 
+                creds=creds,  # 使用API凭据
+                funder=funder_wallet,  # 指定提供资金的钱包地址
+                signature_type=1  # 使用Email/Magic账户关联的签名类型
+            )
         
         print(f"正在创建市场卖单...")
         print(f"卖出数量: {amount:.4f} shares")
@@ -110,7 +114,7 @@ def execute_market_sell(token_id, amount, host=None):
         )
         
         # 创建并签名订单
-        signed_order = client.create_market_order(order_args)
+        signed_order = client.create_market_order(order_args, book=book)
         
         print(f"正在提交FOK卖单...")
         
@@ -10,7 +10,6 @@ import logging
 import time
 import sys
 import os
-import subprocess
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Set
 from dataclasses import dataclass
@@ -32,6 +31,10 @@ logger = logging.getLogger('MultiCryptoAutoTradingSystem')
 load_dotenv()
 load_dotenv('.env.agent')
 
+# 报价和下单在进程内完成，共用一个ClobClient和同一份订单簿快照
+from market_buy_order import create_client, execute_market_buy
+from check_price import get_token_price as query_token_price
+
 
 @dataclass
 class PriceLevel:
@@ -68,6 +71,9 @@ class MultiCryptoPriceMonitor:
         # 项目根目录
         self.project_root = Path(__file__).parent.absolute()
         
+        # 报价和下单共用的ClobClient (首次交易时创建)
+        self.clob_client = None
+        
         # 交易记录
         self.investment_records: Dict[str, List[Dict]] = {}
         for crypto in self.crypto_levels.keys():
@@ -230,46 +236,37 @@ class MultiCryptoPriceMonitor:
         logger.debug(f"{crypto} Level {up_to_level}之前的总投资额: ${total:.2f}")
         return total
     
-    async def get_token_price(self, token_id: str) -> float:
-        """获取token价格 (使用check_price.py)"""
+    def get_clob_client(self):
+        """获取复用的ClobClient"""
+        if self.clob_client is None:
+            self.clob_client = create_client(os.getenv("CLOB_HOST"))
+        return self.clob_client
+    
+    async def get_token_quote(self, token_id: str) -> Dict[str, Any]:
+        """获取token订单簿快照及最优价格 (快照随结果中的"book"返回，供下单复用)"""
         try:
-            cmd = [
-                sys.executable,
-                str(self.project_root / 'check_price.py'),
-                token_id
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
+            return await asyncio.to_thread(
+                query_token_price, token_id, client=self.get_clob_client()
             )
-            
-            if result.returncode == 0:
-                # 解析价格输出
-                output = result.stdout.strip()
-                for line in output.split('\n'):
-                    if '最低卖价(Ask):' in line:
-                        # 提取价格: "最低卖价(Ask): 0.52 USDC, 数量: 100"
-                        price_part = line.split(':')[1].split('USDC')[0].strip()
-                        return float(price_part)
-                        
-                # 如果没有找到Ask价格，尝试找Bid价格
-                for line in output.split('\n'):
-                    if '最高买价(Bid):' in line:
-                        price_part = line.split(':')[1].split('USDC')[0].strip()
-                        return float(price_part)
-                        
-                logger.warning(f"未能解析token {token_id}的价格，使用默认值")
-                return 0.52  # 默认价格
-            else:
-                logger.error(f"获取token价格失败: {result.stderr}")
-                return 0.52
-                
         except Exception as e:
             logger.error(f"获取token价格异常: {str(e)}")
-            return 0.52
+            return {"success": False, "error": str(e)}
+    
+    def token_price_from_quote(self, token_id: str, quote: Dict[str, Any]) -> float:
+        """从报价结果中取token价格 (优先最低卖价，其次最高买价)"""
+        if quote.get("success"):
+            if quote.get("lowest_ask") is not None:
+                return quote["lowest_ask"]
+            if quote.get("highest_bid") is not None:
+                return quote["highest_bid"]
+            logger.warning(f"未能解析token {token_id}的价格，使用默认值")
+        else:
+            logger.error(f"获取token价格失败: {quote.get('error')}")
+        return 0.52  # 默认价格
+    
+    async def get_token_price(self, token_id: str) -> float:
+        """获取token价格"""
+        return self.token_price_from_quote(token_id, await self.get_token_quote(token_id))
     
     async def calculate_investment_amount(self, crypto: str, level: PriceLevel, token_price: float) -> float:
         """计算投资金额 (修正公式: 所有级别都使用累积投资公式)"""
@@ -297,52 +294,31 @@ class MultiCryptoPriceMonitor:
             logger.error(f"{crypto}计算投资金额失败: {str(e)}")
             return 10.0
     
-    async def execute_buy_order(self, crypto: str, token_id: str, amount: float) -> Dict[str, Any]:
-        """执行买入订单"""
+    async def execute_buy_order(self, crypto: str, token_id: str, amount: float, book=None) -> Dict[str, Any]:
+        """执行买入订单 (book为报价时的订单簿快照，市价直接由它计算)"""
         try:
-            cmd = [
-                sys.executable,
-                str(self.project_root / 'market_buy_order.py'),
-                token_id,
-                str(amount)
-            ]
-            
             logger.info(f"🔄 执行{crypto}买入命令: {amount:.2f} USDC")
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
+            resp = await asyncio.wait_for(
+                asyncio.to_thread(
+                    execute_market_buy,
+                    token_id,
+                    amount,
+                    client=self.get_clob_client(),
+                    book=book,
+                ),
+                timeout=300,
             )
             
-            if result.returncode == 0:
-                # 检查输出内容中是否包含错误信息
-                if "执行市场买单时出错" in result.stdout:
-                    error_msg = result.stdout.split("执行市场买单时出错: ")[-1].strip()
-                    logger.error(f"❌ {crypto}买入订单执行失败: {error_msg}")
-                    return {"success": False, "error": error_msg}
-                elif "执行市场卖单时出错" in result.stdout:
-                    error_msg = result.stdout.split("执行市场卖单时出错: ")[-1].strip()
-                    logger.error(f"❌ {crypto}卖出订单执行失败: {error_msg}")
-                    return {"success": False, "error": error_msg}
-                elif "完成!" in result.stdout and "错误" not in result.stdout:
-                    logger.info(f"✅ {crypto}买入订单执行成功")
-                    return {"success": True, "output": result.stdout}
-                else:
-                    # 检查其他可能的错误信息
-                    if "错误" in result.stdout or "失败" in result.stdout or "Exception" in result.stdout:
-                        error_msg = result.stdout
-                        logger.error(f"❌ {crypto}买入订单执行失败: {error_msg}")
-                        return {"success": False, "error": error_msg}
-                    else:
-                        logger.info(f"✅ {crypto}买入订单执行成功")
-                        return {"success": True, "output": result.stdout}
-            else:
-                logger.error(f"❌ {crypto}买入订单执行失败: {result.stderr}")
-                return {"success": False, "error": result.stderr}
+            if resp.get("success") == True:
+                logger.info(f"✅ {crypto}买入订单执行成功")
+                return {"success": True, "output": json.dumps(resp, ensure_ascii=False)}
+            
+            error_msg = resp.get("error") or resp.get("errorMsg") or "未知错误"
+            logger.error(f"❌ {crypto}买入订单执行失败: {error_msg}")
+            return {"success": False, "error": error_msg}
                 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error(f"⏰ {crypto}买入订单执行超时")
             return {"success": False, "error": "执行超时"}
         except Exception as e:
@@ -355,14 +331,15 @@ class MultiCryptoPriceMonitor:
             try:
                 logger.info(f"🎯 处理{crypto} Level {level.level} 交易...")
                 
-                # 获取token价格
-                token_price = await self.get_token_price(level.tokenid)
+                # 获取订单簿快照及token价格 (只请求一次订单簿)
+                quote = await self.get_token_quote(level.tokenid)
+                token_price = self.token_price_from_quote(level.tokenid, quote)
                 
                 # 计算投资金额
                 investment_amount = await self.calculate_investment_amount(crypto, level, token_price)
                 
-                # 执行交易
-                result = await self.execute_buy_order(crypto, level.tokenid, investment_amount)
+                # 执行交易 (复用同一份快照计算市价)
+                result = await self.execute_buy_order(crypto, level.tokenid, investment_amount, quote.get("book"))
                 
                 # 记录交易
                 await self.record_trade(crypto, level, investment_amount, token_price, result)
@@ -0,0 +1,84 @@
+"""
+Compares the integer amount engine with the float and Decimal helpers it
+replaced, on limit and market order amounts
+
+    python benchmarks/bench_amounts.py
+"""
+
+import random
+import timeit
+
+from py_clob_client.order_builder.amounts import AmountEngine
+from py_clob_client.order_builder.builder import ROUNDING_CONFIG
+from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.order_builder.helpers import (
+    decimal_places,
+    round_down,
+    round_normal,
+    round_up,
+    to_token_decimals,
+)
+
+
+def fit_amount(x, round_config):
+    if decimal_places(x) > round_config.amount:
+        x = round_up(x, round_config.amount + 4)
+        if decimal_places(x) > round_config.amount:
+            x = round_down(x, round_config.amount)
+    return x
+
+
+def float_order_amounts(side, size, price, round_config):
+    raw_price = round_normal(price, round_config.price)
+    raw_size = round_down(size, round_config.size)
+    raw_amount = fit_amount(raw_size * raw_price, round_config)
+    if side == BUY:
+        return 0, to_token_decimals(raw_amount), to_token_decimals(raw_size)
+    return 1, to_token_decimals(raw_size), to_token_decimals(raw_amount)
+
+
+def float_market_buy_amounts(amount, price, round_config):
+    raw_price = round_normal(price, round_config.price)
+    raw_maker = round_down(amount, round_config.size)
+    raw_taker = fit_amount(raw_maker / raw_price, round_config)
+    return 0, to_token_decimals(raw_maker), to_token_decimals(raw_taker)
+
+
+def main():
+    random.seed(0)
+    round_config = ROUNDING_CONFIG["0.001"]
+    engine = AmountEngine(round_config)
+    cases = [
+        (
+            random.choice((BUY, SELL)),
+            round(random.uniform(1, 5000), 2),
+            round(random.uniform(0.001, 0.999), 3),
+        )
+        for _ in range(10000)
+    ]
+
+    runs = [
+        (
+            "limit",
+            lambda: [float_order_amounts(s, n, p, round_config) for s, n, p in cases],
+            lambda: [engine.order_amounts(s, n, p) for s, n, p in cases],
+        ),
+        (
+            "market",
+            lambda: [float_market_buy_amounts(n, p, round_config) for _, n, p in cases],
+            lambda: [engine.market_order_amounts(BUY, n, p) for _, n, p in cases],
+        ),
+    ]
+    for name, reference, fast in runs:
+        assert reference() == fast()
+        before = min(timeit.repeat(reference, number=1, repeat=5)) / len(cases)
+        after = min(timeit.repeat(fast, number=1, repeat=5)) / len(cases)
+        print(
+            "{:<7} float {:>6.2f} us  integer {:>6.2f} us  {:>5.1f}x".format(
+                name, before * 1e6, after * 1e6, before / after
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares the memory held by 1,000 parsed order books as OrderBookSummary
+dataclasses and as CompactBooks, and the time it takes to parse them from
+decoded responses
+
+    python benchmarks/bench_book_memory.py
+"""
+
+import gc
+import random
+import timeit
+import tracemalloc
+
+from py_clob_client.book import CompactBook, format_units
+from py_clob_client.http_helpers.codec import decode, encode
+from py_clob_client.utilities import parse_raw_orderbook_summary
+
+BOOKS = 1000
+
+
+def raw_book(token_id, depth):
+    def levels(lo, hi):
+        prices = random.sample(range(lo, hi), depth)
+        return [
+            {
+                "price": format_units(p * 10, 4),
+                "size": format_units(random.randint(1, 2 * 10**6) * 10**4, 6),
+            }
+            for p in sorted(prices)
+        ]
+
+    return {
+        "market": "0x" + "ab" * 32,
+        "asset_id": str(token_id),
+        "timestamp": "1700000000000",
+        "bids": levels(1, 500),
+        "asks": levels(501, 1000)[::-1],
+        "hash": "0" * 40,
+    }
+
+
+def retained(parse, bodies):
+    # the decoded responses are dropped, as they are once a client returns
+    gc.collect()
+    tracemalloc.start()
+    books = [parse(decode(b)) for b in bodies]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del books
+    return size
+
+
+def main():
+    random.seed(0)
+    for depth in (10, 50, 200):
+        raws = [raw_book(i, depth) for i in range(BOOKS)]
+        bodies = [encode(r) for r in raws]
+        # warm the price memo of CompactBook, bounded by the number of ticks
+        [CompactBook.from_raw(r) for r in raws]
+
+        legacy = retained(parse_raw_orderbook_summary, bodies)
+        compact = retained(CompactBook.from_raw, bodies)
+        legacy_time = min(
+            timeit.repeat(
+                lambda: [parse_raw_orderbook_summary(r) for r in raws],
+                number=1,
+                repeat=3,
+            )
+        )
+        compact_time = min(
+            timeit.repeat(
+                lambda: [CompactBook.from_raw(r) for r in raws], number=1, repeat=3
+            )
+        )
+        print(
+            "{:>3} levels/side  summary {:>6.2f} MB {:>6.1f} ms  "
+            "compact {:>5.2f} MB {:>6.1f} ms  {:>5.1f}x less memory".format(
+                depth,
+                legacy / 1e6,
+                legacy_time * 1e3,
+                compact / 1e6,
+                compact_time * 1e3,
+                legacy / compact,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
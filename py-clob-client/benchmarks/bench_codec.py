@@ -0,0 +1,90 @@
+"""
+Compares the stdlib and orjson codecs on large /books and /markets payloads
+
+    python benchmarks/bench_codec.py
+"""
+
+import random
+import timeit
+
+from py_clob_client.http_helpers import codec
+from py_clob_client.http_helpers.codec import StdlibCodec, OrjsonCodec
+
+
+def books_payload(books=100, levels=200):
+    def level():
+        return {
+            "price": str(round(random.uniform(0.01, 0.99), 2)),
+            "size": str(round(random.uniform(1, 10000), 2)),
+        }
+
+    return [
+        {
+            "market": "0x" + "%064x" % random.getrandbits(256),
+            "asset_id": str(random.getrandbits(252)),
+            "timestamp": "1700000000000",
+            "hash": "%040x" % random.getrandbits(160),
+            "bids": [level() for _ in range(levels)],
+            "asks": [level() for _ in range(levels)],
+        }
+        for _ in range(books)
+    ]
+
+
+def markets_payload(markets=1000):
+    return {
+        "limit": markets,
+        "count": markets,
+        "next_cursor": "MTAwMA==",
+        "data": [
+            {
+                "condition_id": "0x" + "%064x" % random.getrandbits(256),
+                "question_id": "0x" + "%064x" % random.getrandbits(256),
+                "question": "Will BTC be above ${} on Friday?".format(i),
+                "description": "This market resolves to Yes if ... " * 10,
+                "market_slug": "btc-above-{}".format(i),
+                "end_date_iso": "2024-12-31T00:00:00Z",
+                "active": True,
+                "closed": False,
+                "neg_risk": False,
+                "minimum_order_size": 5,
+                "minimum_tick_size": 0.01,
+                "tokens": [
+                    {"token_id": str(random.getrandbits(252)), "outcome": "Yes"},
+                    {"token_id": str(random.getrandbits(252)), "outcome": "No"},
+                ],
+                "tags": ["Crypto", "Bitcoin"],
+            }
+            for i in range(markets)
+        ],
+    }
+
+
+def bench(name, c, payload, number=20):
+    raw = c.dumps(payload)
+    encode = timeit.timeit(lambda: c.dumps(payload), number=number) / number
+    decode = timeit.timeit(lambda: c.loads(raw), number=number) / number
+    print(
+        "{:<8} {:<8} {:>8.0f} KiB  encode {:>8.2f} ms  decode {:>8.2f} ms".format(
+            c.name, name, len(raw) / 1024, encode * 1e3, decode * 1e3
+        )
+    )
+
+
+def main():
+    random.seed(0)
+    payloads = {"/books": books_payload(), "/markets": markets_payload()}
+
+    codecs = [StdlibCodec()]
+    if codec.orjson is not None:
+        codecs.append(OrjsonCodec())
+    else:
+        print("orjson is not installed, only the stdlib codec is measured")
+
+    for name, payload in payloads.items():
+        for c in codecs:
+            bench(name, c, payload)
+
+
+if __name__ == "__main__":
+    main()
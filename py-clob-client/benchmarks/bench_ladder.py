@@ -0,0 +1,69 @@
+"""
+Compares build_ladder with a create_order loop on a 200-level ladder, for the
+amount computation alone and end to end with signing
+
+    python benchmarks/bench_ladder.py
+"""
+
+import timeit
+
+from py_clob_client.clob_types import CreateOrderOptions, OrderArgs
+from py_clob_client.constants import AMOY
+from py_clob_client.order_builder import amounts
+from py_clob_client.order_builder.builder import (
+    OrderBuilder,
+    ROUNDING_CONFIG,
+    get_amount_engine,
+)
+from py_clob_client.order_builder.constants import BUY
+from py_clob_client.signer import Signer
+
+PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+TOKEN_ID = (
+    "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+)
+
+
+def main(levels=200):
+    if amounts.np is None:
+        print("numpy is not installed, build_ladder uses the scalar fallback")
+
+    builder = OrderBuilder(Signer(PRIVATE_KEY, AMOY))
+    builder.signing_workers = 1
+    options = CreateOrderOptions(tick_size="0.001", neg_risk=False)
+    prices = [round(0.2 + 0.001 * i, 3) for i in range(levels)]
+    sizes = [round(10 + 0.37 * i, 2) for i in range(levels)]
+    engine = get_amount_engine(ROUNDING_CONFIG[options.tick_size])
+
+    def amounts_loop():
+        return [engine.order_amounts(BUY, n, p) for n, p in zip(sizes, prices)]
+
+    def amounts_batch():
+        return engine.order_amounts_batch(BUY, sizes, prices)
+
+    def orders_loop():
+        return [
+            builder.create_order(
+                OrderArgs(token_id=TOKEN_ID, price=p, size=n, side=BUY), options
+            )
+            for n, p in zip(sizes, prices)
+        ]
+
+    def orders_ladder():
+        return builder.build_ladder(TOKEN_ID, BUY, prices, sizes, options)
+
+    for name, loop, ladder, number in (
+        ("amounts", amounts_loop, amounts_batch, 200),
+        ("signed", orders_loop, orders_ladder, 3),
+    ):
+        before = min(timeit.repeat(loop, number=number, repeat=3)) / number
+        after = min(timeit.repeat(ladder, number=number, repeat=3)) / number
+        print(
+            "{:<8} loop {:>9.3f} ms  ladder {:>9.3f} ms  {:>5.1f}x".format(
+                name, before * 1e3, after * 1e3, before / after
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
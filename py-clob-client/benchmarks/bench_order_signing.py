@@ -0,0 +1,73 @@
+"""
+Measures orders signed per second with OrderBuilder, against rebuilding the
+exchange order builder and signer for every order, for each installed signing
+backend
+
+    python benchmarks/bench_order_signing.py
+"""
+
+import time
+
+from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
+from py_order_utils.signer import Signer as UtilsSigner
+
+from py_clob_client.clob_types import CreateOrderOptions, OrderArgs
+from py_clob_client.config import get_contract_config
+from py_clob_client.constants import AMOY
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.order_builder.constants import BUY
+from py_clob_client.signer import Signer
+from py_clob_client.signing import backends
+from py_clob_client.signing.backends import EthAccountBackend
+
+PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+TOKEN_ID = (
+    "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+)
+
+
+class RebuildingOrderBuilder(OrderBuilder):
+    """
+    Builds a new exchange order builder and signer per order, as before caching
+    """
+
+    def get_order_builder(self, neg_risk: bool = False) -> UtilsOrderBuilder:
+        chain_id = self.signer.get_chain_id()
+        return UtilsOrderBuilder(
+            get_contract_config(chain_id, neg_risk).exchange,
+            chain_id,
+            UtilsSigner(key=self.signer.private_key),
+        )
+
+
+def bench(name, builder, number=300):
+    options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+    args = [
+        OrderArgs(token_id=TOKEN_ID, price=0.5, size=10 + i % 50, side=BUY)
+        for i in range(number)
+    ]
+    builder.create_order(args[0], options)
+
+    start = time.perf_counter()
+    for a in args:
+        builder.create_order(a, options)
+    elapsed = time.perf_counter() - start
+    print(
+        "{:<10} {:>8.0f} orders/s  {:>6.3f} ms/order".format(
+            name, number / elapsed, elapsed / number * 1e3
+        )
+    )
+
+
+def main():
+    signer = Signer(PRIVATE_KEY, AMOY, EthAccountBackend.name)
+    bench("rebuilt", RebuildingOrderBuilder(signer))
+    bench("cached", OrderBuilder(signer))
+    if backends.coincurve is not None:
+        bench("coincurve", OrderBuilder(Signer(PRIVATE_KEY, AMOY, "coincurve")))
+    else:
+        print("coincurve is not installed, only the eth_account backend is measured")
+
+
+if __name__ == "__main__":
+    main()
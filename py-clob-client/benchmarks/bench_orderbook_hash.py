@@ -0,0 +1,72 @@
+"""
+Compares orderbook_summary_hash with the asdict based hash it replaced, on books
+of increasing depth, as OrderBookSummary and as CompactBook
+
+    python benchmarks/bench_orderbook_hash.py
+"""
+
+import hashlib
+import random
+import timeit
+from dataclasses import replace
+
+from py_clob_client.book import CompactBook, format_units
+from py_clob_client.utilities import (
+    orderbook_summary_hash,
+    parse_raw_orderbook_summary,
+)
+
+
+def asdict_hash(orderbook):
+    copy = replace(orderbook, hash="")
+    return hashlib.sha1(str(copy.json).encode("utf-8")).hexdigest()
+
+
+def raw_book(depth):
+    def levels(lo, hi):
+        return [
+            {
+                "price": format_units(p * 10, 4),
+                "size": format_units(random.randint(1, 2 * 10**6) * 10**4, 6),
+            }
+            for p in sorted(random.sample(range(lo, hi), depth))
+        ]
+
+    return {
+        "market": "0x" + "ab" * 32,
+        "asset_id": str(random.getrandbits(250)),
+        "timestamp": "1700000000000",
+        "bids": levels(1, 500),
+        "asks": levels(501, 1000)[::-1],
+        "hash": "0" * 40,
+    }
+
+
+def main():
+    random.seed(0)
+    for depth in (5, 50, 200):
+        raw = raw_book(depth)
+        summary = parse_raw_orderbook_summary(raw)
+        compact = CompactBook.from_raw(raw)
+        assert asdict_hash(summary) == orderbook_summary_hash(summary)
+        assert asdict_hash(summary) == orderbook_summary_hash(compact)
+
+        number = 2000 // depth
+        timings = [
+            min(timeit.repeat(lambda: f(book), number=number, repeat=5)) / number
+            for f, book in (
+                (asdict_hash, summary),
+                (orderbook_summary_hash, summary),
+                (orderbook_summary_hash, compact),
+            )
+        ]
+        print(
+            "{:>3} levels/side  asdict {:>8.1f} us  direct {:>7.1f} us  "
+            "compact {:>7.1f} us  {:>5.1f}x".format(
+                depth, *(t * 1e6 for t in timings), timings[0] / timings[1]
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
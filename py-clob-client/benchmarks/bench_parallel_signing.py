@@ -0,0 +1,58 @@
+"""
+Measures create_orders throughput on a 50-level ladder against the number of
+signing worker processes
+
+    python benchmarks/bench_parallel_signing.py
+"""
+
+import os
+import time
+
+from py_clob_client.clob_types import CreateOrderOptions, OrderArgs
+from py_clob_client.constants import AMOY
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.order_builder.constants import BUY
+from py_clob_client.signer import Signer
+
+PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+TOKEN_ID = (
+    "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+)
+
+
+def bench(workers, ladders=6, levels=50):
+    builder = OrderBuilder(Signer(PRIVATE_KEY, AMOY))
+    builder.signing_workers = workers
+    builder.signing_pool_min_batch = 1
+    options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+    ladder = [
+        OrderArgs(token_id=TOKEN_ID, price=0.01 * (i + 1), size=100, side=BUY)
+        for i in range(levels)
+    ]
+    # starts the pool
+    builder.create_orders(ladder, options)
+
+    start = time.perf_counter()
+    for _ in range(ladders):
+        builder.create_orders(ladder, options)
+    elapsed = time.perf_counter() - start
+    builder.close()
+    print(
+        "{:>3} workers {:>8.0f} orders/s  {:>7.1f} ms/ladder".format(
+            workers, ladders * levels / elapsed, elapsed / ladders * 1e3
+        )
+    )
+
+
+def main():
+    cores = os.cpu_count() or 1
+    print("{} cores".format(cores))
+    workers = 1
+    while workers < cores:
+        bench(workers)
+        workers *= 2
+    bench(cores)
+
+
+if __name__ == "__main__":
+    main()
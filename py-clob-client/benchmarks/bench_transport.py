@@ -0,0 +1,74 @@
+"""
+Compares the pooled HTTP/1.1 transport with the HTTP/2 transport under many
+concurrent market-data requests against local stand-in servers
+
+    python benchmarks/bench_transport.py [concurrency] [requests]
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from py_clob_client.client import ClobClient
+from py_clob_client.http_helpers.transport import (
+    RequestsTransport,
+    Http2Transport,
+    set_transport,
+)
+
+from stand_in import Http1Server, Http2Server
+
+DELAY = 0.02
+
+
+def run(name, server, transport, concurrency, total):
+    set_transport(transport)
+    client = ClobClient(server.url)
+
+    # warm the pool so both transports start from established connections
+    client.get_midpoint("1")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: client.get_midpoint(str(i)), range(total)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        "{:<9} {:>6} req  {:>7.0f} req/s  {:>4} connections".format(
+            name, total, total / elapsed, server.connections
+        )
+    )
+    server.stop()
+    transport.close()
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 128
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    print(
+        "{} concurrent requests, {:.0f} ms server latency".format(
+            concurrency, DELAY * 1e3
+        )
+    )
+
+    run(
+        "http/1.1",
+        Http1Server(DELAY).start(),
+        RequestsTransport(pool_maxsize=concurrency),
+        concurrency,
+        total,
+    )
+    run(
+        "http/2",
+        Http2Server(DELAY).start(),
+        Http2Transport(client=httpx.Client(http1=False, http2=True, timeout=None)),
+        concurrency,
+        total,
+    )
+    set_transport(None)
+
+
+if __name__ == "__main__":
+    main()
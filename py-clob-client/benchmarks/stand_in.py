@@ -0,0 +1,144 @@
+"""
+Local stand-in CLOB servers used by the benchmarks
+
+Both servers answer every request with the same small JSON body after an
+artificial delay, and count the TCP connections they accept.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BODY = json.dumps({"mid": "0.5"}).encode("utf-8")
+
+
+class Http1Server:
+    """
+    Threaded HTTP/1.1 keep-alive server
+    """
+
+    def __init__(self, delay: float = 0.0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.delay:
+                    time.sleep(server.delay)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(BODY)))
+                self.end_headers()
+                self.wfile.write(BODY)
+
+            do_GET = _reply
+            do_POST = _reply
+
+            def log_message(self, *args):
+                pass
+
+        self.delay = delay
+        self.connections = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = "http://127.0.0.1:{}".format(self.httpd.server_port)
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Http2Server:
+    """
+    Cleartext HTTP/2 server (prior knowledge) built on the h2 state machine
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._server = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        self._started.wait()
+        return self
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._server.close)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0)
+        )
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = "http://127.0.0.1:{}".format(port)
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+        from h2.events import DataReceived, StreamEnded, ConnectionTerminated
+        from h2.exceptions import ProtocolError
+        from h2.settings import SettingCodes
+
+        self.connections += 1
+        conn = H2Connection(config=H2Configuration(client_side=False))
+        conn.local_settings[SettingCodes.MAX_CONCURRENT_STREAMS] = 1024
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        async def respond(stream_id):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            try:
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(BODY))),
+                    ],
+                )
+                conn.send_data(stream_id, BODY, end_stream=True)
+            except ProtocolError:
+                # the client reset the stream or went away
+                return
+            writer.write(conn.data_to_send())
+
+        while True:
+            data = await reader.read(65535)
+            if not data:
+                break
+            for event in conn.receive_data(data):
+                if isinstance(event, DataReceived):
+                    conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, StreamEnded):
+                    asyncio.ensure_future(respond(event.stream_id))
+                elif isinstance(event, ConnectionTerminated):
+                    writer.close()
+                    return
+            writer.write(conn.data_to_send())
+        writer.close()
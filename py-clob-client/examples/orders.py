@@ -0,0 +1,43 @@
+import os
+
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import ApiCreds, OrderArgs, OrderType, PostOrdersArgs
+from dotenv import load_dotenv
+from py_clob_client.constants import AMOY
+
+from py_clob_client.order_builder.constants import BUY
+
+
+load_dotenv()
+
+
+def main():
+    host = "http://localhost:8080"
+    key = os.getenv("PK")
+    creds = ApiCreds(
+        api_key=os.getenv("CLOB_API_KEY"),
+        api_secret=os.getenv("CLOB_SECRET"),
+        api_passphrase=os.getenv("CLOB_PASS_PHRASE"),
+    )
+    chain_id = AMOY
+    client = ClobClient(host, key=key, chain_id=chain_id, creds=creds)
+
+    token_id = (
+        "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+    )
+
+    # Create and sign a ladder of limit orders, then post them in batches
+    signed_orders = [
+        client.create_order(
+            OrderArgs(price=price, size=20, side=BUY, token_id=token_id)
+        )
+        for price in (0.40, 0.41, 0.42, 0.43)
+    ]
+    resp = client.post_orders(
+        [PostOrdersArgs(order, OrderType.GTC) for order in signed_orders]
+    )
+    print(resp)
+    print("Done!")
+
+
+main()
@@ -0,0 +1,107 @@
+import threading
+
+from .exceptions import PolyApiException, PolyBatchException
+
+
+class _Pending:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BatchLoader:
+    """
+    Micro-batching dataloader
+
+    Single-key loads issued within `window` seconds of the first pending one are
+    folded into a single call to batch_fn(keys), which returns a dict mapping each
+    key to its result. Every caller blocks until its batch has been resolved.
+    A batch is dispatched early once it holds `max_batch` distinct keys.
+    """
+
+    def __init__(self, batch_fn, window: float = 0.002, max_batch: int = 500):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+
+        self.loads = 0
+        self.batches = 0
+
+        self._lock = threading.Lock()
+        self._pending: dict = {}
+        self._timer = None
+
+    def load(self, key):
+        with self._lock:
+            self.loads += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending()
+            if len(self._pending) >= self.max_batch:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch is not None:
+            self._dispatch(batch)
+
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def flush(self):
+        """
+        Dispatches the pending batch immediately
+        """
+        with self._lock:
+            batch = self._take()
+        if batch:
+            self._dispatch(batch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"loads": self.loads, "batches": self.batches}
+
+    def _take(self) -> dict:
+        batch = self._pending
+        self._pending = {}
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if batch:
+            self.batches += 1
+        return batch
+
+    def _dispatch(self, batch: dict):
+        errors = {}
+        try:
+            results = self.batch_fn(list(batch))
+        except PolyBatchException as e:
+            results = e.results or {}
+            errors = e.errors
+        except BaseException as e:
+            # waiters must never be left blocked, even on KeyboardInterrupt or
+            # SystemExit, which still propagate to the dispatching thread
+            for pending in batch.values():
+                pending.error = e
+                pending.done.set()
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for key, pending in batch.items():
+            if key in results:
+                pending.result = results[key]
+            else:
+                pending.error = errors.get(key) or PolyApiException(
+                    error_msg="no result returned for {}".format(key)
+                )
+            pending.done.set()
@@ -0,0 +1,417 @@
+"""
+Numeric order books
+
+A BookSide holds the levels of one side best first as float arrays, with
+cumulative size and notional, so fill questions for any order size are
+answered by binary search instead of walking and parsing the levels:
+
+    book = NumericBook.from_summary(client.get_order_book(token_id))
+    book.buy.marginal_price(100, notional=True)
+    book.sell.vwap(250)
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from time import monotonic
+
+from .clob_types import OrderBookSummary, OrderSummary
+from .order_builder.constants import BUY, SELL
+
+
+class BookSide:
+    """
+    Levels one order walks through, in fill order (best first in a NumericBook)
+
+    `buy` marks the asks a buy order consumes, for which higher prices are worse.
+    Amounts are in shares, or in collateral with notional=True.
+    """
+
+    __slots__ = (
+        "buy",
+        "prices",
+        "sizes",
+        "cum_size",
+        "cum_notional",
+        "_worst",
+    )
+
+    def __init__(self, prices, sizes, buy: bool):
+        self.buy = buy
+        self.prices = array("d", prices)
+        self.sizes = array("d", sizes)
+        self.cum_size = array("d", accumulate(self.sizes))
+        self.cum_notional = array(
+            "d", accumulate(s * p for s, p in zip(self.sizes, self.prices))
+        )
+        # worst price reached after each level, monotonic so it can be bisected;
+        # sell side prices are negated so that larger is worse on both sides
+        self._worst = array(
+            "d", accumulate((p if buy else -p for p in self.prices), max)
+        )
+
+    @classmethod
+    def from_levels(cls, levels: list[OrderSummary], buy: bool, reverse=False):
+        """
+        Parses OrderSummary levels walked in list order, or in reverse with
+        reverse=True
+        """
+        if reverse:
+            levels = reversed(levels)
+        prices = []
+        sizes = []
+        for level in levels:
+            prices.append(float(level.price))
+            sizes.append(float(level.size))
+        return cls(prices, sizes, buy)
+
+    @classmethod
+    def best_first(cls, prices: list, sizes: list, buy: bool) -> "BookSide":
+        """
+        Builds a side from levels in any order, sorted from the best price:
+        ascending for the asks a buy walks, descending for the bids a sell walks
+        """
+        order = sorted(range(len(prices)), key=prices.__getitem__, reverse=not buy)
+        return cls([prices[i] for i in order], [sizes[i] for i in order], buy)
+
+    @classmethod
+    def from_book_levels(cls, levels: list[OrderSummary], buy: bool) -> "BookSide":
+        """
+        Parses the OrderSummary levels of a /book side into a best first side
+        """
+        levels = levels or []
+        return cls.best_first(
+            [float(level.price) for level in levels],
+            [float(level.size) for level in levels],
+            buy,
+        )
+
+    def __len__(self):
+        return len(self.prices)
+
+    @property
+    def total_size(self) -> float:
+        return self.cum_size[-1] if self.cum_size else 0.0
+
+    @property
+    def total_notional(self) -> float:
+        return self.cum_notional[-1] if self.cum_notional else 0.0
+
+    def fill_index(self, amount: float, notional: bool = False) -> int:
+        """
+        Returns the index of the level at which `amount` is filled
+        Raises an exception if the side is not deep enough
+        """
+        cumulative = self.cum_notional if notional else self.cum_size
+        i = bisect_left(cumulative, amount)
+        if i == len(cumulative):
+            raise Exception("no match")
+        return i
+
+    def marginal_price(self, amount: float, notional: bool = False) -> float:
+        """
+        Price of the last level needed to fill `amount`
+        """
+        return self.prices[self.fill_index(amount, notional)]
+
+    def vwap(self, amount: float, notional: bool = False) -> float:
+        """
+        Average price paid or received filling `amount`
+        """
+        i = self.fill_index(amount, notional)
+        size_before = self.cum_size[i - 1] if i else 0.0
+        notional_before = self.cum_notional[i - 1] if i else 0.0
+        if notional:
+            size = size_before + (amount - notional_before) / self.prices[i]
+            return amount / size if size else self.prices[i]
+        if not amount:
+            return self.prices[i]
+        return (notional_before + (amount - size_before) * self.prices[i]) / amount
+
+    def slippage(self, amount: float, notional: bool = False) -> float:
+        """
+        How much worse the average fill price of `amount` is than the first level
+        """
+        vwap = self.vwap(amount, notional)
+        return vwap - self.prices[0] if self.buy else self.prices[0] - vwap
+
+    def max_fillable(self, limit_price: float = None, notional: bool = False):
+        """
+        Largest amount fillable before reaching a level worse than limit_price,
+        the whole side if no limit is given
+        """
+        if limit_price is None:
+            n = len(self.prices)
+        else:
+            n = bisect_right(self._worst, limit_price if self.buy else -limit_price)
+        if n == 0:
+            return 0.0
+        return (self.cum_notional if notional else self.cum_size)[n - 1]
+
+
+class NumericBook:
+    """
+    Parsed order book of a token, with one BookSide per order side
+
+    Both sides are sorted best first whatever the order of the /book response
+    (which lists each side worst first): `buy` walks the asks by ascending and
+    `sell` the bids by descending price
+    `fetched_at` is the time.monotonic() reading taken when the book was parsed,
+    which bounds how stale a snapshot shared across a trade may be
+    """
+
+    __slots__ = ("market", "asset_id", "timestamp", "hash", "buy", "sell", "fetched_at")
+
+    def __init__(
+        self,
+        buy: BookSide,
+        sell: BookSide,
+        market: str = None,
+        asset_id: str = None,
+        timestamp: str = None,
+        hash: str = None,
+        fetched_at: float = None,
+    ):
+        self.buy = buy
+        self.sell = sell
+        self.market = market
+        self.asset_id = asset_id
+        self.timestamp = timestamp
+        self.hash = hash
+        self.fetched_at = monotonic() if fetched_at is None else fetched_at
+
+    @classmethod
+    def from_summary(cls, book: OrderBookSummary) -> "NumericBook":
+        return cls(
+            BookSide.from_book_levels(book.asks, buy=True),
+            BookSide.from_book_levels(book.bids, buy=False),
+            market=book.market,
+            asset_id=book.asset_id,
+            timestamp=book.timestamp,
+            hash=book.hash,
+        )
+
+    def age(self) -> float:
+        """
+        Seconds since the book was parsed
+        """
+        return monotonic() - self.fetched_at
+
+    def side(self, side: str) -> BookSide:
+        """
+        Returns the levels an order of `side` fills against
+        """
+        if side == BUY:
+            return self.buy
+        if side == SELL:
+            return self.sell
+        raise ValueError(f"side must be '{BUY}' or '{SELL}'")
+
+    def market_price(self, side: str, amount: float) -> float:
+        """
+        Marginal price of a market order: `amount` is collateral to spend for a
+        BUY and shares to sell for a SELL
+        """
+        return self.side(side).marginal_price(amount, notional=side == BUY)
+
+
+# the finest tick size is 0.0001, sizes have the 6 decimals of the tokens
+PRICE_DECIMALS = 4
+SIZE_DECIMALS = 6
+
+# a few thousand distinct price strings cover every tick, so prices are
+# memoized both ways, up to this many entries
+_UNITS_CACHE_SIZE = 1 << 14
+_PRICE_UNITS = {}
+_PRICE_STRINGS = {}
+
+
+def parse_units(value: str, digits: int):
+    """
+    Returns a decimal string as an integer count of 10^-digits units, or None
+    when format_units would not give the same string back (more digits, a
+    trailing zero, a sign...)
+    """
+    whole, dot, frac = value.partition(".")
+    if (
+        not whole.isdecimal()
+        or (len(whole) > 1 and whole[0] == "0")
+        or len(frac) > digits
+        or (dot and not (frac.isdecimal() and frac[-1] != "0"))
+    ):
+        return None
+    return int(whole + frac.ljust(digits, "0"))
+
+
+def _cached_units(cache: dict, value: str, digits: int):
+    units = parse_units(value, digits)
+    if units is not None:
+        if len(cache) >= _UNITS_CACHE_SIZE:
+            cache.clear()
+        cache[value] = units
+    return units
+
+
+def format_units(units: int, digits: int) -> str:
+    s = str(units)
+    if len(s) <= digits:
+        s = "0" * (digits + 1 - len(s)) + s
+    frac = s[-digits:].rstrip("0")
+    return s[:-digits] + "." + frac if frac else s[:-digits]
+
+
+class CompactBook:
+    """
+    Order book of a token held in two flat integer buffers
+
+    `prices` (int32, units of 10^-PRICE_DECIMALS) and `sizes` (int64, units of
+    10^-SIZE_DECIMALS) hold the bids then the asks, in the order of the /book
+    response, the first `n_bids` entries being bids. Both support the buffer
+    protocol, e.g. numpy.frombuffer(book.prices, numpy.int32) is a zero-copy view.
+
+    `bids`, `asks`, `json` and to_summary() build the legacy OrderSummary
+    dataclasses on access only, so a CompactBook can stand in for an
+    OrderBookSummary, generate_orderbook_summary_hash included
+    """
+
+    __slots__ = (
+        "market",
+        "asset_id",
+        "timestamp",
+        "hash",
+        "prices",
+        "sizes",
+        "n_bids",
+        "_legacy",
+    )
+
+    def __init__(
+        self,
+        prices: array,
+        sizes: array,
+        n_bids: int,
+        market: str = None,
+        asset_id: str = None,
+        timestamp: str = None,
+        hash: str = None,
+        legacy: tuple = None,
+    ):
+        self.prices = prices
+        self.sizes = sizes
+        self.n_bids = n_bids
+        self.market = market
+        self.asset_id = asset_id
+        self.timestamp = timestamp
+        self.hash = hash
+        # exact levels, kept only for books whose strings don't round-trip
+        self._legacy = legacy
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "CompactBook":
+        """
+        Parses a raw /book response
+        """
+        prices = []
+        sizes = []
+        exact = True
+        price_units = _PRICE_UNITS
+        for levels in (raw["bids"], raw["asks"]):
+            for level in levels:
+                p = level["price"]
+                s = level["size"]
+                price = price_units.get(p)
+                if price is None:
+                    price = _cached_units(price_units, p, PRICE_DECIMALS)
+                size = parse_units(s, SIZE_DECIMALS)
+                if price is None or size is None:
+                    exact = False
+                    price = round(float(p) * 10**PRICE_DECIMALS)
+                    size = round(float(s) * 10**SIZE_DECIMALS)
+                prices.append(price)
+                sizes.append(size)
+
+        legacy = None
+        if not exact:
+            legacy = tuple(
+                [OrderSummary(price=l["price"], size=l["size"]) for l in levels]
+                for levels in (raw["bids"], raw["asks"])
+            )
+        return cls(
+            array("i", prices),
+            array("q", sizes),
+            len(raw["bids"]),
+            market=raw["market"],
+            asset_id=raw["asset_id"],
+            timestamp=raw["timestamp"],
+            hash=raw["hash"],
+            legacy=legacy,
+        )
+
+    def level_strings(self, bids: bool) -> list[tuple]:
+        """
+        Returns the (price, size) strings of the bids, or of the asks
+        """
+        if self._legacy is not None:
+            return [(l.price, l.size) for l in self._legacy[0 if bids else 1]]
+        start, end = (0, self.n_bids) if bids else (self.n_bids, len(self.prices))
+        price_strings = _PRICE_STRINGS
+        levels = []
+        for price, size in zip(self.prices[start:end], self.sizes[start:end]):
+            p = price_strings.get(price)
+            if p is None:
+                p = format_units(price, PRICE_DECIMALS)
+                if len(price_strings) >= _UNITS_CACHE_SIZE:
+                    price_strings.clear()
+                price_strings[price] = p
+            levels.append((p, format_units(size, SIZE_DECIMALS)))
+        return levels
+
+    @property
+    def bids(self) -> list[OrderSummary]:
+        if self._legacy is not None:
+            return list(self._legacy[0])
+        return [OrderSummary(price=p, size=s) for p, s in self.level_strings(True)]
+
+    @property
+    def asks(self) -> list[OrderSummary]:
+        if self._legacy is not None:
+            return list(self._legacy[1])
+        return [OrderSummary(price=p, size=s) for p, s in self.level_strings(False)]
+
+    def to_summary(self) -> OrderBookSummary:
+        return OrderBookSummary(
+            market=self.market,
+            asset_id=self.asset_id,
+            timestamp=self.timestamp,
+            bids=self.bids,
+            asks=self.asks,
+            hash=self.hash,
+        )
+
+    @property
+    def json(self) -> str:
+        return self.to_summary().json
+
+    def to_numeric(self) -> NumericBook:
+        """
+        Converts to a NumericBook without going through OrderSummary strings
+        """
+        n = self.n_bids
+        price_scale = 10**PRICE_DECIMALS
+        size_scale = 10**SIZE_DECIMALS
+        return NumericBook(
+            BookSide.best_first(
+                [p / price_scale for p in self.prices[n:]],
+                [s / size_scale for s in self.sizes[n:]],
+                buy=True,
+            ),
+            BookSide.best_first(
+                [p / price_scale for p in self.prices[:n]],
+                [s / size_scale for s in self.sizes[:n]],
+                buy=False,
+            ),
+            market=self.market,
+            asset_id=self.asset_id,
+            timestamp=self.timestamp,
+            hash=self.hash,
+        )
@@ -0,0 +1,208 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .http_helpers.codec import encode, decode
+
+TICK_SIZE = "tick_size"
+NEG_RISK = "neg_risk"
+MARKET = "market"
+MARKETS = "markets"
+
+# markets change as they open and close, and the tick size of a live market
+# changes near its price bounds (0.04 / 0.96), so both expire by default.
+# /markets listing pages are only cached when a ttl is configured for MARKETS:
+# a full crawl would otherwise fill the LRU, and a catalog sync must see fresh
+# pages
+DEFAULT_TTLS = {MARKET: 60.0, TICK_SIZE: 300.0}
+
+_MISSING = object()
+
+
+class MetadataCache:
+    """
+    TTL + LRU cache for slowly changing market metadata
+
+    Entries live in an in-memory LRU of at most `maxsize` entries per namespace.
+    `ttl` is the default lifetime in seconds (None never expires) and `ttls`
+    overrides it per namespace, on top of DEFAULT_TTLS. Tick sizes expire after
+    DEFAULT_TTLS[TICK_SIZE] seconds unless `ttl` or `ttls` set their lifetime.
+
+    When `path` is set, entries are also written to a SQLite file so that
+    short-lived processes sharing the file skip the network on a warm cache.
+    """
+
+    def __init__(
+        self,
+        ttl: float = None,
+        maxsize: int = 4096,
+        path: str = None,
+        ttls: dict = None,
+    ):
+        self.ttl = ttl
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        # an explicit default lifetime also applies to tick sizes
+        if ttl is not None and TICK_SIZE not in (ttls or {}):
+            self.ttls[TICK_SIZE] = ttl
+        self.maxsize = maxsize
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._entries: dict[str, OrderedDict] = {}
+        self._hooks = []
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+        if self.path is not None:
+            with self._connection() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS metadata ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                    "expires_at REAL, PRIMARY KEY (namespace, key))"
+                )
+
+    def get(self, namespace: str, key: str, default=None):
+        """
+        Returns the cached value, or default if missing or expired
+        """
+        key = str(key)
+        now = time.time()
+        with self._lock:
+            entries = self._entries.setdefault(namespace, OrderedDict())
+            entry = entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # stale entries are kept so that set() can detect a changed value
+
+        value, expires_at = self._disk_get(namespace, key, now)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(namespace, key, value, expires_at)
+            return value
+
+    def set(self, namespace: str, key: str, value, ttl: float = None):
+        """
+        Caches a value, notifying the invalidation hooks if it replaces a different one
+        """
+        key = str(key)
+        ttl = ttl if ttl is not None else self.ttls.get(namespace, self.ttl)
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        with self._lock:
+            entry = self._entries.get(namespace, {}).get(key)
+            self._remember(namespace, key, value, expires_at)
+        self._disk_set(namespace, key, value, expires_at)
+
+        if entry is not None and entry[0] != value:
+            self._notify(namespace, key, entry[0], value)
+
+    def get_or_fetch(self, namespace: str, key: str, fetch):
+        """
+        Returns the cached value, calling fetch() and caching its result on a miss
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self.set(namespace, key, value)
+        return value
+
+    def invalidate(self, namespace: str = None, key: str = None):
+        """
+        Drops a single entry, a whole namespace, or everything
+        """
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+            elif key is None:
+                self._entries.pop(namespace, None)
+            else:
+                self._entries.get(namespace, {}).pop(str(key), None)
+
+        if self.path is not None:
+            with self._connection() as conn:
+                if namespace is None:
+                    conn.execute("DELETE FROM metadata")
+                elif key is None:
+                    conn.execute(
+                        "DELETE FROM metadata WHERE namespace = ?", (namespace,)
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM metadata WHERE namespace = ? AND key = ?",
+                        (namespace, str(key)),
+                    )
+
+        self._notify(namespace, key, None, None)
+
+    def add_invalidation_hook(self, hook):
+        """
+        Registers hook(namespace, key, old_value, new_value), called when an entry
+        is invalidated or refreshed with a different value (e.g. a tick size change)
+        """
+        self._hooks.append(hook)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "size": sum(len(e) for e in self._entries.values()),
+            }
+
+    def _remember(self, namespace, key, value, expires_at):
+        entries = self._entries.setdefault(namespace, OrderedDict())
+        entries[key] = (value, expires_at)
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def _notify(self, namespace, key, old_value, new_value):
+        for hook in self._hooks:
+            hook(namespace, key, old_value, new_value)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections cannot be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, namespace, key, now):
+        if self.path is None:
+            return _MISSING, None
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value, expires_at FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+            .fetchone()
+        )
+        if row is None or (row[1] is not None and row[1] <= now):
+            return _MISSING, None
+        return decode(row[0]), row[1]
+
+    def _disk_set(self, namespace, key, value, expires_at):
+        if self.path is None:
+            return
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO metadata (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (namespace, key, encode(value), expires_at),
+            )
@@ -0,0 +1,281 @@
+"""
+Local market catalog synced from the /markets endpoint
+
+    python -m py_clob_client.catalog sync --host https://clob.polymarket.com
+    python -m py_clob_client.catalog search "BTC above" --days 7
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from .constants import END_CURSOR
+
+FIRST_CURSOR = "MA=="
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    condition_id TEXT PRIMARY KEY,
+    question TEXT,
+    market_slug TEXT,
+    end_date_iso TEXT,
+    end_ts INTEGER,
+    active INTEGER,
+    closed INTEGER,
+    neg_risk INTEGER,
+    minimum_tick_size TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS markets_end_ts ON markets (end_ts);
+CREATE TABLE IF NOT EXISTS tokens (
+    token_id TEXT PRIMARY KEY,
+    condition_id TEXT NOT NULL,
+    outcome TEXT
+);
+CREATE INDEX IF NOT EXISTS tokens_condition_id ON tokens (condition_id);
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS markets_fts USING fts5 (
+    question, condition_id UNINDEXED, tokenize = 'unicode61'
+);
+"""
+
+
+def parse_end_date(end_date_iso) -> int:
+    """
+    Converts an ISO end date to a unix timestamp, None if missing or malformed
+    """
+    if not end_date_iso:
+        return None
+    try:
+        dt = datetime.fromisoformat(end_date_iso.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+class MarketCatalog:
+    """
+    SQLite index of markets keyed by condition id, token id, question text and end date
+
+    The first sync crawls every /markets page. Later syncs resume from the last
+    page seen, which is where new markets are appended, and upsert what they read.
+    """
+
+    def __init__(self, path: str = "markets.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # sqlite built without fts5, fall back to LIKE scans
+            self.has_fts = False
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def sync(self, client, full: bool = False) -> int:
+        """
+        Crawls /markets pages into the catalog, returns the number of markets read
+        """
+        cursor = FIRST_CURSOR if full else self._get_state("cursor", FIRST_CURSOR)
+        count = 0
+        while cursor != END_CURSOR:
+            page = client.get_markets(next_cursor=cursor)
+            markets = page.get("data") or []
+            with self.conn:
+                self.upsert(markets)
+                # a page is re-read on the next sync until it is full, so only
+                # advance past pages whose successor exists
+                if page["next_cursor"] != END_CURSOR:
+                    self._set_state("cursor", page["next_cursor"])
+                self._set_state("synced_at", str(time.time()))
+            count += len(markets)
+            cursor = page["next_cursor"]
+        return count
+
+    def upsert(self, markets: list):
+        """
+        Inserts or updates raw market records
+        """
+        now = time.time()
+        for m in markets:
+            condition_id = m.get("condition_id")
+            if not condition_id:
+                continue
+            self.conn.execute(
+                "INSERT OR REPLACE INTO markets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    condition_id,
+                    m.get("question"),
+                    m.get("market_slug"),
+                    m.get("end_date_iso"),
+                    parse_end_date(m.get("end_date_iso")),
+                    _flag(m.get("active")),
+                    _flag(m.get("closed")),
+                    _flag(m.get("neg_risk")),
+                    _text(m.get("minimum_tick_size")),
+                    now,
+                ),
+            )
+            for t in m.get("tokens") or []:
+                if t.get("token_id"):
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO tokens VALUES (?, ?, ?)",
+                        (t["token_id"], condition_id, t.get("outcome")),
+                    )
+            if self.has_fts:
+                self.conn.execute(
+                    "DELETE FROM markets_fts WHERE condition_id = ?", (condition_id,)
+                )
+                self.conn.execute(
+                    "INSERT INTO markets_fts (question, condition_id) VALUES (?, ?)",
+                    (m.get("question") or "", condition_id),
+                )
+
+    def get_market(self, condition_id: str) -> dict:
+        row = self.conn.execute(
+            "SELECT * FROM markets WHERE condition_id = ?", (condition_id,)
+        ).fetchone()
+        return self._market(row) if row is not None else None
+
+    def get_market_by_token(self, token_id: str) -> dict:
+        row = self.conn.execute(
+            "SELECT m.* FROM tokens t JOIN markets m USING (condition_id) "
+            "WHERE t.token_id = ?",
+            (token_id,),
+        ).fetchone()
+        return self._market(row) if row is not None else None
+
+    def search(
+        self,
+        text: str = None,
+        end_after: int = None,
+        end_before: int = None,
+        active: bool = None,
+        closed: bool = None,
+        limit: int = None,
+    ) -> list[dict]:
+        """
+        Finds markets whose question contains every word of `text` and whose end
+        date (unix seconds) falls in [end_after, end_before)
+        """
+        sql = "SELECT m.* FROM markets m"
+        where = []
+        args = []
+        if text:
+            if self.has_fts:
+                sql += " JOIN markets_fts f ON f.condition_id = m.condition_id"
+                where.append("markets_fts MATCH ?")
+                args.append(
+                    " ".join('"{}"'.format(w.replace('"', '""')) for w in text.split())
+                )
+            else:
+                for w in text.split():
+                    where.append("m.question LIKE ?")
+                    args.append("%{}%".format(w))
+        if end_after is not None:
+            where.append("m.end_ts >= ?")
+            args.append(end_after)
+        if end_before is not None:
+            where.append("m.end_ts < ?")
+            args.append(end_before)
+        if active is not None:
+            where.append("m.active = ?")
+            args.append(int(active))
+        if closed is not None:
+            where.append("m.closed = ?")
+            args.append(int(closed))
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY m.end_ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [self._market(row) for row in self.conn.execute(sql, args)]
+
+    def _market(self, row) -> dict:
+        market = dict(row)
+        for k in ("active", "closed", "neg_risk"):
+            if market[k] is not None:
+                market[k] = bool(market[k])
+        market["tokens"] = [
+            {"token_id": t["token_id"], "outcome": t["outcome"]}
+            for t in self.conn.execute(
+                "SELECT token_id, outcome FROM tokens WHERE condition_id = ?",
+                (market["condition_id"],),
+            )
+        ]
+        return market
+
+    def _get_state(self, name: str, default=None):
+        row = self.conn.execute(
+            "SELECT value FROM sync_state WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row is not None else default
+
+    def _set_state(self, name: str, value: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (name, value)
+        )
+
+
+def _flag(value):
+    return None if value is None else int(bool(value))
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Polymarket market catalog")
+    parser.add_argument("--db", default="markets.db", help="catalog file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync = commands.add_parser("sync", help="crawl /markets into the catalog")
+    sync.add_argument("--host", default="https://clob.polymarket.com")
+    sync.add_argument("--full", action="store_true", help="re-crawl every page")
+
+    search = commands.add_parser("search", help="query the catalog")
+    search.add_argument("text", nargs="?", help="words the question must contain")
+    search.add_argument("--days", type=float, help="only markets ending within N days")
+    search.add_argument("--open", action="store_true", help="only open markets")
+
+    args = parser.parse_args(argv)
+    catalog = MarketCatalog(args.db)
+
+    if args.command == "sync":
+        from .client import ClobClient
+
+        count = catalog.sync(ClobClient(args.host), full=args.full)
+        print("synced {} markets into {}".format(count, args.db))
+    else:
+        now = int(time.time())
+        markets = catalog.search(
+            args.text,
+            end_after=now if args.days is not None else None,
+            end_before=now + int(args.days * 86400) if args.days is not None else None,
+            closed=False if args.open else None,
+        )
+        for m in markets:
+            print(json.dumps(m))
+
+    catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 
 from .order_builder.builder import OrderBuilder
+from .order_builder.amounts import invalid_prices
 from .headers.headers import create_level_1_headers, create_level_2_headers
 from .signer import Signer
 from .config import get_contract_config
+from .cache import MetadataCache, TICK_SIZE, NEG_RISK, MARKET, MARKETS
+from .batching import BatchLoader
+from .book import CompactBook, NumericBook
+from .replica import BookReplica
 
 from .endpoints import (
     CANCEL,
@@ -22,6 +29,7 @@ from .endpoints import (
     MID_POINT,
     ORDERS,
     POST_ORDER,
+    POST_ORDERS,
     PRICE,
     TIME,
     TRADES,
@@ -63,8 +71,9 @@ from .clob_types import (
     PartialCreateOrderOptions,
     BookParams,
     MarketOrderArgs,
+    PostOrdersArgs,
 )
-from .exceptions import PolyException
+from .exceptions import PolyException, PolyApiException, PolyBatchException
 from .http_helpers.helpers import (
     add_query_trade_params,
     add_query_open_orders_params,
@@ -74,15 +83,34 @@ from .http_helpers.helpers import (
     drop_notifications_query_params,
     add_balance_allowance_params_to_url,
     add_order_scoring_params_to_url,
+    stream,
+    warmup,
+)
+from .http_helpers.stream import JsonArrayStream, projector
+from .http_helpers.codec import encode, decode
+from .http_helpers.singleflight import SingleFlight
+
+from .constants import (
+    L0,
+    L1,
+    L1_AUTH_UNAVAILABLE,
+    L2,
+    L2_AUTH_UNAVAILABLE,
+    END_CURSOR,
+    BATCH_CHUNK_SIZE,
+    BATCH_CONCURRENCY,
+    POST_ORDERS_BATCH_SIZE,
+    BOOK_MAX_AGE,
+    WS_MARKET_URL,
 )
-
-from .constants import L0, L1, L1_AUTH_UNAVAILABLE, L2, L2_AUTH_UNAVAILABLE, END_CURSOR
 from .utilities import (
     parse_raw_orderbook_summary,
     generate_orderbook_summary_hash,
     order_to_json,
     is_tick_size_smaller,
     price_valid,
+    chunked,
+    merge_batch_results,
 )
 
 
@@ -95,6 +123,9 @@ class ClobClient:
         creds: ApiCreds = None,
         signature_type: int = None,
         funder: str = None,
+        cache: MetadataCache = None,
+        single_flight: bool = True,
+        signing_backend: str = None,
     ):
         """
         Initializes the clob client
@@ -107,10 +138,23 @@ class ClobClient:
 
         3) Level 2: Requires the host, chain_id, a private key, and Credentials.
                     Allows access to all endpoints
+
+        Requests go through the process-wide transport, switch it to HTTP/2 with
+        py_clob_client.http_helpers.transport.use_http2()
+
+        Tick sizes, neg risk flags and markets are kept in `cache`, an in-memory
+        MetadataCache by default. Pass MetadataCache(ttl=..., path=...) to expire
+        entries and share them with other processes through a file on disk
+
+        With single_flight (the default), concurrent identical unauthenticated GETs
+        share one in-flight request and its result, see single_flight_stats()
+
+        signing_backend selects how hashes are signed: "eth_account" or "coincurve".
+        By default coincurve (libsecp256k1) is used when installed
         """
         self.host = host[0:-1] if host.endswith("/") else host
         self.chain_id = chain_id
-        self.signer = Signer(key, chain_id) if key else None
+        self.signer = Signer(key, chain_id, signing_backend) if key else None
         self.creds = creds
         self.mode = self._get_client_mode()
 
@@ -120,11 +164,42 @@ class ClobClient:
             )
 
         # local cache
-        self.__tick_sizes = {}
-        self.__neg_risk = {}
+        self.cache = cache if cache is not None else MetadataCache()
+
+        # coalescing of identical in-flight reads
+        self.single_flight = SingleFlight() if single_flight else None
+
+        # batch endpoints
+        self.batch_chunk_size = BATCH_CHUNK_SIZE
+        self.batch_concurrency = BATCH_CONCURRENCY
+        self.__batch_executor = None
+        self.__loaders = None
+
+        # connection warm-up
+        self.__keep_warm_stop = None
+
+        # local books fed by the market channel
+        self.book_replica = None
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    def __get(self, endpoint: str):
+        """
+        Unauthenticated GET, shared with any identical request already in flight
+        """
+        if self.single_flight is None:
+            return get(endpoint)
+        return self.single_flight.do(endpoint, lambda: get(endpoint))
+
+    def single_flight_stats(self) -> dict:
+        """
+        Returns how many reads went through the single-flight layer and how many
+        of them were coalesced into another in-flight request
+        """
+        if self.single_flight is None:
+            return {"calls": 0, "coalesced": 0, "in_flight": 0}
+        return self.single_flight.stats()
+
     def get_address(self):
         """
         Returns the public address of the signer
@@ -160,14 +235,54 @@ class ClobClient:
         Health check: Confirms that the server is up
         Does not need authentication
         """
-        return get("{}/".format(self.host))
+        return self.__get("{}/".format(self.host))
 
     def get_server_time(self):
         """
         Returns the current timestamp on the server
         Does not need authentication
         """
-        return get("{}{}".format(self.host, TIME))
+        return self.__get("{}{}".format(self.host, TIME))
+
+    def warmup(self, connections: int = 4, keep_warm_interval: float = None):
+        """
+        Opens `connections` pooled connections to the host and prefetches the server
+        time, so the first order does not pay for DNS, TCP and TLS on the critical path
+        With keep_warm_interval (seconds), a background thread repeats this so idle
+        connections are refreshed before the server closes them
+        The signing pool is started too when builder.signing_workers is set
+        Returns the server time
+        """
+        if self.signer:
+            self.builder.start_signing_pool()
+        server_time = self.__warm_connections(connections)
+        if keep_warm_interval:
+            self.start_keep_warm(keep_warm_interval, connections)
+        return server_time
+
+    def start_keep_warm(self, interval: float = 30, connections: int = 4):
+        """
+        Starts (or restarts) the background keep-warm thread
+        """
+        self.stop_keep_warm()
+        stop = self.__keep_warm_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.__warm_connections(connections)
+                except Exception as e:
+                    self.logger.warning("keep-warm request failed: %s", e)
+
+        threading.Thread(target=run, name="clob-keep-warm", daemon=True).start()
+
+    def stop_keep_warm(self):
+        if self.__keep_warm_stop is not None:
+            self.__keep_warm_stop.set()
+            self.__keep_warm_stop = None
+
+    def __warm_connections(self, connections: int):
+        return warmup("{}{}".format(self.host, TIME), connections)
 
     def create_api_key(self, nonce: int = None) -> ApiCreds:
         """
@@ -264,58 +379,82 @@ class ClobClient:
         """
         Get the mid market price for the given market
         """
-        return get("{}{}?token_id={}".format(self.host, MID_POINT, token_id))
+        if self.__loaders is not None:
+            return self.__loaders[MID_POINT].load(token_id)
+        return self.__get("{}{}?token_id={}".format(self.host, MID_POINT, token_id))
 
     def get_midpoints(self, params: list[BookParams]):
         """
         Get the mid market prices for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, MID_POINTS), data=body)
+        return self.__post_in_chunks(MID_POINTS, body)
 
     def get_price(self, token_id, side):
         """
         Get the market price for the given market
         """
-        return get("{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side))
+        if self.__loaders is not None:
+            return self.__loaders[PRICE].load((token_id, side))
+        return self.__get(
+            "{}{}?token_id={}&side={}".format(self.host, PRICE, token_id, side)
+        )
 
     def get_prices(self, params: list[BookParams]):
         """
         Get the market prices for a set
         """
         body = [{"token_id": param.token_id, "side": param.side} for param in params]
-        return post("{}{}".format(self.host, GET_PRICES), data=body)
+        return self.__post_in_chunks(GET_PRICES, body)
 
     def get_spread(self, token_id):
         """
         Get the spread for the given market
         """
-        return get("{}{}?token_id={}".format(self.host, GET_SPREAD, token_id))
+        return self.__get("{}{}?token_id={}".format(self.host, GET_SPREAD, token_id))
 
     def get_spreads(self, params: list[BookParams]):
         """
         Get the spreads for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, GET_SPREADS), data=body)
+        return self.__post_in_chunks(GET_SPREADS, body)
 
     def get_tick_size(self, token_id: str) -> TickSize:
-        if token_id in self.__tick_sizes:
-            return self.__tick_sizes[token_id]
-
-        result = get("{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id))
-        self.__tick_sizes[token_id] = str(result["minimum_tick_size"])
+        def fetch():
+            result = self.__get(
+                "{}{}?token_id={}".format(self.host, GET_TICK_SIZE, token_id)
+            )
+            return str(result["minimum_tick_size"])
 
-        return self.__tick_sizes[token_id]
+        return self.cache.get_or_fetch(TICK_SIZE, token_id, fetch)
 
     def get_neg_risk(self, token_id: str) -> bool:
-        if token_id in self.__neg_risk:
-            return self.__neg_risk[token_id]
+        def fetch():
+            result = self.__get(
+                "{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id)
+            )
+            return result["neg_risk"]
+
+        return self.cache.get_or_fetch(NEG_RISK, token_id, fetch)
+
+    def invalidate_tick_size(self, token_id: str = None):
+        """
+        Drops the cached tick size for a token (or all tokens), e.g. after the
+        market's tick size changed, so the next order fetches the new one
+        """
+        self.cache.invalidate(TICK_SIZE, token_id)
 
-        result = get("{}{}?token_id={}".format(self.host, GET_NEG_RISK, token_id))
-        self.__neg_risk[token_id] = result["neg_risk"]
+    def __on_tick_size_change(self, token_id: str, tick_size: TickSize):
+        self.cache.set(TICK_SIZE, token_id, tick_size)
 
-        return result["neg_risk"]
+    def __check_tick_size_rejection(self, token_id: str, error):
+        """
+        Drops the cached tick size of a token whose order was rejected for its
+        tick size, e.g. INVALID_ORDER_MIN_TICK_SIZE, so the next order refetches it
+        """
+        if token_id and "tick size" in str(error).lower().replace("_", " "):
+            self.invalidate_tick_size(token_id)
 
     def __resolve_tick_size(
         self, token_id: str, tick_size: TickSize = None
@@ -341,8 +480,74 @@ class ClobClient:
         Level 1 Auth required
         """
         self.assert_level_1_auth()
+        return self.builder.create_order(
+            order_args, self.__resolve_order_options(order_args, options)
+        )
+
+    def create_orders(
+        self,
+        args: list[OrderArgs],
+        options: Optional[PartialCreateOrderOptions] = None,
+    ):
+        """
+        Creates and signs many orders, signing them in parallel on a process pool
+        Returns the signed orders in input order
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
+        return self.builder.create_orders(
+            args, [self.__resolve_order_options(a, options) for a in args]
+        )
+
+    def build_ladder(
+        self,
+        token_id: str,
+        side: str,
+        prices: list[float],
+        sizes,
+        options: Optional[PartialCreateOrderOptions] = None,
+        expiration: int = 0,
+    ):
+        """
+        Creates and signs a ladder of limit orders, one per price level of a token
+        `sizes` is one size for every level or a list with one per level
+        Market metadata is resolved once and the whole grid is validated and
+        priced in one pass before the orders are signed in bulk
+        Level 1 Auth required
+        """
+        self.assert_level_1_auth()
 
-        # add resolve_order_options, or similar
+        tick_size = self.__resolve_tick_size(
+            token_id, options.tick_size if options else None
+        )
+        invalid = invalid_prices(prices, tick_size)
+        if invalid:
+            raise Exception(
+                "price ("
+                + str(invalid[0])
+                + "), min: "
+                + str(tick_size)
+                + " - max: "
+                + str(1 - float(tick_size))
+            )
+        neg_risk = (
+            options.neg_risk
+            if options and options.neg_risk
+            else self.get_neg_risk(token_id)
+        )
+
+        return self.builder.build_ladder(
+            token_id,
+            side,
+            prices,
+            sizes,
+            CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk),
+            expiration=expiration,
+        )
+
+    def __resolve_order_options(
+        self, order_args: OrderArgs, options: Optional[PartialCreateOrderOptions]
+    ) -> CreateOrderOptions:
         tick_size = self.__resolve_tick_size(
             order_args.token_id,
             options.tick_size if options else None,
@@ -364,22 +569,25 @@ class ClobClient:
             else self.get_neg_risk(order_args.token_id)
         )
 
-        return self.builder.create_order(
-            order_args,
-            CreateOrderOptions(
-                tick_size=tick_size,
-                neg_risk=neg_risk,
-            ),
+        return CreateOrderOptions(
+            tick_size=tick_size,
+            neg_risk=neg_risk,
         )
 
     def create_market_order(
         self,
         order_args: MarketOrderArgs,
         options: Optional[PartialCreateOrderOptions] = None,
+        book: Optional[NumericBook] = None,
+        max_book_age: float = BOOK_MAX_AGE,
     ):
         """
         Creates and signs an order
         Level 1 Auth required
+
+        `book` is a snapshot from get_book_snapshot, already used to quote and size
+        the order, from which the market price is derived without fetching the book
+        again. It is refetched when older than `max_book_age` seconds
         """
         self.assert_level_1_auth()
 
@@ -391,7 +599,10 @@ class ClobClient:
 
         if order_args.price is None or order_args.price <= 0:
             order_args.price = self.calculate_market_price(
-                order_args.token_id, order_args.side, order_args.amount
+                order_args.token_id,
+                order_args.side,
+                order_args.amount,
+                book=self.__fresh_book(order_args.token_id, book, max_book_age),
             )
 
         if not price_valid(order_args.price, tick_size):
@@ -423,13 +634,24 @@ class ClobClient:
         Posts the order
         """
         self.assert_level_2_auth()
-        body = order_to_json(order, self.creds.api_key, orderType)
+        order_json = order_to_json(order, self.creds.api_key, orderType)
+        body = encode(order_json)
         headers = create_level_2_headers(
             self.signer,
             self.creds,
             RequestArgs(method="POST", request_path=POST_ORDER, body=body),
         )
-        return post("{}{}".format(self.host, POST_ORDER), headers=headers, data=body)
+        token_id = order_json["order"].get("tokenId")
+        try:
+            resp = post(
+                "{}{}".format(self.host, POST_ORDER), headers=headers, data=body
+            )
+        except PolyApiException as e:
+            self.__check_tick_size_rejection(token_id, e.error_msg)
+            raise
+        if isinstance(resp, dict) and resp.get("errorMsg"):
+            self.__check_tick_size_rejection(token_id, resp["errorMsg"])
+        return resp
 
     def create_and_post_order(
         self, order_args: OrderArgs, options: PartialCreateOrderOptions = None
@@ -440,13 +662,90 @@ class ClobClient:
         ord = self.create_order(order_args, options)
         return self.post_order(ord)
 
+    def post_orders(self, args: list) -> list:
+        """
+        Posts many signed orders, given as PostOrdersArgs or (order, orderType) pairs,
+        in batches of at most POST_ORDERS_BATCH_SIZE with one set of L2 headers per batch
+        Returns the per-order results in input order
+        Raises PolyBatchException, keyed by input index, if some batches failed or
+        did not return one result per order, with None results for their orders
+        Level 2 Auth required
+        """
+        self.assert_level_2_auth()
+        bodies = [
+            order_to_json(a.order, self.creds.api_key, a.orderType)
+            for a in (
+                a if isinstance(a, PostOrdersArgs) else PostOrdersArgs(*a) for a in args
+            )
+        ]
+        endpoint = "{}{}".format(self.host, POST_ORDERS)
+
+        def send(batch):
+            body = encode(batch)
+            headers = create_level_2_headers(
+                self.signer,
+                self.creds,
+                RequestArgs(method="POST", request_path=POST_ORDERS, body=body),
+            )
+            try:
+                return post(endpoint, headers=headers, data=body), None
+            except PolyApiException as e:
+                return None, e
+
+        batches = chunked(bodies, POST_ORDERS_BATCH_SIZE)
+        if not batches:
+            return []
+        if len(batches) == 1:
+            responses = [send(batches[0])]
+        else:
+            responses = self.__map_batches(send, batches)
+
+        results = []
+        errors = {}
+        for batch, (response, e) in zip(batches, responses):
+            if e is None and (
+                not isinstance(response, list) or len(response) != len(batch)
+            ):
+                e = PolyApiException(
+                    error_msg="expected {} order results, got {!r}".format(
+                        len(batch), response
+                    )
+                )
+            if e is not None:
+                errors.update((len(results) + i, e) for i in range(len(batch)))
+                results += [None] * len(batch)
+            else:
+                results += response
+        for body, result, i in zip(bodies, results, range(len(results))):
+            error = errors[i].error_msg if i in errors else None
+            if isinstance(result, dict):
+                error = result.get("errorMsg")
+            if error:
+                self.__check_tick_size_rejection(body["order"].get("tokenId"), error)
+        if errors:
+            raise PolyBatchException(errors, results)
+        return results
+
+    def create_and_post_orders(
+        self,
+        args: list[OrderArgs],
+        options: PartialCreateOrderOptions = None,
+        orderType: OrderType = OrderType.GTC,
+    ) -> list:
+        """
+        Utility function to create and sign every order first, then publish them
+        with post_orders
+        """
+        orders = self.create_orders(args, options)
+        return self.post_orders([PostOrdersArgs(o, orderType) for o in orders])
+
     def cancel(self, order_id):
         """
         Cancels an order
         Level 2 Auth required
         """
         self.assert_level_2_auth()
-        body = {"orderID": order_id}
+        body = encode({"orderID": order_id})
 
         request_args = RequestArgs(method="DELETE", request_path=CANCEL, body=body)
         headers = create_level_2_headers(self.signer, self.creds, request_args)
@@ -458,7 +757,7 @@ class ClobClient:
         Level 2 Auth required
         """
         self.assert_level_2_auth()
-        body = order_ids
+        body = encode(order_ids)
 
         request_args = RequestArgs(
             method="DELETE", request_path=CANCEL_ORDERS, body=body
@@ -484,7 +783,7 @@ class ClobClient:
         Level 2 Auth required
         """
         self.assert_level_2_auth()
-        body = {"market": market, "asset_id": asset_id}
+        body = encode({"market": market, "asset_id": asset_id})
 
         request_args = RequestArgs(
             method="DELETE", request_path=CANCEL_MARKET_ORDERS, body=body
@@ -517,18 +816,87 @@ class ClobClient:
 
     def get_order_book(self, token_id) -> OrderBookSummary:
         """
-        Fetches the orderbook for the token_id
+        Fetches the orderbook for the token_id, or reads it from the book replica
+        when one is running and has the token synced
         """
-        raw_obs = get("{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id))
+        if self.book_replica is not None:
+            book = self.book_replica.get_order_book(token_id)
+            if book is not None:
+                return book
+        if self.__loaders is not None:
+            return parse_raw_orderbook_summary(
+                self.__loaders[GET_ORDER_BOOK].load(token_id)
+            )
+        raw_obs = self.__get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
         return parse_raw_orderbook_summary(raw_obs)
 
-    def get_order_books(self, params: list[BookParams]) -> list[OrderBookSummary]:
+    def start_book_replica(
+        self, token_ids, url: str = WS_MARKET_URL, verify: bool = True
+    ) -> BookReplica:
+        """
+        Starts a local replica of the books of token_ids fed by the market channel,
+        from which get_order_book then reads. Books failing hash verification
+        are resynced from /book, and tick_size_change events update the cached
+        tick sizes
+        """
+        self.stop_book_replica()
+        self.book_replica = BookReplica(
+            token_ids,
+            url,
+            fetch=self.__get_raw_book,
+            verify=verify,
+            on_tick_size_change=self.__on_tick_size_change,
+        ).start()
+        return self.book_replica
+
+    def stop_book_replica(self):
+        if self.book_replica is not None:
+            self.book_replica.stop()
+            self.book_replica = None
+
+    def __get_raw_book(self, token_id: str) -> dict:
+        return self.__get(
+            "{}{}?token_id={}".format(self.host, GET_ORDER_BOOK, token_id)
+        )
+
+    def get_book_snapshot(self, token_id) -> NumericBook:
+        """
+        Fetches the orderbook for the token_id as a NumericBook stamped with its
+        fetch time, to be shared by quoting, sizing and create_market_order
+        """
+        return NumericBook.from_summary(self.get_order_book(token_id))
+
+    def __fresh_book(
+        self, token_id: str, book: Optional[NumericBook], max_age: float
+    ) -> Optional[NumericBook]:
+        if book is None:
+            return None
+        if book.asset_id is not None and book.asset_id != token_id:
+            raise Exception(
+                "book of token " + str(book.asset_id) + " given for " + str(token_id)
+            )
+        if max_age is not None and book.age() > max_age:
+            return self.get_book_snapshot(token_id)
+        return book
+
+    def get_order_books(
+        self, params: list[BookParams], compact: bool = False
+    ) -> list[OrderBookSummary]:
         """
         Fetches the orderbook for a set of token ids
+        With compact=True the books are returned as CompactBooks, integer buffers
+        building the OrderSummary levels only when accessed
         """
+        parse = CompactBook.from_raw if compact else parse_raw_orderbook_summary
         body = [{"token_id": param.token_id} for param in params]
-        raw_obs = post("{}{}".format(self.host, GET_ORDER_BOOKS), data=body)
-        return [parse_raw_orderbook_summary(r) for r in raw_obs]
+        try:
+            raw_obs = self.__post_in_chunks(GET_ORDER_BOOKS, body)
+        except PolyBatchException as e:
+            e.results = [parse(r) for r in e.results or []]
+            raise
+        return [parse(r) for r in raw_obs]
 
     def get_order_book_hash(self, orderbook: OrderBookSummary) -> str:
         """
@@ -572,14 +940,171 @@ class ClobClient:
         """
         Fetches the last trade price token_id
         """
-        return get("{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id))
+        return self.__get(
+            "{}{}?token_id={}".format(self.host, GET_LAST_TRADE_PRICE, token_id)
+        )
 
     def get_last_trades_prices(self, params: list[BookParams]):
         """
         Fetches the last trades prices for a set of token ids
         """
         body = [{"token_id": param.token_id} for param in params]
-        return post("{}{}".format(self.host, GET_LAST_TRADES_PRICES), data=body)
+        return self.__post_in_chunks(GET_LAST_TRADES_PRICES, body)
+
+    def enable_batching(self, window_ms: float = 2, max_batch: int = None):
+        """
+        Folds get_price, get_midpoint and get_order_book calls issued from several
+        threads within window_ms of each other into single /prices, /midpoints and
+        /books requests, and hands each caller its own result
+        """
+        window = window_ms / 1000
+        max_batch = max_batch or self.batch_chunk_size
+        self.__loaders = {
+            PRICE: BatchLoader(self.__load_prices, window, max_batch),
+            MID_POINT: BatchLoader(self.__load_midpoints, window, max_batch),
+            GET_ORDER_BOOK: BatchLoader(self.__load_order_books, window, max_batch),
+        }
+
+    def disable_batching(self):
+        """
+        Flushes pending batched calls and goes back to one request per call
+        """
+        loaders, self.__loaders = self.__loaders, None
+        for loader in (loaders or {}).values():
+            loader.flush()
+
+    def batching_stats(self) -> dict:
+        """
+        Returns the number of single-token loads and batch requests per endpoint
+        """
+        return {path: loader.stats() for path, loader in (self.__loaders or {}).items()}
+
+    def __load_prices(self, keys: list) -> dict:
+        return self.__load_batch(
+            GET_PRICES,
+            keys,
+            [{"token_id": token_id, "side": side} for token_id, side in keys],
+            lambda prices: {
+                (token_id, side): {"price": price}
+                for token_id, sides in prices.items()
+                for side, price in sides.items()
+            },
+        )
+
+    def __load_midpoints(self, keys: list) -> dict:
+        return self.__load_batch(
+            MID_POINTS,
+            keys,
+            [{"token_id": token_id} for token_id in keys],
+            lambda mids: {token_id: {"mid": mid} for token_id, mid in mids.items()},
+        )
+
+    def __load_order_books(self, keys: list) -> dict:
+        return self.__load_batch(
+            GET_ORDER_BOOKS,
+            keys,
+            [{"token_id": token_id} for token_id in keys],
+            lambda books: {book["asset_id"]: book for book in books},
+        )
+
+    def __load_batch(self, path: str, keys: list, body: list, index) -> dict:
+        """
+        Sends one batch request for the loader keys and maps the response back to them
+        """
+        try:
+            response, errors = self.__post_in_chunks(path, body), {}
+        except PolyBatchException as e:
+            response, errors = e.results, e.errors
+
+        results = index(response) if response else {}
+        failed = {}
+        for key in keys:
+            token_id = key[0] if isinstance(key, tuple) else key
+            if token_id in errors:
+                failed[key] = errors[token_id]
+        if failed:
+            raise PolyBatchException(failed, results)
+        return results
+
+    def __post_in_chunks(self, path: str, body: list):
+        """
+        Posts a batch body in chunks of at most batch_chunk_size tokens, sent
+        concurrently, and merges the responses back in input order
+        Raises PolyBatchException listing the failed tokens, also when the body
+        fits in a single chunk
+        """
+        endpoint = "{}{}".format(self.host, path)
+        chunks = chunked(body, self.batch_chunk_size)
+        if len(chunks) <= 1:
+            parts = self.__post_isolating(endpoint, body)
+        else:
+            parts = [
+                part
+                for chunk_parts in self.__map_batches(
+                    lambda chunk: self.__post_isolating(endpoint, chunk), chunks
+                )
+                for part in chunk_parts
+            ]
+
+        results = merge_batch_results([r for _, r, _ in parts])
+        errors = {
+            item["token_id"]: e
+            for part, _, e in parts
+            if e is not None
+            for item in part
+        }
+        if errors:
+            raise PolyBatchException(errors, results)
+        return results
+
+    def __post_isolating(self, endpoint: str, chunk: list) -> list:
+        """
+        Posts one chunk, splitting a chunk rejected with a client error in halves
+        until the rejected tokens are isolated, so one bad token does not fail
+        its whole chunk
+        Returns (items, response, error) tuples in input order
+        """
+        try:
+            return [(chunk, post(endpoint, data=chunk), None)]
+        except PolyApiException as e:
+            client_error = e.status_code is not None and 400 <= e.status_code < 500
+            if len(chunk) < 2 or not client_error or e.status_code == 429:
+                return [(chunk, None, e)]
+        half = len(chunk) // 2
+        return self.__post_isolating(endpoint, chunk[:half]) + self.__post_isolating(
+            endpoint, chunk[half:]
+        )
+
+    def __map_batches(self, fn, batches: list) -> list:
+        """
+        Applies fn to every batch on the shared batch executor, results in input order
+        """
+        if self.__batch_executor is None:
+            self.__batch_executor = ThreadPoolExecutor(
+                max_workers=self.batch_concurrency,
+                thread_name_prefix="clob-batch",
+            )
+        return list(self.__batch_executor.map(fn, batches))
+
+    def close(self):
+        """
+        Releases what the client started in the background: the keep-warm thread,
+        the book replica, the batch executor and the signing pool of the builder
+        The client can also be used as a context manager, which closes it on exit
+        """
+        self.stop_keep_warm()
+        self.stop_book_replica()
+        if self.__batch_executor is not None:
+            self.__batch_executor.shutdown()
+            self.__batch_executor = None
+        if self.signer:
+            self.builder.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def assert_level_1_auth(self):
         """
@@ -677,7 +1202,7 @@ class ClobClient:
         Requires Level 2 authentication
         """
         self.assert_level_2_auth()
-        body = params.orderIds
+        body = encode(params.orderIds)
         request_args = RequestArgs(
             method="POST", request_path=ARE_ORDERS_SCORING, body=body
         )
@@ -690,7 +1215,7 @@ class ClobClient:
         """
         Get the current sampling markets
         """
-        return get(
+        return self.__get(
             "{}{}?next_cursor={}".format(self.host, GET_SAMPLING_MARKETS, next_cursor)
         )
 
@@ -698,7 +1223,7 @@ class ClobClient:
         """
         Get the current sampling simplified markets
         """
-        return get(
+        return self.__get(
             "{}{}?next_cursor={}".format(
                 self.host, GET_SAMPLING_SIMPLIFIED_MARKETS, next_cursor
             )
@@ -707,41 +1232,114 @@ class ClobClient:
     def get_markets(self, next_cursor="MA=="):
         """
         Get the current markets
+        Pages are cached only when the cache has a ttl for MARKETS, e.g.
+        MetadataCache(ttls={MARKETS: 60})
         """
-        return get("{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor))
+
+        def fetch():
+            return self.__get(
+                "{}{}?next_cursor={}".format(self.host, GET_MARKETS, next_cursor)
+            )
+
+        if MARKETS not in self.cache.ttls:
+            return fetch()
+        return self.cache.get_or_fetch(MARKETS, next_cursor, fetch)
 
     def get_simplified_markets(self, next_cursor="MA=="):
         """
         Get the current simplified markets
         """
-        return get(
+        return self.__get(
             "{}{}?next_cursor={}".format(self.host, GET_SIMPLIFIED_MARKETS, next_cursor)
         )
 
+    def stream_markets(self, next_cursor="MA==", fields=None) -> JsonArrayStream:
+        """
+        Streams a page of markets: records are parsed from the response body one at a
+        time and, if `fields` is given, projected to those keys. The page's cursor is
+        available as .next_cursor once iteration is over
+        """
+        return self.__stream_page(GET_MARKETS, next_cursor, fields)
+
+    def stream_simplified_markets(
+        self, next_cursor="MA==", fields=None
+    ) -> JsonArrayStream:
+        """
+        Streams a page of simplified markets, see stream_markets
+        """
+        return self.__stream_page(GET_SIMPLIFIED_MARKETS, next_cursor, fields)
+
+    def stream_sampling_markets(
+        self, next_cursor="MA==", fields=None
+    ) -> JsonArrayStream:
+        """
+        Streams a page of sampling markets, see stream_markets
+        """
+        return self.__stream_page(GET_SAMPLING_MARKETS, next_cursor, fields)
+
+    def stream_sampling_simplified_markets(
+        self, next_cursor="MA==", fields=None
+    ) -> JsonArrayStream:
+        """
+        Streams a page of sampling simplified markets, see stream_markets
+        """
+        return self.__stream_page(GET_SAMPLING_SIMPLIFIED_MARKETS, next_cursor, fields)
+
+    def iter_markets(
+        self, fields=None, next_cursor="MA==", simplified: bool = False
+    ) -> Iterator[dict]:
+        """
+        Yields every market from next_cursor to the last page, streaming each page
+        """
+        page_stream = (
+            self.stream_simplified_markets if simplified else self.stream_markets
+        )
+        while next_cursor != END_CURSOR:
+            page = page_stream(next_cursor, fields)
+            yield from page
+            next_cursor = page.next_cursor or END_CURSOR
+
+    def __stream_page(self, path: str, next_cursor: str, fields) -> JsonArrayStream:
+        return JsonArrayStream(
+            stream("{}{}?next_cursor={}".format(self.host, path, next_cursor)),
+            key="data",
+            project=projector(fields),
+        )
+
     def get_market(self, condition_id):
         """
         Get a market by condition_id
         """
-        return get("{}{}{}".format(self.host, GET_MARKET, condition_id))
+        return self.cache.get_or_fetch(
+            MARKET,
+            condition_id,
+            lambda: self.__get("{}{}{}".format(self.host, GET_MARKET, condition_id)),
+        )
 
     def get_market_trades_events(self, condition_id):
         """
         Get the market's trades events by condition id
         """
-        return get("{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id))
+        return self.__get(
+            "{}{}{}".format(self.host, GET_MARKET_TRADES_EVENTS, condition_id)
+        )
 
-    def calculate_market_price(self, token_id: str, side: str, amount: float) -> float:
+    def calculate_market_price(
+        self,
+        token_id: str,
+        side: str,
+        amount: float,
+        book: Optional[NumericBook] = None,
+    ) -> float:
         """
-        Calculates the matching price considering an amount and the current orderbook
+        Calculates the matching price considering an amount and the current orderbook,
+        or `book` when a snapshot is given
         """
-        book = self.get_order_book(token_id)
         if book is None:
-            raise Exception("no orderbook")
-        if side == "BUY":
-            if book.asks is None:
-                raise Exception("no match")
-            return self.builder.calculate_buy_market_price(book.asks, amount)
-        else:
-            if book.bids is None:
+            summary = self.get_order_book(token_id)
+            if summary is None:
+                raise Exception("no orderbook")
+            if (summary.asks if side == "BUY" else summary.bids) is None:
                 raise Exception("no match")
-            return self.builder.calculate_sell_market_price(book.bids, amount)
+            book = NumericBook.from_summary(summary)
+        return book.market_price("BUY" if side == "BUY" else "SELL", amount)
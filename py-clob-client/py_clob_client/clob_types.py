@@ -180,6 +180,16 @@ class OrderType(enumerate):
     GTD = "GTD"
 
 
+@dataclass
+class PostOrdersArgs:
+    order: Any
+    """
+    SignedOrder
+    """
+
+    orderType: OrderType = OrderType.GTC
+
+
 @dataclass
 class OrderScoringParams:
     orderId: str
@@ -20,3 +20,18 @@ AMOY = 80002
 POLYGON = 137
 
 END_CURSOR = "LTE="
+
+# Maximum number of tokens sent in a single request to the batch endpoints
+BATCH_CHUNK_SIZE = 500
+
+# Number of batch chunks sent concurrently
+BATCH_CONCURRENCY = 8
+
+# Maximum number of orders accepted by a single POST /orders request
+POST_ORDERS_BATCH_SIZE = 15
+
+# Maximum age in seconds of a book snapshot reused to price a market order
+BOOK_MAX_AGE = 2.0
+
+# CLOB market channel, streaming book snapshots and price changes per token
+WS_MARKET_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
@@ -29,3 +29,26 @@ class PolyApiException(PolyException):
 
     def __str__(self):
         return self.__repr__()
+
+
+class PolyBatchException(PolyApiException):
+    """
+    Raised when some items of a batch request failed, whatever the number of
+    chunks it was sent in
+    `errors` maps each failed key (a token id, or an input index for post_orders)
+    to its exception and `results` holds the merged results of the items that
+    succeeded
+    A PolyApiException, so callers catching that still see batch failures
+    """
+
+    def __init__(self, errors: dict, results=None):
+        self.errors = errors
+        self.results = results
+        self.msg = "{} of the requested items failed".format(len(errors))
+        super().__init__(error_msg=self.msg)
+
+    def __repr__(self):
+        return "PolyBatchException[failed={}]".format(list(self.errors))
+
+    def __str__(self):
+        return self.__repr__()
@@ -1,5 +1,5 @@
 from ..clob_types import ApiCreds, RequestArgs
-from ..signing.hmac import build_hmac_signature
+from ..signing.hmac import get_hmac_context
 from ..signer import Signer
 from ..signing.eip712 import sign_clob_auth_message
 from datetime import datetime
@@ -39,8 +39,7 @@ def create_level_2_headers(signer: Signer, creds: ApiCreds, request_args: Reques
     """
     timestamp = int(datetime.now().timestamp())
 
-    hmac_sig = build_hmac_signature(
-        creds.api_secret,
+    hmac_sig = get_hmac_context(creds.api_secret).sign(
         timestamp,
         request_args.method,
         request_args.request_path,
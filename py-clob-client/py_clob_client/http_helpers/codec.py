@@ -0,0 +1,82 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class StdlibCodec:
+    """
+    JSON codec backed by the standard library
+    """
+
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        # compact separators and raw unicode so the output matches orjson byte for byte
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode(
+            "utf-8"
+        )
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """
+    JSON codec backed by orjson
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        self._fallback = StdlibCodec()
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits, the stdlib does not
+            return self._fallback.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+def default_codec():
+    """
+    Returns the fastest available codec: orjson if installed, the stdlib otherwise
+    """
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibCodec()
+
+
+_codec = default_codec()
+
+
+def get_codec():
+    return _codec
+
+
+def set_codec(codec):
+    """
+    Replaces the codec used for every request and response body
+    """
+    global _codec
+    _codec = codec if codec is not None else default_codec()
+
+
+def encode(obj) -> bytes:
+    """
+    Serializes a request body to the exact bytes that are signed and sent
+    """
+    return _codec.dumps(obj)
+
+
+def decode(data):
+    """
+    Deserializes a response body
+    """
+    return _codec.loads(data)
@@ -1,4 +1,4 @@
-import requests
+import time
 
 from py_clob_client.clob_types import (
     DropNotificationParams,
@@ -10,6 +10,17 @@ from py_clob_client.clob_types import (
 )
 
 from ..exceptions import PolyApiException
+from .codec import encode, decode
+from .transport import get_transport
+from ..metrics import (
+    RequestEvent,
+    emit,
+    has_metrics_hooks,
+    path_template,
+    OK,
+    HTTP_ERROR,
+    TRANSPORT_ERROR,
+)
 
 GET = "GET"
 POST = "POST"
@@ -33,21 +44,135 @@ def overloadHeaders(method: str, headers: dict) -> dict:
 
 
 def request(endpoint: str, method: str, headers=None, data=None):
+    if not has_metrics_hooks():
+        return _request(endpoint, method, headers, data)
+
+    event = RequestEvent(
+        method=method, path=path_template(endpoint), duration=0.0, outcome=OK
+    )
+    start = time.perf_counter()
+    try:
+        return _request(endpoint, method, headers, data, event)
+    except PolyApiException as e:
+        event.outcome = HTTP_ERROR if e.status_code is not None else TRANSPORT_ERROR
+        raise
+    finally:
+        event.duration = time.perf_counter() - start
+        emit(event)
+
+
+def _request(endpoint: str, method: str, headers=None, data=None, event=None):
+    transport = get_transport()
     try:
         headers = overloadHeaders(method, headers)
-        resp = requests.request(
-            method=method, url=endpoint, headers=headers, json=data if data else None
+        body = serialize_body(data)
+        resp = transport.request(
+            method=method, url=endpoint, headers=headers, data=body
         )
+        if event is not None:
+            event.status_code = resp.status_code
+            event.bytes_out = len(body) if body else 0
+            event.bytes_in = len(resp.content)
         if resp.status_code != 200:
             raise PolyApiException(resp)
 
         try:
-            return resp.json()
-        except requests.JSONDecodeError:
+            return decode(resp.content)
+        except ValueError:
             return resp.text
 
-    except requests.RequestException:
+    except transport.errors:
+        raise PolyApiException(error_msg="Request exception!")
+
+
+def warmup(endpoint: str, connections: int = 1, headers=None):
+    """
+    GETs an endpoint over `connections` concurrent pooled connections, checked
+    and reported like request(), and returns the decoded first response
+    """
+    if not has_metrics_hooks():
+        return _warmup(endpoint, connections, headers)
+
+    event = RequestEvent(
+        method=GET, path=path_template(endpoint), duration=0.0, outcome=OK
+    )
+    start = time.perf_counter()
+    try:
+        return _warmup(endpoint, connections, headers, event)
+    except PolyApiException as e:
+        event.outcome = HTTP_ERROR if e.status_code is not None else TRANSPORT_ERROR
+        raise
+    finally:
+        event.duration = time.perf_counter() - start
+        emit(event)
+
+
+def _warmup(endpoint: str, connections: int, headers=None, event=None):
+    transport = get_transport()
+    try:
+        responses = transport.warmup(
+            endpoint, connections, headers=overloadHeaders(GET, headers)
+        )
+    except transport.errors:
+        raise PolyApiException(error_msg="Request exception!")
+
+    if event is not None:
+        event.status_code = responses[0].status_code
+        event.bytes_in = sum(len(resp.content) for resp in responses)
+    for resp in responses:
+        if resp.status_code != 200:
+            raise PolyApiException(resp)
+
+    try:
+        return decode(responses[0].content)
+    except ValueError:
+        return responses[0].text
+
+
+def stream(endpoint: str, headers=None, chunk_size: int = 65536):
+    """
+    GETs an endpoint and yields its response body as byte chunks
+    """
+    transport = get_transport()
+    event = None
+    if has_metrics_hooks():
+        event = RequestEvent(
+            method=GET, path=path_template(endpoint), duration=0.0, outcome=OK
+        )
+    start = time.perf_counter()
+    try:
+        with transport.stream(
+            GET, endpoint, overloadHeaders(GET, headers), chunk_size
+        ) as (resp, chunks):
+            if event is not None:
+                event.status_code = resp.status_code
+            if resp.status_code != 200:
+                raise PolyApiException(resp)
+            for chunk in chunks:
+                if event is not None:
+                    event.bytes_in += len(chunk)
+                yield chunk
+    except transport.errors:
+        if event is not None:
+            event.outcome = TRANSPORT_ERROR
         raise PolyApiException(error_msg="Request exception!")
+    except PolyApiException:
+        if event is not None:
+            event.outcome = HTTP_ERROR
+        raise
+    finally:
+        if event is not None:
+            event.duration = time.perf_counter() - start
+            emit(event)
+
+
+def serialize_body(data) -> bytes:
+    """
+    Serializes a request body, passing through bodies that were already serialized
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    return encode(data) if data else None
 
 
 def post(endpoint, headers=None, data=None):
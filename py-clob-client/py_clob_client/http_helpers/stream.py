@@ -0,0 +1,124 @@
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+
+# drop consumed input once this many characters have been parsed
+_COMPACT_AT = 1 << 16
+
+
+class JsonArrayStream:
+    """
+    Incrementally parses a JSON object from byte chunks, yielding the items of its
+    `key` array one at a time without materializing the whole document
+
+    Every other top-level member is decoded into `meta`, e.g. stream.meta["next_cursor"]
+    once iteration reaches it. `project`, if given, is applied to each item before it
+    is yielded. Memory is bounded by the chunk size plus the largest single item.
+    """
+
+    def __init__(self, chunks, key: str = "data", project=None):
+        self.key = key
+        self.project = project
+        self.meta = {}
+
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    @property
+    def next_cursor(self):
+        return self.meta.get("next_cursor")
+
+    def __iter__(self):
+        self._expect("{")
+        while True:
+            c = self._peek()
+            if c == "}":
+                self._pos += 1
+                return
+            if c == ",":
+                self._pos += 1
+                continue
+            name = self._value()
+            self._expect(":")
+            if name == self.key and self._peek() == "[":
+                yield from self._items()
+            else:
+                self.meta[name] = self._value()
+
+    def _items(self):
+        self._expect("[")
+        while True:
+            c = self._peek()
+            if c == "]":
+                self._pos += 1
+                return
+            if c == ",":
+                self._pos += 1
+                continue
+            item = self._value()
+            yield self.project(item) if self.project is not None else item
+
+    def _fill(self) -> bool:
+        """
+        Reads the next chunk into the buffer, False at the end of the input
+        """
+        if self._eof:
+            return False
+        if self._pos >= _COMPACT_AT:
+            self._buf = self._buf[self._pos :]
+            self._pos = 0
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            self._buf += self._utf8.decode(b"", final=True)
+            return False
+        self._buf += self._utf8.decode(chunk)
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def _expect(self, c: str):
+        if self._peek() != c:
+            raise ValueError(
+                "expected {!r} at offset {}, got {!r}".format(
+                    c, self._pos, self._buf[self._pos]
+                )
+            )
+        self._pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # a number ending at the buffer edge may continue in the next chunk
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+
+def projector(fields):
+    """
+    Returns a function keeping only `fields` of a dict record
+    """
+    if fields is None:
+        return None
+    fields = tuple(fields)
+    return lambda record: {f: record.get(f) for f in fields}
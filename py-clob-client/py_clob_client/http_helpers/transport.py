@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# connection-specific headers are not allowed on HTTP/2 streams
+HOP_BY_HOP_HEADERS = frozenset(
+    ["connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"]
+)
+
+
+class RequestsTransport:
+    """
+    HTTP/1.1 transport backed by a pooled requests.Session
+    Every request to the same host reuses a kept-alive connection from the pool
+    """
+
+    name = "http/1.1"
+    errors = (requests.RequestException,)
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, headers=None, data=None):
+        return self.session.request(method=method, url=url, headers=headers, data=data)
+
+    @contextmanager
+    def stream(self, method: str, url: str, headers=None, chunk_size: int = 65536):
+        """
+        Yields (response, iterator of body chunks) without reading the body up front
+        """
+        with self.session.request(
+            method=method, url=url, headers=headers, stream=True
+        ) as resp:
+            yield resp, resp.iter_content(chunk_size)
+
+    def warmup(self, url: str, connections: int = 1, headers=None) -> list:
+        """
+        Sends `connections` concurrent GETs to url so the pool holds that many
+        established connections (up to pool_maxsize)
+        """
+        if connections <= 1:
+            return [self.request("GET", url, headers=headers)]
+        with ThreadPoolExecutor(max_workers=connections) as pool:
+            return list(
+                pool.map(
+                    lambda _: self.request("GET", url, headers=headers),
+                    range(connections),
+                )
+            )
+
+    def close(self):
+        self.session.close()
+
+
+class Http2Transport:
+    """
+    HTTP/2 transport backed by httpx
+    Concurrent requests to the same host are multiplexed over a single connection
+    Requires the optional http2 dependencies: pip install py-clob-client[http2]
+    """
+
+    name = "http/2"
+
+    def __init__(self, client=None, timeout: float = None):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "HTTP/2 transport requires httpx[http2]: pip install py-clob-client[http2]"
+            )
+
+        self.errors = (httpx.HTTPError,)
+        self.client = (
+            client if client is not None else httpx.Client(http2=True, timeout=timeout)
+        )
+
+    def request(self, method: str, url: str, headers=None, data=None):
+        if headers:
+            headers = {
+                k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS
+            }
+        return self.client.request(
+            method=method, url=url, headers=headers, content=data
+        )
+
+    @contextmanager
+    def stream(self, method: str, url: str, headers=None, chunk_size: int = 65536):
+        """
+        Yields (response, iterator of body chunks) without reading the body up front
+        """
+        if headers:
+            headers = {
+                k: v for k, v in headers.items() if k.lower() not in HOP_BY_HOP_HEADERS
+            }
+        with self.client.stream(method=method, url=url, headers=headers) as resp:
+            if resp.status_code != 200:
+                # error bodies are small, read them so they can be reported
+                resp.read()
+            yield resp, resp.iter_bytes(chunk_size)
+
+    def warmup(self, url: str, connections: int = 1, headers=None) -> list:
+        """
+        Establishes the multiplexed connection, a single request is enough
+        """
+        return [self.request("GET", url, headers=headers)]
+
+    def close(self):
+        self.client.close()
+
+
+_transport = None
+
+
+def get_transport():
+    """
+    Returns the transport shared by every client in the process
+    """
+    global _transport
+    if _transport is None:
+        _transport = RequestsTransport()
+    return _transport
+
+
+def set_transport(transport):
+    """
+    Replaces the process-wide transport and returns the previous one
+    The previous transport is not closed, requests still in flight on it may be
+    using its connections; close it once nothing uses it anymore
+    """
+    global _transport
+    previous = _transport
+    _transport = transport
+    return previous
+
+
+def use_http2(client=None, timeout: float = None):
+    """
+    Switches every client in the process to an HTTP/2 transport, unless it already
+    uses one, and returns the transport in use
+    Requires the optional http2 dependencies: pip install py-clob-client[http2]
+    """
+    if get_transport().name != Http2Transport.name:
+        set_transport(Http2Transport(client=client, timeout=timeout))
+    return get_transport()
@@ -0,0 +1,249 @@
+"""
+Per-endpoint client metrics
+
+http_helpers.request reports every request to the registered hooks as a
+RequestEvent. InMemoryMetrics aggregates them into latency histograms and
+counters, and PrometheusExporter serves those in the Prometheus text format.
+
+    metrics = InMemoryMetrics()
+    add_metrics_hook(metrics)
+    PrometheusExporter(metrics, port=9464).start()
+"""
+
+import bisect
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from .endpoints import GET_ORDER, GET_MARKET, GET_MARKET_TRADES_EVENTS
+
+OK = "ok"
+HTTP_ERROR = "http_error"
+TRANSPORT_ERROR = "transport_error"
+
+# endpoints whose path ends with an identifier
+PATH_TEMPLATES = [
+    (GET_ORDER, GET_ORDER + "{order_id}"),
+    (GET_MARKET_TRADES_EVENTS, GET_MARKET_TRADES_EVENTS + "{condition_id}"),
+    (GET_MARKET, GET_MARKET + "{condition_id}"),
+]
+
+# seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestEvent:
+    method: str
+    path: str
+    """
+    Path template, e.g. /book or /markets/{condition_id}
+    """
+
+    duration: float
+    """
+    Seconds from sending the request to decoding the response
+    """
+
+    outcome: str
+    """
+    ok, http_error or transport_error
+    """
+
+    status_code: int = None
+    bytes_out: int = 0
+    bytes_in: int = 0
+
+
+def path_template(url: str) -> str:
+    """
+    Returns the endpoint path of a url with query and identifiers stripped
+    """
+    path = urlsplit(url).path or "/"
+    for prefix, template in PATH_TEMPLATES:
+        if path.startswith(prefix) and len(path) > len(prefix):
+            return template
+    return path
+
+
+_hooks = []
+
+
+def add_metrics_hook(hook):
+    """
+    Registers an object whose on_request(event: RequestEvent) is called after every request
+    """
+    _hooks.append(hook)
+
+
+def remove_metrics_hook(hook):
+    _hooks.remove(hook)
+
+
+def has_metrics_hooks() -> bool:
+    return bool(_hooks)
+
+
+def emit(event: RequestEvent):
+    for hook in _hooks:
+        try:
+            hook.on_request(event)
+        except Exception:
+            # instrumentation must never break a request
+            pass
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "sum", "bytes_out", "bytes_in", "statuses")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.sum = 0.0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.statuses = {}
+
+
+class InMemoryMetrics:
+    """
+    Thread-safe collector of latency histograms, byte counters and outcomes per
+    (method, path template)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple, _Series] = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent):
+        key = (event.method, event.path)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            i = bisect.bisect_left(self.buckets, event.duration)
+            if i < len(self.buckets):
+                series.buckets[i] += 1
+            series.count += 1
+            series.sum += event.duration
+            series.bytes_out += event.bytes_out
+            series.bytes_in += event.bytes_in
+            status = (
+                str(event.status_code) if event.status_code is not None else ""
+            ), event.outcome
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> dict:
+        """
+        Returns {(method, path): {"count", "sum", "buckets", "bytes_out", "bytes_in", "statuses"}}
+        where buckets are cumulative counts per upper bound
+        """
+        with self._lock:
+            snapshot = {}
+            for key, s in self._series.items():
+                cumulative = []
+                total = 0
+                for bound, n in zip(self.buckets, s.buckets):
+                    total += n
+                    cumulative.append((bound, total))
+                snapshot[key] = {
+                    "count": s.count,
+                    "sum": s.sum,
+                    "buckets": cumulative,
+                    "bytes_out": s.bytes_out,
+                    "bytes_in": s.bytes_in,
+                    "statuses": dict(s.statuses),
+                }
+            return snapshot
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP clob_request_duration_seconds CLOB request latency",
+            "# TYPE clob_request_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()
+        for (method, path), s in sorted(snapshot.items()):
+            labels = 'method="{}",path="{}"'.format(method, path)
+            for bound, n in s["buckets"]:
+                lines.append(
+                    'clob_request_duration_seconds_bucket{{{},le="{}"}} {}'.format(
+                        labels, bound, n
+                    )
+                )
+            lines.append(
+                'clob_request_duration_seconds_bucket{{{},le="+Inf"}} {}'.format(
+                    labels, s["count"]
+                )
+            )
+            lines.append(
+                "clob_request_duration_seconds_sum{{{}}} {}".format(labels, s["sum"])
+            )
+            lines.append(
+                "clob_request_duration_seconds_count{{{}}} {}".format(
+                    labels, s["count"]
+                )
+            )
+
+        lines += [
+            "# HELP clob_request_bytes_total CLOB request and response body bytes",
+            "# TYPE clob_request_bytes_total counter",
+        ]
+        for (method, path), s in sorted(snapshot.items()):
+            for direction in ("out", "in"):
+                lines.append(
+                    'clob_request_bytes_total{{method="{}",path="{}",direction="{}"}} {}'.format(
+                        method, path, direction, s["bytes_" + direction]
+                    )
+                )
+
+        lines += [
+            "# HELP clob_requests_total CLOB requests by status code and outcome",
+            "# TYPE clob_requests_total counter",
+        ]
+        for (method, path), s in sorted(snapshot.items()):
+            for (status, outcome), n in sorted(s["statuses"].items()):
+                lines.append(
+                    'clob_requests_total{{method="{}",path="{}",status="{}",outcome="{}"}} {}'.format(
+                        method, path, status, outcome, n
+                    )
+                )
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """
+    Serves a collector's metrics at http://host:port/metrics from a daemon thread
+    """
+
+    def __init__(self, collector: InMemoryMetrics, port: int = 9464, host="127.0.0.1"):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.collector.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.collector = collector
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_port
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
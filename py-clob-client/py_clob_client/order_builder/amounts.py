@@ -0,0 +1,237 @@
+"""
+Integer fixed-point order amounts
+
+Prices, sizes and amounts are handled as integers counting units of 10^-digits.
+Inputs are quantized once, with the same float scaling as round_down and
+round_normal, after which the rounding steps of ROUNDING_CONFIG are applied with
+integer arithmetic only, without building a Decimal per check.
+
+The results are exact where the float helpers carry binary rounding errors, so
+they can differ from them by one unit: a market BUY of 3109.95 at price 0.0015
+takes 2073300 tokens, where the float path computed 2073299.999999.
+"""
+
+from math import floor, ceil
+
+from py_order_utils.model import BUY as UtilsBuy, SELL as UtilsSell
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .constants import BUY, SELL
+from ..clob_types import RoundConfig
+
+# collateral and conditional tokens have 6 decimals
+TOKEN_DECIMALS = 6
+
+FLOOR = "floor"
+CEIL = "ceil"
+HALF_EVEN = "half_even"
+
+_POW10 = [10**i for i in range(64)]
+
+# largest value the vectorized path computes in int64
+_INT64_LIMIT = 2**62
+
+
+def _pow10(n: int) -> int:
+    return _POW10[n] if n < len(_POW10) else 10**n
+
+
+def _divide(n: int, d: int, rounding: str) -> int:
+    if rounding == FLOOR:
+        return n // d
+    if rounding == CEIL:
+        return -(-n // d)
+    q, r = divmod(n, d)
+    if 2 * r > d or (2 * r == d and q % 2 == 1):
+        q += 1
+    return q
+
+
+def to_units(x: float, digits: int, rounding: str = FLOOR) -> int:
+    """
+    Returns x as an integer count of 10^-digits units
+    """
+    if isinstance(x, int):
+        return x * _pow10(digits)
+    scaled = x * _pow10(digits)
+    if rounding == FLOOR:
+        return floor(scaled)
+    if rounding == CEIL:
+        return ceil(scaled)
+    return round(scaled)
+
+
+def rescale(value: int, digits: int, to_digits: int, rounding: str = FLOOR) -> int:
+    """
+    Converts a count of 10^-digits units to 10^-to_digits units
+    """
+    if to_digits >= digits:
+        return value * _pow10(to_digits - digits)
+    return _divide(value, _pow10(digits - to_digits), rounding)
+
+
+class AmountEngine:
+    """
+    Maker and taker amounts for one RoundConfig, in token units (10^-6)
+
+    Amounts with more than `amount` decimals are rounded up to amount + 4
+    decimals, then down to `amount` decimals if they still do not fit
+    """
+
+    def __init__(self, round_config: RoundConfig):
+        self.price_digits = round_config.price
+        self.size_digits = round_config.size
+        self.amount_digits = round_config.amount
+
+    def fit_amount(self, value: int, digits: int) -> tuple:
+        """
+        Applies the amount rounding to value * 10^-digits, returns (value, digits)
+        """
+        a = self.amount_digits
+        if digits <= a or value % _pow10(digits - a) == 0:
+            return value, digits
+        if digits > a + 4:
+            value = _divide(value, _pow10(digits - a - 4), CEIL)
+            digits = a + 4
+        return value // _pow10(digits - a), a
+
+    def order_amounts(self, side: str, size: float, price: float) -> tuple:
+        price_u = to_units(price, self.price_digits, HALF_EVEN)
+        size_u = to_units(size, self.size_digits, FLOOR)
+        value, digits = self.fit_amount(
+            size_u * price_u, self.size_digits + self.price_digits
+        )
+        amount = rescale(value, digits, TOKEN_DECIMALS, HALF_EVEN)
+        size_amount = rescale(size_u, self.size_digits, TOKEN_DECIMALS)
+
+        if side == BUY:
+            return UtilsBuy, amount, size_amount
+        elif side == SELL:
+            return UtilsSell, size_amount, amount
+        else:
+            raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
+
+    def market_order_amounts(self, side: str, amount: float, price: float) -> tuple:
+        if side == SELL:
+            return self.order_amounts(side, amount, price)
+        if side != BUY:
+            raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
+
+        price_u = to_units(price, self.price_digits, HALF_EVEN)
+        amount_u = to_units(amount, self.size_digits, FLOOR)
+        # amount / price, rounded up at amount + 4 decimals
+        digits = self.amount_digits + 4
+        value, digits = self.fit_amount(
+            _divide(
+                amount_u * _pow10(digits + self.price_digits - self.size_digits),
+                price_u,
+                CEIL,
+            ),
+            digits,
+        )
+        return (
+            UtilsBuy,
+            rescale(amount_u, self.size_digits, TOKEN_DECIMALS),
+            rescale(value, digits, TOKEN_DECIMALS, HALF_EVEN),
+        )
+
+    def order_amounts_batch(self, side: str, sizes, prices) -> tuple:
+        """
+        Returns (side, maker amounts, taker amounts) for many (size, price) levels
+        of one side, computed in one NumPy pass when numpy is installed and with
+        the same results as order_amounts
+        """
+        if side not in (BUY, SELL):
+            raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
+        if np is None:
+            return self._order_amounts_scalar(side, sizes, prices)
+
+        price_u = np.round(
+            np.asarray(prices, dtype=np.float64) * _pow10(self.price_digits)
+        )
+        size_u = np.floor(
+            np.asarray(sizes, dtype=np.float64) * _pow10(self.size_digits)
+        )
+        if len(price_u) and self._batch_overflows(
+            float(np.abs(price_u).max()), float(np.abs(size_u).max())
+        ):
+            return self._order_amounts_scalar(side, sizes, prices)
+        price_u = price_u.astype(np.int64)
+        size_u = size_u.astype(np.int64)
+
+        value, digits = self._fit_amount_array(
+            size_u * price_u, self.size_digits + self.price_digits
+        )
+        amount = _rescale_array(value, digits, TOKEN_DECIMALS)
+        size_amount = _rescale_array(size_u, self.size_digits, TOKEN_DECIMALS)
+
+        if side == BUY:
+            return UtilsBuy, amount.tolist(), size_amount.tolist()
+        return UtilsSell, size_amount.tolist(), amount.tolist()
+
+    def _batch_overflows(self, max_price_u: float, max_size_u: float) -> bool:
+        """
+        Whether the int64 pass could wrap: the products are bounded by their
+        maximum, and the amounts and sizes are scaled up to TOKEN_DECIMALS after
+        """
+        digits = self.size_digits + self.price_digits
+        amount_bound = (
+            max_price_u * max_size_u * _pow10(max(0, TOKEN_DECIMALS - digits))
+        )
+        size_bound = max_size_u * _pow10(max(0, TOKEN_DECIMALS - self.size_digits))
+        return max(amount_bound, size_bound) >= _INT64_LIMIT
+
+    def _order_amounts_scalar(self, side: str, sizes, prices) -> tuple:
+        amounts = [self.order_amounts(side, s, p) for s, p in zip(sizes, prices)]
+        return (
+            UtilsBuy if side == BUY else UtilsSell,
+            [a[1] for a in amounts],
+            [a[2] for a in amounts],
+        )
+
+    def _fit_amount_array(self, value, digits: int) -> tuple:
+        """
+        fit_amount over an int64 array, every result at `amount` decimals
+        """
+        a = self.amount_digits
+        if digits <= a:
+            return value, digits
+        fits = value % _pow10(digits - a) == 0
+        rounded, rounded_digits = value, digits
+        if digits > a + 4:
+            rounded = -(-value // _pow10(digits - a - 4))
+            rounded_digits = a + 4
+        return (
+            np.where(
+                fits,
+                value // _pow10(digits - a),
+                rounded // _pow10(rounded_digits - a),
+            ),
+            a,
+        )
+
+
+def _rescale_array(value, digits: int, to_digits: int):
+    """
+    rescale over an int64 array, rounding half to even
+    """
+    if to_digits >= digits:
+        return value * _pow10(to_digits - digits)
+    d = _pow10(digits - to_digits)
+    q, r = np.divmod(value, d)
+    return q + ((2 * r > d) | ((2 * r == d) & (q % 2 == 1)))
+
+
+def invalid_prices(prices, tick_size: str) -> list:
+    """
+    Returns the prices outside [tick size, 1 - tick size], as price_valid checks
+    """
+    tick = float(tick_size)
+    if np is None:
+        return [p for p in prices if not (p >= tick and p <= 1 - tick)]
+    prices = np.asarray(prices, dtype=np.float64)
+    return prices[~((prices >= tick) & (prices <= 1 - tick))].tolist()
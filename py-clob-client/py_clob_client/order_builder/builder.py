@@ -1,23 +1,19 @@
 from py_order_utils.builders import OrderBuilder as UtilsOrderBuilder
 from py_order_utils.signer import Signer as UtilsSigner
+from py_order_utils.utils import prepend_zx
 from py_order_utils.model import (
     EOA,
     OrderData,
     SignedOrder,
-    BUY as UtilsBuy,
-    SELL as UtilsSell,
 )
 
-from .helpers import (
-    to_token_decimals,
-    round_down,
-    round_normal,
-    decimal_places,
-    round_up,
-)
-from .constants import BUY, SELL
+from .amounts import AmountEngine
+from ..book import BookSide
 from ..config import get_contract_config
+from ..constants import ZERO_ADDRESS
 from ..signer import Signer
+from ..signing.eip712 import get_signing_context
+from ..signing.pool import POOL_MIN_BATCH, SigningPool
 from ..clob_types import (
     OrderArgs,
     CreateOrderOptions,
@@ -34,6 +30,20 @@ ROUNDING_CONFIG: dict[TickSize, RoundConfig] = {
     "0.0001": RoundConfig(price=4, size=2, amount=6),
 }
 
+AMOUNT_ENGINES: dict[tuple, AmountEngine] = {}
+
+
+def get_amount_engine(round_config: RoundConfig) -> AmountEngine:
+    key = (round_config.price, round_config.size, round_config.amount)
+    engine = AMOUNT_ENGINES.get(key)
+    if engine is None:
+        engine = AMOUNT_ENGINES[key] = AmountEngine(round_config)
+    return engine
+
+
+for _round_config in ROUNDING_CONFIG.values():
+    get_amount_engine(_round_config)
+
 
 class OrderBuilder:
     def __init__(self, signer: Signer, sig_type=None, funder=None):
@@ -47,113 +57,225 @@ class OrderBuilder:
         # Defaults to the address of the signer
         self.funder = funder if funder is not None else self.signer.address()
 
-    def get_order_amounts(
-        self, side: str, size: float, price: float, round_config: RoundConfig
-    ):
-        raw_price = round_normal(price, round_config.price)
-
-        if side == BUY:
-            raw_taker_amt = round_down(size, round_config.size)
-
-            raw_maker_amt = raw_taker_amt * raw_price
-            if decimal_places(raw_maker_amt) > round_config.amount:
-                raw_maker_amt = round_up(raw_maker_amt, round_config.amount + 4)
-                if decimal_places(raw_maker_amt) > round_config.amount:
-                    raw_maker_amt = round_down(raw_maker_amt, round_config.amount)
-
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+        # exchange order builders keyed by (exchange, chain id, neg_risk), all
+        # sharing one exchange signer, so the key and domain separators are
+        # only prepared once
+        self._utils_signer = None
+        self._order_builders: dict[tuple, UtilsOrderBuilder] = {}
 
-            return UtilsBuy, maker_amount, taker_amount
-        elif side == SELL:
-            raw_maker_amt = round_down(size, round_config.size)
+        # process pool used by create_orders and build_ladder when
+        # signing_workers > 1, for batches of at least signing_pool_min_batch
+        # orders; created on first use or by start_signing_pool
+        self.signing_workers = None
+        self.signing_pool_min_batch = POOL_MIN_BATCH
+        self._signing_pool = None
 
-            raw_taker_amt = raw_maker_amt * raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
+    def get_order_builder(self, neg_risk: bool = False) -> UtilsOrderBuilder:
+        """
+        Returns the cached exchange order builder for the signer's chain
+        """
+        chain_id = self.signer.get_chain_id()
+        exchange = get_contract_config(chain_id, neg_risk).exchange
+        key = (exchange, chain_id, bool(neg_risk))
+        order_builder = self._order_builders.get(key)
+        if order_builder is None:
+            if self._utils_signer is None:
+                self._utils_signer = UtilsSigner(key=self.signer.private_key)
+            order_builder = self._order_builders[key] = UtilsOrderBuilder(
+                exchange, chain_id, self._utils_signer
+            )
+        return order_builder
+
+    def build_signed_order(
+        self, data: OrderData, neg_risk: bool = False
+    ) -> SignedOrder:
+        """
+        Builds an order with the exchange order builder and signs its EIP-712 hash
+        using the cached signing context of the exchange
+        """
+        order, digest = self._build_order(data, neg_risk)
+        signature = prepend_zx(self.signer.sign(digest))
+        return SignedOrder(order, signature)
 
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+    def _build_order(self, data: OrderData, neg_risk: bool) -> tuple:
+        """
+        Returns the unsigned order and its EIP-712 digest
+        """
+        order_builder = self.get_order_builder(neg_risk)
+        order = order_builder.build_order(data)
+        context = get_signing_context(
+            order_builder.chain_id, order_builder.contract_address
+        )
+        return order, context.order_hash(order)
 
-            return UtilsSell, maker_amount, taker_amount
-        else:
-            raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
+    def get_order_amounts(
+        self, side: str, size: float, price: float, round_config: RoundConfig
+    ):
+        return get_amount_engine(round_config).order_amounts(side, size, price)
 
     def get_market_order_amounts(
         self, side: str, amount: float, price: float, round_config: RoundConfig
     ):
-        raw_price = round_normal(price, round_config.price)
-
-        if side == BUY:
-            raw_maker_amt = round_down(amount, round_config.size)
-            raw_taker_amt = raw_maker_amt / raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
-
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
-
-            return UtilsBuy, maker_amount, taker_amount
+        return get_amount_engine(round_config).market_order_amounts(side, amount, price)
 
-        elif side == SELL:
-            raw_maker_amt = round_down(amount, round_config.size)
+    def create_order(
+        self, order_args: OrderArgs, options: CreateOrderOptions
+    ) -> SignedOrder:
+        """
+        Creates and signs an order
+        """
+        return self.build_signed_order(
+            self._order_data(order_args, options), options.neg_risk
+        )
 
-            raw_taker_amt = raw_maker_amt * raw_price
-            if decimal_places(raw_taker_amt) > round_config.amount:
-                raw_taker_amt = round_up(raw_taker_amt, round_config.amount + 4)
-                if decimal_places(raw_taker_amt) > round_config.amount:
-                    raw_taker_amt = round_down(raw_taker_amt, round_config.amount)
+    def create_orders(self, args: list[OrderArgs], options) -> list[SignedOrder]:
+        """
+        Creates and signs many orders, `options` being one CreateOrderOptions for
+        all of them or a list with one per order
+        Amounts and digests are computed here and the signing is done inline, or
+        fanned out to a pool of signing_workers processes when set for large
+        batches. Orders are returned in input order
+        """
+        if isinstance(options, CreateOrderOptions):
+            options = [options] * len(args)
+        if len(args) != len(options):
+            raise ValueError("expected one CreateOrderOptions per order")
+
+        return self._sign_orders(
+            [
+                self._build_order(self._order_data(a, o), o.neg_risk)
+                for a, o in zip(args, options)
+            ]
+        )
 
-            maker_amount = to_token_decimals(raw_maker_amt)
-            taker_amount = to_token_decimals(raw_taker_amt)
+    def build_ladder(
+        self,
+        token_id: str,
+        side: str,
+        prices: list[float],
+        sizes,
+        options: CreateOrderOptions,
+        fee_rate_bps: int = 0,
+        nonce: int = 0,
+        expiration: int = 0,
+        taker: str = ZERO_ADDRESS,
+    ) -> list[SignedOrder]:
+        """
+        Creates and signs one limit order per price level of a token, `sizes` being
+        one size for every level or a list with one per level
+        Amounts of the whole grid are computed in one pass and the orders are signed
+        in bulk like create_orders
+        """
+        if isinstance(sizes, (int, float)):
+            sizes = [sizes] * len(prices)
+        if len(sizes) != len(prices):
+            raise ValueError("expected one size per price level")
+
+        utils_side, maker_amounts, taker_amounts = get_amount_engine(
+            ROUNDING_CONFIG[options.tick_size]
+        ).order_amounts_batch(side, sizes, prices)
+        return self._sign_orders(
+            [
+                self._build_order(
+                    self._order_data_from_amounts(
+                        token_id,
+                        utils_side,
+                        maker_amount,
+                        taker_amount,
+                        fee_rate_bps,
+                        nonce,
+                        expiration,
+                        taker,
+                    ),
+                    options.neg_risk,
+                )
+                for maker_amount, taker_amount in zip(maker_amounts, taker_amounts)
+            ]
+        )
 
-            return UtilsSell, maker_amount, taker_amount
+    def _sign_orders(self, built: list[tuple]) -> list[SignedOrder]:
+        """
+        Signs (order, digest) pairs, on the signing pool for batches of at least
+        signing_pool_min_batch orders when signing_workers > 1
+        """
+        if (
+            not self.signing_workers
+            or self.signing_workers < 2
+            or len(built) < max(2, self.signing_pool_min_batch)
+        ):
+            signatures = [prepend_zx(self.signer.sign(d)) for _, d in built]
         else:
-            raise ValueError(f"order_args.side must be '{BUY}' or '{SELL}'")
+            signatures = self.start_signing_pool().sign([d for _, d in built])
+        return [SignedOrder(o, sig) for (o, _), sig in zip(built, signatures)]
 
-    def create_order(
-        self, order_args: OrderArgs, options: CreateOrderOptions
-    ) -> SignedOrder:
+    def start_signing_pool(self):
         """
-        Creates and signs an order
+        Starts the signing pool ahead of the first batch, when signing_workers > 1
+        Returns the pool, or None when signing is done inline
+        """
+        if not self.signing_workers or self.signing_workers < 2:
+            return None
+        if self._signing_pool is None:
+            self._signing_pool = SigningPool(
+                self.signer.private_key,
+                self.signing_workers,
+                self.signer.backend.name,
+            ).start()
+        return self._signing_pool
+
+    def close(self):
+        """
+        Shuts down the signing pool, if one was started
         """
+        if self._signing_pool is not None:
+            self._signing_pool.close()
+            self._signing_pool = None
+
+    def _order_data(
+        self, order_args: OrderArgs, options: CreateOrderOptions
+    ) -> OrderData:
         side, maker_amount, taker_amount = self.get_order_amounts(
             order_args.side,
             order_args.size,
             order_args.price,
             ROUNDING_CONFIG[options.tick_size],
         )
+        return self._order_data_from_amounts(
+            order_args.token_id,
+            side,
+            maker_amount,
+            taker_amount,
+            order_args.fee_rate_bps,
+            order_args.nonce,
+            order_args.expiration,
+            order_args.taker,
+        )
 
-        data = OrderData(
+    def _order_data_from_amounts(
+        self,
+        token_id: str,
+        side: int,
+        maker_amount: int,
+        taker_amount: int,
+        fee_rate_bps: int,
+        nonce: int,
+        expiration: int,
+        taker: str,
+    ) -> OrderData:
+        return OrderData(
             maker=self.funder,
-            taker=order_args.taker,
-            tokenId=order_args.token_id,
+            taker=taker,
+            tokenId=token_id,
             makerAmount=str(maker_amount),
             takerAmount=str(taker_amount),
             side=side,
-            feeRateBps=str(order_args.fee_rate_bps),
-            nonce=str(order_args.nonce),
+            feeRateBps=str(fee_rate_bps),
+            nonce=str(nonce),
             signer=self.signer.address(),
-            expiration=str(order_args.expiration),
+            expiration=str(expiration),
             signatureType=self.sig_type,
         )
 
-        contract_config = get_contract_config(
-            self.signer.get_chain_id(), options.neg_risk
-        )
-
-        order_builder = UtilsOrderBuilder(
-            contract_config.exchange,
-            self.signer.get_chain_id(),
-            UtilsSigner(key=self.signer.private_key),
-        )
-
-        return order_builder.build_signed_order(data)
-
     def create_market_order(
         self, order_args: MarketOrderArgs, options: CreateOrderOptions
     ) -> SignedOrder:
@@ -181,34 +303,26 @@ class OrderBuilder:
             signatureType=self.sig_type,
         )
 
-        contract_config = get_contract_config(
-            self.signer.get_chain_id(), options.neg_risk
-        )
-
-        order_builder = UtilsOrderBuilder(
-            contract_config.exchange,
-            self.signer.get_chain_id(),
-            UtilsSigner(key=self.signer.private_key),
-        )
-
-        return order_builder.build_signed_order(data)
+        return self.build_signed_order(data, options.neg_risk)
 
     def calculate_buy_market_price(
         self, positions: list[OrderSummary], amount_to_match: float
     ) -> float:
-        sum = 0
-        for p in positions:
-            sum += float(p.size) * float(p.price)
-            if sum >= amount_to_match:
-                return float(p.price)
-        raise Exception("no match")
+        """
+        Price of the last ask a buy of `amount_to_match` collateral reaches,
+        walking the asks from the lowest price
+        """
+        return BookSide.from_book_levels(positions, buy=True).marginal_price(
+            amount_to_match, notional=True
+        )
 
     def calculate_sell_market_price(
         self, positions: list[OrderSummary], amount_to_match: float
     ) -> float:
-        sum = 0
-        for p in reversed(positions):
-            sum += float(p.size)
-            if sum >= amount_to_match:
-                return float(p.price)
-        raise Exception("no match")
+        """
+        Price of the last bid a sale of `amount_to_match` shares reaches, walking
+        the bids from the highest price
+        """
+        return BookSide.from_book_levels(positions, buy=False).marginal_price(
+            amount_to_match
+        )
@@ -0,0 +1,430 @@
+"""
+Order book snapshot recorder
+
+BookRecorder captures the books of a set of tokens, polled through the batch
+/books endpoint or pushed by a BookReplica on every update, and appends them to
+compressed columnar files partitioned by token and day:
+
+    <root>/<token_id>/<YYYY-MM-DD>.books
+
+A file is a sequence of independent blocks, each a fixed header followed by the
+zlib-compressed columns of a batch of snapshots:
+
+    timestamp  int64  per snapshot, ms (server time)
+    n_bids     int32  per snapshot
+    n_asks     int32  per snapshot
+    prices     int32  per level, ticks of 10^-PRICE_DECIMALS, bids then asks
+    sizes      int64  per level, units of 10^-SIZE_DECIMALS
+
+Blocks are only ever appended, by a writer thread so that recording never
+waits on compression or disk. A block cut short by a crash is skipped on read,
+and cut off the file before the next block is appended to it after a restart.
+read_book_file memory-maps a file and decompresses its columns into arrays
+(numpy arrays when numpy is installed) for research and replay:
+
+    recorder = BookRecorder("data", client, ["123", "456"])
+    recorder.start(interval=1)
+    ...
+    books = read_book_file("data/123/2024-05-01.books")
+    books.book(0).to_summary()
+"""
+
+import logging
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .book import CompactBook
+from .clob_types import BookParams
+
+MAGIC = b"PCB1"
+# magic, snapshots, levels, compressed payload length
+BLOCK_HEADER = struct.Struct("<4sIII")
+FILE_SUFFIX = ".books"
+
+# snapshots buffered per token and day before a block is written
+FLUSH_EVERY = 256
+
+_COLUMNS = (("timestamps", "q"), ("n_bids", "i"), ("n_asks", "i"))
+_LEVEL_COLUMNS = (("prices", "i"), ("sizes", "q"))
+
+
+def _timestamp_ms(book) -> int:
+    try:
+        return int(book.timestamp)
+    except (TypeError, ValueError):
+        return int(time.time() * 1000)
+
+
+def book_day(timestamp_ms: int) -> str:
+    return datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).strftime(
+        "%Y-%m-%d"
+    )
+
+
+def book_path(root: str, token_id: str, day: str) -> str:
+    return os.path.join(root, str(token_id), day + FILE_SUFFIX)
+
+
+def valid_length(f) -> int:
+    """
+    Returns the length of the complete blocks at the start of an open book file,
+    reading the block headers only
+    """
+    size = os.fstat(f.fileno()).st_size
+    pos = 0
+    while pos + BLOCK_HEADER.size <= size:
+        f.seek(pos)
+        magic, _, _, length = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+        end = pos + BLOCK_HEADER.size + length
+        if magic != MAGIC or end > size:
+            break
+        pos = end
+    return pos
+
+
+def _little_endian(column: array) -> bytes:
+    if sys.byteorder != "little":  # pragma: no cover - big endian hosts
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class _Block:
+    """
+    Columns of the snapshots of one token and day waiting to be written
+    """
+
+    __slots__ = ("timestamps", "n_bids", "n_asks", "prices", "sizes")
+
+    def __init__(self):
+        for name, typecode in _COLUMNS + _LEVEL_COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def add(self, timestamp: int, book: CompactBook):
+        self.timestamps.append(timestamp)
+        self.n_bids.append(book.n_bids)
+        self.n_asks.append(len(book.prices) - book.n_bids)
+        self.prices.extend(book.prices)
+        self.sizes.extend(book.sizes)
+
+    def encode(self, level: int) -> bytes:
+        payload = zlib.compress(
+            b"".join(
+                _little_endian(getattr(self, name))
+                for name, _ in _COLUMNS + _LEVEL_COLUMNS
+            ),
+            level,
+        )
+        return (
+            BLOCK_HEADER.pack(
+                MAGIC, len(self.timestamps), len(self.prices), len(payload)
+            )
+            + payload
+        )
+
+
+class BookRecorder:
+    """
+    Appends snapshots of the books of `token_ids` under `root`
+
+    Snapshots are buffered per token and day and handed to a writer thread as
+    one block every `flush_every` snapshots, on flush() and on stop(). flush()
+    waits for the blocks to be written and raises the first write error
+    """
+
+    def __init__(
+        self,
+        root: str,
+        client=None,
+        token_ids=(),
+        flush_every: int = FLUSH_EVERY,
+        compression: int = 6,
+    ):
+        self.root = root
+        self.client = client
+        self.token_ids = [str(t) for t in token_ids]
+        self.flush_every = flush_every
+        self.compression = compression
+        self.recorded = 0
+
+        self._blocks = {}
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+
+        self._queue = queue.Queue()
+        self._writer = None
+        self._errors = []
+        # files already cut back to their complete blocks
+        self._trimmed = set()
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def record(self, book):
+        """
+        Buffers one snapshot, a CompactBook or an OrderBookSummary
+        """
+        if not isinstance(book, CompactBook):
+            book = CompactBook.from_raw(
+                {
+                    "market": book.market,
+                    "asset_id": book.asset_id,
+                    "timestamp": book.timestamp,
+                    "bids": [b.__dict__ for b in book.bids or []],
+                    "asks": [a.__dict__ for a in book.asks or []],
+                    "hash": book.hash,
+                }
+            )
+        timestamp = _timestamp_ms(book)
+        key = (str(book.asset_id), book_day(timestamp))
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None:
+                block = self._blocks[key] = _Block()
+            block.add(timestamp, book)
+            self.recorded += 1
+            if len(block) >= self.flush_every:
+                self._submit(key, self._blocks.pop(key))
+
+    def capture(self) -> int:
+        """
+        Fetches the books of every token through /books and records them
+        """
+        books = self.client.get_order_books(
+            [BookParams(token_id=t) for t in self.token_ids], compact=True
+        )
+        for book in books:
+            self.record(book)
+        return len(books)
+
+    def attach(self, replica):
+        """
+        Records every update accepted by a BookReplica
+        """
+        replica.add_listener(self.record)
+
+    def start(self, interval: float):
+        """
+        Captures the books every `interval` seconds from a daemon thread
+        """
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._poll, args=(interval, self._stop), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _poll(self, interval: float, stop: threading.Event):
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                self.capture()
+            except Exception as e:
+                self.logger.warning("book capture failed: %s", e)
+            stop.wait(max(0, interval - (time.monotonic() - started)))
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._thread.join()
+            self._stop = None
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                writer, self._writer = self._writer, None
+                if writer is not None:
+                    self._queue.put(None)
+            if writer is not None:
+                writer.join()
+
+    def flush(self):
+        """
+        Writes every buffered snapshot and waits for the writes to complete
+        """
+        with self._lock:
+            blocks, self._blocks = self._blocks, {}
+            for key, block in blocks.items():
+                self._submit(key, block)
+        self._queue.join()
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
+
+    def _submit(self, key: tuple, block: _Block):
+        # called with _lock held
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        self._queue.put((key, block))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                self.logger.warning("book write failed: %s", e)
+                self._errors.append(e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, key: tuple, block: _Block):
+        path = book_path(self.root, *key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = block.encode(self.compression)
+        # append mode, readable to check the existing blocks
+        with open(path, "a+b") as f:
+            if path not in self._trimmed:
+                # drop a block cut short by a crash, which would otherwise end
+                # up in the middle of the file
+                length = valid_length(f)
+                if length != os.fstat(f.fileno()).st_size:
+                    self.logger.warning("dropping partial block at the end of %s", path)
+                    f.truncate(length)
+                self._trimmed.add(path)
+            f.write(data)
+
+
+class BookColumns:
+    """
+    The snapshots of a book file as columns
+
+    `offsets[i]` is the index in `prices` / `sizes` of the first level of
+    snapshot i, its bids followed by its asks
+    """
+
+    def __init__(self, asset_id, timestamps, n_bids, n_asks, prices, sizes):
+        self.asset_id = asset_id
+        self.timestamps = timestamps
+        self.n_bids = n_bids
+        self.n_asks = n_asks
+        self.prices = prices
+        self.sizes = sizes
+        self.offsets = [0] * len(timestamps)
+        for i in range(1, len(timestamps)):
+            self.offsets[i] = self.offsets[i - 1] + n_bids[i - 1] + n_asks[i - 1]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def book(self, i: int) -> CompactBook:
+        """
+        Returns snapshot i as a CompactBook
+        """
+        start = self.offsets[i]
+        end = start + int(self.n_bids[i]) + int(self.n_asks[i])
+        return CompactBook(
+            array("i", self.prices[start:end].tolist()),
+            array("q", self.sizes[start:end].tolist()),
+            int(self.n_bids[i]),
+            asset_id=self.asset_id,
+            timestamp=str(int(self.timestamps[i])),
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.book(i)
+
+
+def _column(data: bytes, typecode: str):
+    if np is not None:
+        return np.frombuffer(data, dtype="<i8" if typecode == "q" else "<i4")
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder != "little":  # pragma: no cover - big endian hosts
+        column.byteswap()
+    return column
+
+
+def _concat(parts: list, typecode: str):
+    if np is not None:
+        if not parts:
+            return np.empty(0, dtype="<i8" if typecode == "q" else "<i4")
+        return np.concatenate(parts)
+    column = array(typecode)
+    for part in parts:
+        column.extend(part)
+    return column
+
+
+def read_book_file(path: str) -> BookColumns:
+    """
+    Reads the snapshots of a book file, skipping a trailing partial block
+    """
+    parts = {name: [] for name, _ in _COLUMNS + _LEVEL_COLUMNS}
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        view = memoryview(data)
+        try:
+            pos = 0
+            while pos + BLOCK_HEADER.size <= size:
+                magic, n, levels, length = BLOCK_HEADER.unpack_from(view, pos)
+                start = pos + BLOCK_HEADER.size
+                if magic != MAGIC:
+                    raise ValueError("not a book file block at offset {}".format(pos))
+                if start + length > size:
+                    break
+                payload = zlib.decompress(view[start : start + length])
+                if len(payload) != n * 16 + levels * 12:
+                    raise ValueError("corrupt book file block at offset {}".format(pos))
+                offset = 0
+                for (name, typecode), count in zip(
+                    _COLUMNS + _LEVEL_COLUMNS, (n, n, n, levels, levels)
+                ):
+                    width = 8 if typecode == "q" else 4
+                    chunk = payload[offset : offset + count * width]
+                    parts[name].append(_column(chunk, typecode))
+                    offset += count * width
+                pos = start + length
+        finally:
+            view.release()
+            if size:
+                data.close()
+
+    return BookColumns(
+        os.path.basename(os.path.dirname(os.path.abspath(path))),
+        *(
+            _concat(parts[name], typecode)
+            for name, typecode in _COLUMNS + _LEVEL_COLUMNS
+        )
+    )
+
+
+def read_book_range(
+    root: str, token_id: str, start_day: str = None, end_day: str = None
+):
+    """
+    Yields the BookColumns of a token's files, one per day, between two
+    YYYY-MM-DD days included
+    """
+    directory = os.path.join(root, str(token_id))
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(FILE_SUFFIX):
+            continue
+        day = name[: -len(FILE_SUFFIX)]
+        if (start_day is None or day >= start_day) and (
+            end_day is None or day <= end_day
+        ):
+            yield read_book_file(os.path.join(directory, name))
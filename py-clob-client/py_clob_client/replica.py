@@ -0,0 +1,385 @@
+"""
+Local order book replica
+
+BookReplica subscribes to the CLOB market channel for a set of tokens and keeps
+one in-memory book per token, built from the `book` snapshots and `price_change`
+deltas pushed by the server. Every update carrying a server hash is checked with
+orderbook_summary_hash; a book that diverges, or whose feed dropped, is
+marked unsynced and resynced, from REST when a `fetch` function is given and
+otherwise by resubscribing. REST fetches run off the feed's event loop and are
+retried with backoff until they succeed.
+
+    replica = client.start_book_replica(["123", "456"])
+    client.get_order_book("123")  # served locally once the replica is synced
+"""
+
+import asyncio
+import logging
+import threading
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+from .book import CompactBook
+from .clob_types import OrderBookSummary, OrderSummary
+from .constants import WS_MARKET_URL
+from .http_helpers.codec import decode, encode
+from .utilities import orderbook_summary_hash
+
+BOOK = "book"
+PRICE_CHANGE = "price_change"
+TICK_SIZE_CHANGE = "tick_size_change"
+
+
+def _ts(timestamp) -> int:
+    try:
+        return int(timestamp)
+    except (TypeError, ValueError):
+        return 0
+
+
+class ReplicaBook:
+    """
+    Levels of one token keyed by price string, sizes kept as sent by the server
+    """
+
+    __slots__ = ("asset_id", "market", "timestamp", "hash", "bids", "asks", "synced")
+
+    def __init__(self, asset_id: str):
+        self.asset_id = asset_id
+        self.market = None
+        self.timestamp = None
+        self.hash = None
+        self.bids = {}
+        self.asks = {}
+        self.synced = False
+
+    def apply_snapshot(self, raw: dict):
+        self.market = raw.get("market", self.market)
+        self.timestamp = raw.get("timestamp")
+        self.hash = raw.get("hash")
+        # older feed versions name the sides buys / sells
+        bids = raw.get("bids", raw.get("buys")) or []
+        asks = raw.get("asks", raw.get("sells")) or []
+        self.bids = {level["price"]: level["size"] for level in bids}
+        self.asks = {level["price"]: level["size"] for level in asks}
+        self.synced = True
+
+    def apply_change(self, price: str, side: str, size: str):
+        levels = self.bids if side == "BUY" else self.asks
+        if float(size) == 0:
+            levels.pop(price, None)
+        else:
+            levels[price] = size
+
+    def level_strings(self, bids: bool) -> list[tuple]:
+        """
+        Returns the (price, size) levels in the order of a /book response: bids by
+        ascending and asks by descending price, so the best levels come last
+        """
+        levels = self.bids if bids else self.asks
+        return [(p, levels[p]) for p in sorted(levels, key=float, reverse=not bids)]
+
+    def summary(self) -> OrderBookSummary:
+        return OrderBookSummary(
+            market=self.market,
+            asset_id=self.asset_id,
+            timestamp=self.timestamp,
+            bids=[OrderSummary(price=p, size=s) for p, s in self.level_strings(True)],
+            asks=[OrderSummary(price=p, size=s) for p, s in self.level_strings(False)],
+            hash=self.hash,
+        )
+
+    def compact(self) -> CompactBook:
+        return CompactBook.from_raw(
+            {
+                "market": self.market,
+                "asset_id": self.asset_id,
+                "timestamp": self.timestamp,
+                "bids": [{"price": p, "size": s} for p, s in self.level_strings(True)],
+                "asks": [{"price": p, "size": s} for p, s in self.level_strings(False)],
+                "hash": self.hash,
+            }
+        )
+
+    def matches(self, hash: str) -> bool:
+        return orderbook_summary_hash(self) == hash
+
+
+class BookReplica:
+    """
+    Maintains local books for `token_ids` from the market channel at `url`
+
+    The feed runs on an asyncio loop in a daemon thread and reconnects with
+    backoff. `fetch(token_id)`, if given, returns a raw /book response used to
+    resync a book that failed verification. `stats` counts snapshots, deltas,
+    hash mismatches, resyncs and reconnects. Functions registered with
+    add_listener are called with a CompactBook copy after every accepted update,
+    and `on_tick_size_change(token_id, tick_size)` when a tracked market's tick
+    size changes
+    """
+
+    def __init__(
+        self,
+        token_ids,
+        url: str = WS_MARKET_URL,
+        fetch=None,
+        verify: bool = True,
+        ping_interval: float = 10,
+        max_backoff: float = 30,
+        on_tick_size_change=None,
+    ):
+        if websockets is None:
+            raise Exception(
+                "the book replica needs the websockets package, "
+                "install py-clob-client[websockets]"
+            )
+        self.url = url
+        self.fetch = fetch
+        self.verify = verify
+        self.ping_interval = ping_interval
+        self.max_backoff = max_backoff
+        self.on_tick_size_change = on_tick_size_change
+        self.books = {str(t): ReplicaBook(str(t)) for t in token_ids}
+        self.stats = {
+            "snapshots": 0,
+            "deltas": 0,
+            "mismatches": 0,
+            "resyncs": 0,
+            "reconnects": 0,
+            "tick_size_changes": 0,
+        }
+
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        self._loop = None
+        self._thread = None
+        self._ws = None
+        self._stopping = False
+        self._listeners = []
+        # tokens with a REST resync in flight
+        self._fetching = set()
+
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def add_listener(self, listener):
+        """
+        Registers listener(book: CompactBook), called from the feed thread
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, snapshot: CompactBook):
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                self.logger.warning("book listener failed: %s", e)
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._run(), self._loop)
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        self._stopping = True
+        if self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop = None
+
+    def get_order_book(self, token_id: str, timeout: float = 0) -> OrderBookSummary:
+        """
+        Returns the local book of a token, waiting up to `timeout` seconds for it
+        to be synced, or None when it isn't tracked or isn't synced
+        """
+        book = self.books.get(str(token_id))
+        if book is None:
+            return None
+        with self._synced:
+            if not book.synced and timeout:
+                self._synced.wait_for(lambda: book.synced, timeout)
+            return book.summary() if book.synced else None
+
+    def wait_synced(self, timeout: float = None) -> bool:
+        """
+        Waits until every tracked book is synced
+        """
+        with self._synced:
+            return self._synced.wait_for(
+                lambda: all(b.synced for b in self.books.values()), timeout
+            )
+
+    async def _run(self):
+        backoff = 0.1
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.url, ping_interval=None) as ws:
+                    self._ws = ws
+                    subscription = {"assets_ids": list(self.books), "type": "market"}
+                    await ws.send(encode(subscription).decode("utf-8"))
+                    backoff = 0.1
+                    pinger = asyncio.ensure_future(self._ping(ws))
+                    try:
+                        async for message in ws:
+                            self.handle(message)
+                    finally:
+                        pinger.cancel()
+            except Exception as e:
+                if not self._stopping:
+                    self.logger.warning("market channel error: %s", e)
+            finally:
+                self._ws = None
+                self._mark_unsynced()
+            if self._stopping:
+                return
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send("PING")
+
+    def _mark_unsynced(self):
+        # the deltas missed while disconnected are lost, wait for new snapshots
+        with self._lock:
+            for book in self.books.values():
+                book.synced = False
+
+    def handle(self, message):
+        """
+        Applies one feed message, a JSON event or array of events
+        """
+        if message == "PONG":
+            return
+        events = decode(message)
+        if isinstance(events, dict):
+            events = [events]
+        for event in events:
+            event_type = event.get("event_type")
+            if event_type == BOOK:
+                self._on_book(event)
+            elif event_type == PRICE_CHANGE:
+                self._on_price_change(event)
+            elif event_type == TICK_SIZE_CHANGE:
+                self._on_tick_size_change(event)
+
+    def _on_tick_size_change(self, event: dict):
+        asset_id = event.get("asset_id")
+        if asset_id not in self.books:
+            return
+        self.stats["tick_size_changes"] += 1
+        if self.on_tick_size_change is not None:
+            try:
+                self.on_tick_size_change(asset_id, str(event["new_tick_size"]))
+            except Exception as e:
+                self.logger.warning("tick size change handler failed: %s", e)
+
+    def _on_book(self, event: dict):
+        book = self.books.get(event.get("asset_id"))
+        if book is None:
+            return
+        with self._synced:
+            book.apply_snapshot(event)
+            self.stats["snapshots"] += 1
+            ok = self._check(book, event.get("hash"))
+            self._synced.notify_all()
+            snapshot = book.compact() if ok and self._listeners else None
+        if not ok:
+            self._resync(book)
+        elif snapshot is not None:
+            self._notify(snapshot)
+
+    def _on_price_change(self, event: dict):
+        timestamp = event.get("timestamp")
+        if "price_changes" in event:
+            # one entry per level, each carrying the hash of its token's book
+            updates = [
+                (c["asset_id"], [c], c.get("hash")) for c in event["price_changes"]
+            ]
+        else:
+            updates = [
+                (event.get("asset_id"), event.get("changes", []), event.get("hash"))
+            ]
+
+        for asset_id, changes, hash in updates:
+            book = self.books.get(asset_id)
+            if book is None:
+                continue
+            with self._lock:
+                # deltas before a snapshot, or older than it, are already in it
+                if not book.synced or _ts(timestamp) < _ts(book.timestamp):
+                    continue
+                for change in changes:
+                    book.apply_change(change["price"], change["side"], change["size"])
+                book.timestamp = timestamp
+                if hash is not None:
+                    book.hash = hash
+                self.stats["deltas"] += 1
+                ok = self._check(book, hash)
+                snapshot = book.compact() if ok and self._listeners else None
+            if not ok:
+                self._resync(book)
+            elif snapshot is not None:
+                self._notify(snapshot)
+
+    def _check(self, book: ReplicaBook, hash: str) -> bool:
+        if not self.verify or not hash or book.matches(hash):
+            return True
+        self.stats["mismatches"] += 1
+        book.synced = False
+        self.logger.warning("book of %s diverged from the server hash", book.asset_id)
+        return False
+
+    def _resync(self, book: ReplicaBook):
+        self.stats["resyncs"] += 1
+        if self.fetch is None:
+            # a new subscription starts with fresh snapshots of every token
+            if self._ws is not None:
+                asyncio.ensure_future(self._ws.close())
+            return
+        self._fetch_book(book, 0)
+
+    def _fetch_book(self, book: ReplicaBook, attempt: int):
+        # the REST call runs on the default executor so that the feed keeps
+        # being read and pinged meanwhile
+        if book.asset_id in self._fetching or self._stopping:
+            return
+        self._fetching.add(book.asset_id)
+        future = self._loop.run_in_executor(None, self.fetch, book.asset_id)
+        future.add_done_callback(lambda f: self._on_fetched(book, f, attempt))
+
+    def _on_fetched(self, book: ReplicaBook, future, attempt: int):
+        self._fetching.discard(book.asset_id)
+        if future.cancelled():
+            return
+        try:
+            raw = future.result()
+        except Exception as e:
+            delay = min(0.1 * 2**attempt, self.max_backoff)
+            self.logger.warning(
+                "resync of %s failed: %s, retrying in %.1fs", book.asset_id, e, delay
+            )
+            self._loop.call_later(delay, self._retry_fetch, book, attempt + 1)
+            return
+        with self._synced:
+            # a snapshot pushed by the feed while fetching may be newer
+            if book.synced and _ts(raw.get("timestamp")) < _ts(book.timestamp):
+                return
+            book.apply_snapshot(raw)
+            self._synced.notify_all()
+            snapshot = book.compact() if self._listeners else None
+        if snapshot is not None:
+            self._notify(snapshot)
+
+    def _retry_fetch(self, book: ReplicaBook, attempt: int):
+        if not book.synced:
+            self._fetch_book(book, attempt)
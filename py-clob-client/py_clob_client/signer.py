@@ -1,14 +1,19 @@
 from eth_account import Account
 
+from .signing.backends import get_backend
+
 
 class Signer:
-    def __init__(self, private_key: str, chain_id: int):
+    def __init__(self, private_key: str, chain_id: int, backend: str = None):
         assert private_key is not None and chain_id is not None
 
         self.private_key = private_key
         self.account = Account.from_key(private_key)
         self.chain_id = chain_id
 
+        # eth_account, or coincurve when it is installed
+        self.backend = get_backend(backend)(private_key)
+
     def address(self):
         return self.account.address
 
@@ -19,4 +24,4 @@ class Signer:
         """
         Signs a message hash
         """
-        return Account._sign_hash(message_hash, self.private_key).signature.hex()
+        return self.backend.sign(message_hash)
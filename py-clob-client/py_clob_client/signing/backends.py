@@ -0,0 +1,79 @@
+from eth_account import Account
+
+try:
+    import coincurve
+except ImportError:  # pragma: no cover - optional dependency
+    coincurve = None
+
+
+def _hash_bytes(message_hash) -> bytes:
+    if isinstance(message_hash, (bytes, bytearray)):
+        return bytes(message_hash)
+    if message_hash[:2] in ("0x", "0X"):
+        message_hash = message_hash[2:]
+    return bytes.fromhex(message_hash)
+
+
+class EthAccountBackend:
+    """
+    Signs message hashes with eth_account
+    """
+
+    name = "eth_account"
+
+    def __init__(self, private_key: str):
+        self.private_key = private_key
+
+    def sign(self, message_hash) -> str:
+        return Account._sign_hash(message_hash, self.private_key).signature.hex()
+
+
+class CoincurveBackend:
+    """
+    Signs message hashes with libsecp256k1 through coincurve
+
+    Both libraries use RFC 6979 nonces and low-s normalization, so signatures
+    are identical to the eth_account backend
+    """
+
+    name = "coincurve"
+
+    def __init__(self, private_key: str):
+        if coincurve is None:
+            raise ImportError(
+                "coincurve is not installed, run pip install py-clob-client[coincurve]"
+            )
+        self.private_key = private_key
+        self._key = coincurve.PrivateKey(_hash_bytes(private_key))
+
+    def sign(self, message_hash) -> str:
+        signature = self._key.sign_recoverable(_hash_bytes(message_hash), hasher=None)
+        # r || s || v with v = 27 + recovery id, as eth_account encodes it
+        return (signature[:64] + bytes([27 + signature[64]])).hex()
+
+
+BACKENDS = {
+    EthAccountBackend.name: EthAccountBackend,
+    CoincurveBackend.name: CoincurveBackend,
+}
+
+
+def default_backend() -> str:
+    """
+    Returns the name of the fastest installed backend
+    """
+    return CoincurveBackend.name if coincurve is not None else EthAccountBackend.name
+
+
+def get_backend(name: str = None) -> type:
+    """
+    Returns the backend class called `name`, the default backend if None
+    """
+    name = name or default_backend()
+    if name not in BACKENDS:
+        raise ValueError(
+            "unknown signing backend {!r}, expected one of {}".format(
+                name, ", ".join(BACKENDS)
+            )
+        )
+    return BACKENDS[name]
@@ -1,6 +1,9 @@
-from poly_eip712_structs import make_domain
+from functools import lru_cache
+
+from poly_eip712_structs import make_domain, EIP712Struct, Address, String, Uint
 from eth_utils import keccak
-from py_order_utils.utils import prepend_zx
+from py_order_utils.model.order import Order
+from py_order_utils.utils import normalize_address, prepend_zx
 
 from .model import ClobAuth
 from ..signer import Signer
@@ -9,20 +12,131 @@ CLOB_DOMAIN_NAME = "ClobAuthDomain"
 CLOB_VERSION = "1"
 MSG_TO_SIGN = "This message attests that I control the given wallet"
 
+EXCHANGE_DOMAIN_NAME = "Polymarket CTF Exchange"
+EXCHANGE_VERSION = "1"
+
 
 def get_clob_auth_domain(chain_id: int):
     return make_domain(name=CLOB_DOMAIN_NAME, version=CLOB_VERSION, chainId=chain_id)
 
 
-def sign_clob_auth_message(signer: Signer, timestamp: int, nonce: int) -> str:
-    clob_auth_msg = ClobAuth(
-        address=signer.address(),
-        timestamp=str(timestamp),
-        nonce=nonce,
-        message=MSG_TO_SIGN,
+def get_exchange_domain(chain_id: int, exchange: str):
+    return make_domain(
+        name=EXCHANGE_DOMAIN_NAME,
+        version=EXCHANGE_VERSION,
+        chainId=str(chain_id),
+        verifyingContract=normalize_address(exchange),
     )
-    chain_id = signer.get_chain_id()
-    auth_struct_hash = prepend_zx(
-        keccak(clob_auth_msg.signable_bytes(get_clob_auth_domain(chain_id))).hex()
+
+
+def _member_encoder(typ):
+    """
+    Returns a function encoding a member value to 32 bytes, as typ.encode_value
+    """
+    if isinstance(typ, type) and issubclass(typ, EIP712Struct):
+        return lambda value: value.hash_struct()
+    if isinstance(typ, Uint):
+        size = typ.length // 8
+
+        def encode_uint(value):
+            if value is None:
+                value = 0
+            value.to_bytes(size, byteorder="big", signed=False)  # for validation
+            return value.to_bytes(32, byteorder="big", signed=False)
+
+        return encode_uint
+    if isinstance(typ, Address):
+
+        def encode_address(value):
+            if isinstance(value, str):
+                value = int(value, 16)
+                value.to_bytes(20, byteorder="big", signed=False)  # for validation
+                return value.to_bytes(32, byteorder="big", signed=False)
+            return typ.encode_value(value)
+
+        return encode_address
+    if isinstance(typ, String):
+        return lambda value: keccak(text=value if value is not None else "")
+    return typ.encode_value
+
+
+class StructHasher:
+    """
+    Computes EIP-712 struct hashes for one struct type, with the type hash and
+    member encoders prepared once
+    """
+
+    def __init__(self, struct_type: type[EIP712Struct]):
+        self.type_hash = struct_type.type_hash()
+        self.members = [
+            (name, _member_encoder(typ)) for name, typ in struct_type.get_members()
+        ]
+
+    def hash_struct(self, values: dict) -> bytes:
+        return keccak(
+            b"".join(
+                [self.type_hash]
+                + [encode(values.get(name)) for name, encode in self.members]
+            )
+        )
+
+
+CLOB_AUTH_HASHER = StructHasher(ClobAuth)
+ORDER_HASHER = StructHasher(Order)
+
+
+class SigningContext:
+    """
+    Domain separators for the ClobAuth domain of a chain and, if given, the
+    exchange domain of one exchange contract
+
+    The hash methods return the same 0x-prefixed hex digests as hashing the
+    poly_eip712_structs signable bytes, but only the message members are encoded
+    per call
+    """
+
+    def __init__(self, chain_id: int, exchange: str = None):
+        self.chain_id = chain_id
+        self.exchange = exchange
+        self.clob_auth_domain_separator = get_clob_auth_domain(chain_id).hash_struct()
+        self.exchange_domain_separator = (
+            get_exchange_domain(chain_id, exchange).hash_struct()
+            if exchange is not None
+            else None
+        )
+
+    def clob_auth_hash(self, address: str, timestamp: int, nonce: int) -> str:
+        struct_hash = CLOB_AUTH_HASHER.hash_struct(
+            {
+                "address": address,
+                "timestamp": str(timestamp),
+                "nonce": nonce,
+                "message": MSG_TO_SIGN,
+            }
+        )
+        return prepend_zx(
+            keccak(b"\x19\x01" + self.clob_auth_domain_separator + struct_hash).hex()
+        )
+
+    def order_hash(self, order: Order) -> str:
+        if self.exchange_domain_separator is None:
+            raise ValueError("signing context has no exchange")
+        struct_hash = ORDER_HASHER.hash_struct(order.values)
+        return prepend_zx(
+            keccak(b"\x19\x01" + self.exchange_domain_separator + struct_hash).hex()
+        )
+
+
+@lru_cache(maxsize=None)
+def get_signing_context(chain_id: int, exchange: str = None) -> SigningContext:
+    """
+    Returns the shared signing context for (chain id, exchange)
+    """
+    return SigningContext(chain_id, exchange)
+
+
+def sign_clob_auth_message(signer: Signer, timestamp: int, nonce: int) -> str:
+    auth_struct_hash = get_signing_context(signer.get_chain_id()).clob_auth_hash(
+        signer.address(), timestamp, nonce
     )
     return prepend_zx(signer.sign(auth_struct_hash))
@@ -1,6 +1,52 @@
 import hmac
 import hashlib
 import base64
+from functools import lru_cache
+
+from ..http_helpers.codec import encode
+
+
+class HmacContext:
+    """
+    HMAC-SHA256 keyed once with a base64 encoded API secret
+
+    Each signature copies the pre-keyed state instead of decoding the secret
+    and preparing the key again
+    """
+
+    def __init__(self, secret: str):
+        self._base = hmac.new(
+            base64.urlsafe_b64decode(secret), digestmod=hashlib.sha256
+        )
+
+    def sign(self, timestamp, method: str, requestPath: str, body=None) -> str:
+        h = self._base.copy()
+        h.update((str(timestamp) + str(method) + str(requestPath)).encode("utf-8"))
+        if body:
+            h.update(canonical_body(body))
+
+        # ensure base64 encoded
+        return base64.urlsafe_b64encode(h.digest()).decode("utf-8")
+
+
+def canonical_body(body) -> bytes:
+    """
+    Returns the bytes of a request body as they are sent: serialized bodies are
+    used as is, anything else is encoded to compact JSON by the codec
+    """
+    if isinstance(body, (bytes, bytearray)):
+        return body
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return encode(body)
+
+
+@lru_cache(maxsize=64)
+def get_hmac_context(secret: str) -> HmacContext:
+    """
+    Returns the shared HmacContext of an API secret
+    """
+    return HmacContext(secret)
 
 
 def build_hmac_signature(
@@ -9,14 +55,4 @@ def build_hmac_signature(
     """
     Creates an HMAC signature by signing a payload with the secret
     """
-    base64_secret = base64.urlsafe_b64decode(secret)
-    message = str(timestamp) + str(method) + str(requestPath)
-    if body:
-        # NOTE: Necessary to replace single quotes with double quotes
-        # to generate the same hmac message as go and typescript
-        message += str(body).replace("'", '"')
-
-    h = hmac.new(base64_secret, bytes(message, "utf-8"), hashlib.sha256)
-
-    # ensure base64 encoded
-    return (base64.urlsafe_b64encode(h.digest())).decode("utf-8")
+    return get_hmac_context(secret).sign(timestamp, method, requestPath, body)
@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from py_order_utils.utils import prepend_zx
+
+from .backends import get_backend
+
+# signing backend of the current worker process, set once by _init_worker
+_backend = None
+
+# handing a digest to a worker costs more than signing it with coincurve, so
+# only batches of at least this many orders are sent to the pool
+POOL_MIN_BATCH = 64
+
+
+def _start_method() -> str:
+    # never fork: the client runs keep-warm, batch and feed threads
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return "forkserver"
+    return "spawn"
+
+
+def _init_worker(private_key: str, backend: str):
+    global _backend
+    _backend = get_backend(backend)(private_key)
+
+
+def _started(_) -> int:
+    return os.getpid()
+
+
+def _sign(digest: str) -> str:
+    return prepend_zx(_backend.sign(digest))
+
+
+class SigningPool:
+    """
+    Signs EIP-712 digests on a pool of worker processes, each holding the key
+    from startup, so ECDSA signing of large batches uses every core
+    Workers are started with forkserver (spawn where it is unavailable), never
+    by forking the threaded parent
+    """
+
+    def __init__(self, private_key: str, workers: int = None, backend: str = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(_start_method()),
+            initializer=_init_worker,
+            initargs=(private_key, backend),
+        )
+
+    def start(self):
+        """
+        Starts every worker now rather than on the first batch
+        """
+        list(self._executor.map(_started, range(self.workers)))
+        return self
+
+    def sign(self, digests: list[str]) -> list[str]:
+        """
+        Returns the 0x-prefixed signatures of the digests, in input order
+        """
+        chunksize = max(1, len(digests) // (self.workers * 4))
+        return list(self._executor.map(_sign, digests, chunksize=chunksize))
+
+    def close(self):
+        self._executor.shutdown()
@@ -1,4 +1,6 @@
 import hashlib
+import json
+from json.encoder import encode_basestring_ascii
 
 from .clob_types import OrderBookSummary, OrderSummary, TickSize
 
@@ -25,12 +27,68 @@ def parse_raw_orderbook_summary(raw_obs: any) -> OrderBookSummary:
 
 
 def generate_orderbook_summary_hash(orderbook: OrderBookSummary) -> str:
-    orderbook.hash = ""
-    hash = hashlib.sha1(str(orderbook.json).encode("utf-8")).hexdigest()
+    hash = orderbook_summary_hash(orderbook)
     orderbook.hash = hash
     return hash
 
 
+def _json_value(value) -> str:
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+
+def _json_levels(levels) -> str:
+    if levels is None:
+        return "null"
+    return "[{}]".format(
+        ",".join(
+            [
+                '{"price":' + _json_value(p) + ',"size":' + _json_value(s) + "}"
+                for p, s in levels
+            ]
+        )
+    )
+
+
+def orderbook_hash_input(orderbook) -> bytes:
+    """
+    Returns the bytes the orderbook hash is computed over: the compact JSON of the
+    book with an empty hash field, as orderbook.json would give, written straight
+    from the fields without asdict copies
+    """
+    if hasattr(orderbook, "level_strings"):
+        bids = orderbook.level_strings(True)
+        asks = orderbook.level_strings(False)
+    else:
+        bids = orderbook.bids
+        asks = orderbook.asks
+        if bids is not None:
+            bids = [(l.price, l.size) for l in bids]
+        if asks is not None:
+            asks = [(l.price, l.size) for l in asks]
+    return (
+        '{"market":'
+        + _json_value(orderbook.market)
+        + ',"asset_id":'
+        + _json_value(orderbook.asset_id)
+        + ',"timestamp":'
+        + _json_value(orderbook.timestamp)
+        + ',"bids":'
+        + _json_levels(bids)
+        + ',"asks":'
+        + _json_levels(asks)
+        + ',"hash":""}'
+    ).encode("utf-8")
+
+
+def orderbook_summary_hash(orderbook) -> str:
+    """
+    Computes the hash of an OrderBookSummary or CompactBook without modifying it
+    """
+    return hashlib.sha1(orderbook_hash_input(orderbook)).hexdigest()
+
+
 def order_to_json(order, owner, orderType) -> dict:
     return {"order": order.dict(), "owner": owner, "orderType": orderType}
 
@@ -41,3 +99,31 @@ def is_tick_size_smaller(a: TickSize, b: TickSize) -> bool:
 
 def price_valid(price: float, tick_size: TickSize) -> bool:
     return price >= float(tick_size) and price <= 1 - float(tick_size)
+
+
+def chunked(items: list, size: int) -> list[list]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def merge_batch_results(results: list):
+    """
+    Merges per-chunk batch responses in chunk order: lists are concatenated,
+    dicts keyed by token id are combined token by token, so the BUY and SELL
+    prices of a token split across two chunks are both kept
+    """
+    merged = None
+    for r in results:
+        if r is None:
+            continue
+        if merged is None:
+            merged = r
+        elif isinstance(merged, dict):
+            for token_id, value in r.items():
+                current = merged.get(token_id)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    current.update(value)
+                else:
+                    merged[token_id] = value
+        else:
+            merged.extend(r)
+    return merged
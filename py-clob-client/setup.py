@@ -22,6 +22,13 @@ setuptools.setup(
         "python-dotenv",
         "requests",
     ],
+    extras_require={
+        "orjson": ["orjson>=3.8"],
+        "http2": ["httpx[http2]>=0.25"],
+        "coincurve": ["coincurve>=18"],
+        "numpy": ["numpy>=1.22"],
+        "websockets": ["websockets>=10"],
+    },
     project_urls={
         "Bug Tracker": "https://github.com/Polymarket/py-clob-client/issues",
     },
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+
+import websockets
+
+from py_clob_client.clob_types import OrderBookSummary, OrderSummary
+from py_clob_client.utilities import generate_orderbook_summary_hash
+
+
+def book_hash(raw: dict) -> str:
+    return generate_orderbook_summary_hash(
+        OrderBookSummary(
+            market=raw["market"],
+            asset_id=raw["asset_id"],
+            timestamp=raw["timestamp"],
+            bids=[OrderSummary(price=l["price"], size=l["size"]) for l in raw["bids"]],
+            asks=[OrderSummary(price=l["price"], size=l["size"]) for l in raw["asks"]],
+        )
+    )
+
+
+def float_price(level) -> float:
+    return float(level[0])
+
+
+class LocalFeedServer:
+    """
+    Stand-in for the CLOB market channel on a local port
+
+    Keeps the authoritative books, answers a subscription with one `book` event
+    per subscribed token and broadcasts price changes, with correct hashes
+    unless told otherwise
+    """
+
+    def __init__(self):
+        self.books = {}
+        self.subscriptions = []
+        self.clients = set()
+        self.timestamp = 1000
+
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True).start()
+        self._server = self._call(self._serve())
+        self.url = "ws://127.0.0.1:{}".format(self._server.sockets[0].getsockname()[1])
+
+    async def _serve(self):
+        return await websockets.serve(self._handler, "127.0.0.1", 0)
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(5)
+
+    def set_book(self, token_id: str, bids: list, asks: list):
+        self.timestamp += 1
+        self.books[token_id] = {
+            "market": "0xaabbcc",
+            "asset_id": token_id,
+            "timestamp": str(self.timestamp),
+            "bids": [{"price": p, "size": s} for p, s in sorted(bids, key=float_price)],
+            "asks": [
+                {"price": p, "size": s}
+                for p, s in sorted(asks, key=float_price, reverse=True)
+            ],
+        }
+        self.books[token_id]["hash"] = book_hash(self.books[token_id])
+        return self.books[token_id]
+
+    def raw_book(self, token_id: str) -> dict:
+        return json.loads(json.dumps(self.books[token_id]))
+
+    async def _handler(self, ws, path=None):
+        self.clients.add(ws)
+        try:
+            async for message in ws:
+                if message == "PING":
+                    await ws.send("PONG")
+                    continue
+                subscription = json.loads(message)
+                self.subscriptions.append(subscription)
+                events = [
+                    dict(self.books[t], event_type="book")
+                    for t in subscription["assets_ids"]
+                    if t in self.books
+                ]
+                await ws.send(json.dumps(events))
+        finally:
+            self.clients.discard(ws)
+
+    def _apply(self, token_id: str, price: str, side: str, size: str) -> dict:
+        book = self.books[token_id]
+        levels = book["bids"] if side == "BUY" else book["asks"]
+        levels[:] = [l for l in levels if l["price"] != price]
+        if float(size) > 0:
+            levels.append({"price": price, "size": size})
+        levels.sort(key=lambda l: float(l["price"]), reverse=side != "BUY")
+        book["timestamp"] = str(self.timestamp)
+        book["hash"] = book_hash(book)
+        return book
+
+    def change(self, token_id: str, price: str, side: str, size: str, hash=None):
+        """
+        Updates a level and broadcasts the price change
+        """
+        self.timestamp += 1
+        book = self._apply(token_id, price, side, size)
+        self.broadcast(
+            {
+                "event_type": "price_change",
+                "asset_id": token_id,
+                "market": book["market"],
+                "timestamp": book["timestamp"],
+                "changes": [{"price": price, "side": side, "size": size}],
+                "hash": book["hash"] if hash is None else hash,
+            }
+        )
+
+    def change_levels(self, changes: list):
+        """
+        Updates (token_id, price, side, size) levels and broadcasts them in one
+        price change of the per-level format, each carrying its book's hash
+        """
+        self.timestamp += 1
+        entries = []
+        for token_id, price, side, size in changes:
+            book = self._apply(token_id, price, side, size)
+            entries.append(
+                {
+                    "asset_id": token_id,
+                    "price": price,
+                    "side": side,
+                    "size": size,
+                    "hash": book["hash"],
+                }
+            )
+        self.broadcast(
+            {
+                "event_type": "price_change",
+                "market": "0xaabbcc",
+                "timestamp": str(self.timestamp),
+                "price_changes": entries,
+            }
+        )
+
+    def broadcast(self, event: dict):
+        async def send():
+            for ws in list(self.clients):
+                await ws.send(json.dumps(event))
+
+        self._call(send())
+
+    def drop(self):
+        """
+        Closes every client connection
+        """
+
+        async def close():
+            for ws in list(self.clients):
+                await ws.close()
+
+        self._call(close())
+
+    def close(self):
+        self._server.close()
+        self._call(self._server.wait_closed())
+        self._loop.call_soon_threadsafe(self._loop.stop)
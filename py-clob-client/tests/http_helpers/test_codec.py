@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from py_clob_client.http_helpers import codec
+from py_clob_client.http_helpers.codec import (
+    StdlibCodec,
+    OrjsonCodec,
+    encode,
+    decode,
+    get_codec,
+    set_codec,
+)
+from py_clob_client.http_helpers.helpers import serialize_body
+
+body = {
+    "order": {
+        "salt": 479249096354,
+        "tokenId": "1234",
+        "makerAmount": "100000000",
+        "side": "BUY",
+        "signature": "0x123",
+    },
+    "owner": "aaaa-bbbb",
+    "orderType": "GTC",
+    "note": 'it\'s "quoted" – ünïcode',
+    "ok": True,
+    "none": None,
+}
+
+
+class TestCodec(TestCase):
+    def test_stdlib_codec(self):
+        c = StdlibCodec()
+        data = c.dumps(body)
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(c.loads(data), body)
+        self.assertEqual(c.dumps([{"token_id": "1"}]), b'[{"token_id":"1"}]')
+
+    def test_orjson_codec_matches_stdlib(self):
+        if codec.orjson is None:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(OrjsonCodec().dumps(body), StdlibCodec().dumps(body))
+        self.assertEqual(OrjsonCodec().loads(StdlibCodec().dumps(body)), body)
+        # integers wider than 64 bits fall back to the stdlib
+        big = {"salt": 2**70}
+        self.assertEqual(OrjsonCodec().dumps(big), StdlibCodec().dumps(big))
+
+    def test_set_codec(self):
+        previous = get_codec()
+        try:
+            set_codec(StdlibCodec())
+            self.assertEqual(get_codec().name, "json")
+            self.assertEqual(decode(encode(body)), body)
+            set_codec(None)
+            self.assertEqual(get_codec().name, codec.default_codec().name)
+        finally:
+            set_codec(previous)
+
+    def test_serialize_body(self):
+        self.assertIsNone(serialize_body(None))
+        self.assertIsNone(serialize_body([]))
+        raw = encode(body)
+        self.assertIs(serialize_body(raw), raw)
+        self.assertEqual(serialize_body(body), raw)
@@ -0,0 +1,53 @@
+import threading
+import time
+from unittest import TestCase
+
+from py_clob_client.http_helpers.singleflight import SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def run_concurrently(self, n, target):
+        threads = [threading.Thread(target=target) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    def test_concurrent_calls_share_one_result(self):
+        sf = SingleFlight()
+        calls = []
+        results = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {"mid": "0.5"}
+
+        self.run_concurrently(8, lambda: results.append(sf.do("/midpoint", fetch)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"mid": "0.5"}] * 8)
+        self.assertEqual(sf.stats(), {"calls": 8, "coalesced": 7, "in_flight": 0})
+
+    def test_errors_are_shared(self):
+        sf = SingleFlight()
+        errors = []
+
+        def fetch():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                sf.do("/book", fetch)
+            except ValueError as e:
+                errors.append(e)
+
+        self.run_concurrently(4, call)
+        self.assertEqual(len(errors), 4)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        sf = SingleFlight()
+        self.assertEqual(sf.do("a", lambda: 1), 1)
+        self.assertEqual(sf.do("a", lambda: 2), 2)
+        self.assertEqual(sf.stats()["coalesced"], 0)
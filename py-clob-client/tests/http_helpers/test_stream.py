@@ -0,0 +1,68 @@
+import json
+from unittest import TestCase
+
+from py_clob_client.http_helpers.stream import JsonArrayStream, projector
+
+page = {
+    "limit": 1000,
+    "count": 3,
+    "data": [
+        {"condition_id": "0x1", "question": "Will BTC be above $100k?", "tokens": []},
+        {"condition_id": "0x2", "question": 'Ünïcode – “quoted” "x"', "n": 12345},
+        {"condition_id": "0x3", "question": "", "nested": {"a": [1, 2.5e10, None]}},
+    ],
+    "next_cursor": "MTAwMA==",
+}
+
+
+def chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestJsonArrayStream(TestCase):
+    def test_any_chunking(self):
+        raw = json.dumps(page, ensure_ascii=False, indent=1).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(raw)):
+            stream = JsonArrayStream(chunks(raw, size))
+            self.assertEqual(list(stream), page["data"], size)
+            self.assertEqual(stream.next_cursor, "MTAwMA==")
+            self.assertEqual(stream.meta["limit"], 1000)
+
+    def test_meta_after_items_and_numbers_on_chunk_edges(self):
+        raw = b'{"data":[1,22,333],"count":4444}'
+        for size in (1, 2, 5):
+            stream = JsonArrayStream(chunks(raw, size))
+            self.assertEqual(list(stream), [1, 22, 333])
+            self.assertEqual(stream.meta, {"count": 4444})
+
+    def test_projection(self):
+        raw = json.dumps(page).encode("utf-8")
+        stream = JsonArrayStream(
+            chunks(raw, 16), project=projector(["condition_id", "missing"])
+        )
+        self.assertEqual(
+            list(stream),
+            [
+                {"condition_id": "0x1", "missing": None},
+                {"condition_id": "0x2", "missing": None},
+                {"condition_id": "0x3", "missing": None},
+            ],
+        )
+
+    def test_items_are_yielded_before_the_body_is_read(self):
+        read = []
+
+        def source():
+            for c in [b'{"data":[{"a":1},', b'{"a":2}', b"]}"]:
+                read.append(c)
+                yield c
+
+        stream = iter(JsonArrayStream(source()))
+        self.assertEqual(next(stream), {"a": 1})
+        self.assertEqual(len(read), 1)
+
+    def test_truncated_input(self):
+        with self.assertRaises(ValueError):
+            list(JsonArrayStream([b'{"data":[{"a":1},{"a"']))
+        with self.assertRaises(ValueError):
+            list(JsonArrayStream([b"[1, 2]"]))
@@ -0,0 +1,92 @@
+from unittest import TestCase
+
+from py_clob_client.client import ClobClient
+from py_clob_client.http_helpers.transport import (
+    RequestsTransport,
+    Http2Transport,
+    get_transport,
+    set_transport,
+    use_http2,
+)
+
+
+class FakeHttpxClient:
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return kwargs
+
+    def close(self):
+        self.closed = True
+
+
+class TestTransport(TestCase):
+    def tearDown(self):
+        set_transport(None)
+
+    def test_default_transport(self):
+        set_transport(None)
+        transport = get_transport()
+        self.assertIsInstance(transport, RequestsTransport)
+        self.assertIs(get_transport(), transport)
+
+    def test_set_transport_keeps_previous_open(self):
+        client = FakeHttpxClient()
+        transport = Http2Transport(client=client)
+        set_transport(transport)
+        self.assertEqual(get_transport().name, "http/2")
+
+        self.assertIs(set_transport(RequestsTransport()), transport)
+        self.assertFalse(client.closed)
+        self.assertEqual(get_transport().name, "http/1.1")
+
+    def test_use_http2_is_explicit(self):
+        set_transport(None)
+        ClobClient("http://clob")
+        self.assertEqual(get_transport().name, "http/1.1")
+
+        transport = use_http2(client=FakeHttpxClient())
+        self.assertIs(get_transport(), transport)
+        self.assertEqual(transport.name, "http/2")
+        self.assertIs(use_http2(), transport)
+
+    def test_client_requests_over_http2(self):
+        try:
+            import httpx
+        except ImportError:
+            self.skipTest("httpx is not installed")
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"mid": "0.5"})
+
+        use_http2(client=httpx.Client(transport=httpx.MockTransport(handler)))
+        client = ClobClient("http://clob")
+        self.assertEqual(client.get_midpoint("1"), {"mid": "0.5"})
+
+        self.assertEqual(str(requests[0].url), "http://clob/midpoint?token_id=1")
+        self.assertEqual(requests[0].headers["user-agent"], "py_clob_client")
+
+    def test_http2_strips_connection_headers(self):
+        client = FakeHttpxClient()
+        transport = Http2Transport(client=client)
+        transport.request(
+            "POST",
+            "https://clob/midpoints",
+            headers={
+                "Connection": "keep-alive",
+                "Content-Type": "application/json",
+                "POLY_API_KEY": "key",
+            },
+            data=b"[]",
+        )
+        self.assertEqual(
+            client.calls[0]["headers"],
+            {"Content-Type": "application/json", "POLY_API_KEY": "key"},
+        )
+        self.assertEqual(client.calls[0]["content"], b"[]")
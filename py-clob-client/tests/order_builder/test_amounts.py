@@ -0,0 +1,185 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_order_utils.model import BUY as UtilsBuy, SELL as UtilsSell
+
+from py_clob_client.clob_types import RoundConfig
+from py_clob_client.order_builder import amounts
+from py_clob_client.order_builder.amounts import (
+    AmountEngine,
+    invalid_prices,
+    CEIL,
+    FLOOR,
+    HALF_EVEN,
+    rescale,
+    to_units,
+)
+from py_clob_client.order_builder.builder import ROUNDING_CONFIG
+from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.order_builder.helpers import (
+    decimal_places,
+    round_down,
+    round_normal,
+    round_up,
+    to_token_decimals,
+)
+
+
+def fit_amount(x: float, round_config: RoundConfig) -> float:
+    if decimal_places(x) > round_config.amount:
+        x = round_up(x, round_config.amount + 4)
+        if decimal_places(x) > round_config.amount:
+            x = round_down(x, round_config.amount)
+    return x
+
+
+def float_order_amounts(side, size, price, round_config):
+    """
+    The float implementation the amount engine replaces
+    """
+    raw_price = round_normal(price, round_config.price)
+    raw_size = round_down(size, round_config.size)
+    raw_amount = fit_amount(raw_size * raw_price, round_config)
+    if side == BUY:
+        return UtilsBuy, to_token_decimals(raw_amount), to_token_decimals(raw_size)
+    return UtilsSell, to_token_decimals(raw_size), to_token_decimals(raw_amount)
+
+
+def float_market_order_amounts(side, amount, price, round_config):
+    if side == SELL:
+        return float_order_amounts(side, amount, price, round_config)
+    raw_price = round_normal(price, round_config.price)
+    raw_maker = round_down(amount, round_config.size)
+    raw_taker = fit_amount(raw_maker / raw_price, round_config)
+    return UtilsBuy, to_token_decimals(raw_maker), to_token_decimals(raw_taker)
+
+
+class TestAmountEngine(TestCase):
+    def test_units(self):
+        self.assertEqual(to_units(21.04, 2), 2104)
+        self.assertEqual(to_units(15, 2), 1500)
+        self.assertEqual(to_units(0.565, 2, HALF_EVEN), 56)
+        self.assertEqual(to_units(0.125, 2, HALF_EVEN), 12)
+        self.assertEqual(to_units(0.0056, 2, CEIL), 1)
+        self.assertEqual(rescale(123456789, 8, 4), 12345)
+        self.assertEqual(rescale(123456789, 8, 4, CEIL), 12346)
+        self.assertEqual(rescale(125, 2, 0, HALF_EVEN), 1)
+        self.assertEqual(rescale(135, 2, 0, HALF_EVEN), 1)
+        self.assertEqual(rescale(136, 2, 0, FLOOR), 1)
+        self.assertEqual(rescale(21, 2, 6), 210000)
+
+    def test_fit_amount(self):
+        engine = AmountEngine(ROUNDING_CONFIG["0.01"])
+        # fits in 4 decimals
+        self.assertEqual(engine.fit_amount(123400, 6), (123400, 6))
+        # rounded up at 8 decimals, then down to 4
+        self.assertEqual(engine.fit_amount(12345678912, 10), (12345, 4))
+        # rounding up at 8 decimals already fits in 4
+        self.assertEqual(engine.fit_amount(1234999999999, 12), (12350, 4))
+
+    def test_matches_float_amounts(self):
+        for tick_size, round_config in ROUNDING_CONFIG.items():
+            engine = AmountEngine(round_config)
+            delta_price = float(tick_size) * 7
+            size = 0.01
+            while size <= 12:
+                price = float(tick_size)
+                while price <= 1:
+                    for side in (BUY, SELL):
+                        self.assertEqual(
+                            engine.order_amounts(side, size, price),
+                            float_order_amounts(side, size, price, round_config),
+                            (tick_size, side, size, price),
+                        )
+                        self.assertEqual(
+                            engine.market_order_amounts(side, size, price),
+                            float_market_order_amounts(side, size, price, round_config),
+                            (tick_size, side, size, price),
+                        )
+                    price = price + delta_price
+                size = size + 0.37
+
+    def test_exact_where_floats_round(self):
+        round_config = ROUNDING_CONFIG["0.0001"]
+        engine = AmountEngine(round_config)
+        # 3109.95 / 0.0015 is exactly 2073300, the float division falls just short
+        self.assertEqual(
+            engine.market_order_amounts(BUY, 3109.95, 0.001518),
+            (UtilsBuy, 3109950000, 2073300000000),
+        )
+        self.assertEqual(
+            float_market_order_amounts(BUY, 3109.95, 0.001518, round_config),
+            (UtilsBuy, 3109950000, 2073299999999),
+        )
+
+    def test_invalid_side(self):
+        engine = AmountEngine(ROUNDING_CONFIG["0.01"])
+        with self.assertRaises(ValueError):
+            engine.order_amounts("HOLD", 10, 0.5)
+        with self.assertRaises(ValueError):
+            engine.market_order_amounts("HOLD", 10, 0.5)
+
+    def test_batch_matches_scalar_amounts(self):
+        for tick_size, round_config in ROUNDING_CONFIG.items():
+            engine = AmountEngine(round_config)
+            prices, sizes = [], []
+            size = 0.01
+            while size <= 50:
+                price = float(tick_size)
+                while price <= 1:
+                    prices.append(price)
+                    sizes.append(size)
+                    price = price + float(tick_size) * 3
+                size = size + 0.53
+
+            for side in (BUY, SELL):
+                expected = [
+                    engine.order_amounts(side, n, p) for n, p in zip(sizes, prices)
+                ]
+                for np in (amounts.np, None):
+                    with patch.object(amounts, "np", np):
+                        utils_side, makers, takers = engine.order_amounts_batch(
+                            side, sizes, prices
+                        )
+                    self.assertEqual(
+                        [(utils_side, m, t) for m, t in zip(makers, takers)], expected
+                    )
+
+    def test_batch_falls_back_on_huge_sizes(self):
+        engine = AmountEngine(ROUNDING_CONFIG["0.0001"])
+        sizes = [1e13, 21.04]
+        prices = [0.9999, 0.5]
+        self.assertEqual(
+            engine.order_amounts_batch(BUY, sizes, prices),
+            (
+                UtilsBuy,
+                [engine.order_amounts(BUY, n, p)[1] for n, p in zip(sizes, prices)],
+                [engine.order_amounts(BUY, n, p)[2] for n, p in zip(sizes, prices)],
+            ),
+        )
+
+    def test_batch_falls_back_before_scaling_overflows(self):
+        # at tick 0.1 amounts are scaled by 10^3 and sizes by 10^4 after the
+        # products, which stay far below the int64 range
+        engine = AmountEngine(ROUNDING_CONFIG["0.1"])
+        for sizes in ([2e13, 1.5], [1e15, 1.5], [9e14, 1.5]):
+            prices = [0.9, 0.1]
+            for side in (BUY, SELL):
+                expected = [
+                    engine.order_amounts(side, n, p) for n, p in zip(sizes, prices)
+                ]
+                utils_side, makers, takers = engine.order_amounts_batch(
+                    side, sizes, prices
+                )
+                self.assertEqual(
+                    [(utils_side, m, t) for m, t in zip(makers, takers)], expected
+                )
+        self.assertFalse(engine._batch_overflows(9, 4.6e13))
+        self.assertTrue(engine._batch_overflows(9, 4.7e14))
+
+    def test_invalid_prices(self):
+        prices = [0.0, 0.01, 0.5, 0.99, 0.995, 1.0]
+        for np in (amounts.np, None):
+            with patch.object(amounts, "np", np):
+                self.assertEqual(invalid_prices(prices, "0.01"), [0.0, 0.995, 1.0])
+                self.assertEqual(invalid_prices(prices[1:4], "0.01"), [])
@@ -4,8 +4,10 @@ from py_clob_client.clob_types import (
     OrderArgs,
     MarketOrderArgs,
     CreateOrderOptions,
+    OrderBookSummary,
     OrderSummary,
 )
+from py_clob_client.book import NumericBook
 from py_clob_client.constants import AMOY
 from py_clob_client.order_builder.constants import BUY, SELL
 
@@ -41,14 +43,14 @@ class TestOrderBuilder(TestCase):
             builder = OrderBuilder(signer)
             builder.calculate_buy_market_price(positions, 100)
 
-        # OK
+        # OK, the asks are walked from the lowest price whatever the list order
         positions = [
             OrderSummary(price="0.5", size="100"),
             OrderSummary(price="0.4", size="100"),
             OrderSummary(price="0.3", size="100"),
         ]
         builder = OrderBuilder(signer)
-        self.assertEqual(builder.calculate_buy_market_price(positions, 100), 0.3)
+        self.assertEqual(builder.calculate_buy_market_price(positions, 100), 0.5)
 
         positions = [
             OrderSummary(price="0.5", size="100"),
@@ -64,7 +66,7 @@ class TestOrderBuilder(TestCase):
             OrderSummary(price="0.3", size="100"),
         ]
         builder = OrderBuilder(signer)
-        self.assertEqual(builder.calculate_buy_market_price(positions, 100), 0.4)
+        self.assertEqual(builder.calculate_buy_market_price(positions, 100), 0.5)
 
         positions = [
             OrderSummary(price="0.5", size="200"),
@@ -74,6 +76,34 @@ class TestOrderBuilder(TestCase):
         builder = OrderBuilder(signer)
         self.assertEqual(builder.calculate_buy_market_price(positions, 100), 0.5)
 
+    def test_market_price_matches_numeric_book(self):
+        # /book lists both sides worst first
+        summary = OrderBookSummary(
+            asks=[
+                OrderSummary(price="0.6", size="50"),
+                OrderSummary(price="0.55", size="100"),
+                OrderSummary(price="0.52", size="100"),
+            ],
+            bids=[
+                OrderSummary(price="0.4", size="300"),
+                OrderSummary(price="0.45", size="100"),
+                OrderSummary(price="0.48", size="100"),
+            ],
+        )
+        book = NumericBook.from_summary(summary)
+        builder = OrderBuilder(signer)
+        for amount in (10, 52, 60, 120):
+            self.assertEqual(
+                builder.calculate_buy_market_price(summary.asks, amount),
+                book.market_price(BUY, amount),
+            )
+        for amount in (10, 100, 150, 450):
+            self.assertEqual(
+                builder.calculate_sell_market_price(summary.bids, amount),
+                book.market_price(SELL, amount),
+            )
+        self.assertEqual(builder.calculate_buy_market_price(summary.asks, 52), 0.52)
+
     def test_calculate_sell_market_price(self):
         # empty
         with self.assertRaises(Exception):
@@ -3299,3 +3329,108 @@ class TestOrderBuilder(TestCase):
             / float(signed_order.order["makerAmount"]),
             0.0056,
         )
+
+    def test_exchange_order_builders_are_reused(self):
+        builder = OrderBuilder(signer)
+
+        order_builder = builder.get_order_builder(False)
+        self.assertIs(builder.get_order_builder(False), order_builder)
+        self.assertIsNot(builder.get_order_builder(True), order_builder)
+        self.assertIs(builder.get_order_builder(True).signer, order_builder.signer)
+        self.assertEqual(
+            builder.get_order_builder(True).contract_address,
+            "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296",
+        )
+
+        # signatures match a freshly built exchange order builder
+        signed = builder.create_order(
+            order_args=OrderArgs(token_id="123", price=0.5, size=21.04, side=BUY),
+            options=CreateOrderOptions(tick_size="0.01", neg_risk=False),
+        )
+        fresh = OrderBuilder(signer).get_order_builder(False)
+        self.assertEqual(fresh.build_order_signature(signed.order), signed.signature)
+
+    def test_create_orders(self):
+        builder = OrderBuilder(signer)
+        builder.signing_workers = 2
+        builder.signing_pool_min_batch = 2
+        self.addCleanup(builder.close)
+
+        args = [
+            OrderArgs(token_id="123", price=0.01 * p, size=10 + p, side=BUY)
+            for p in range(1, 50)
+        ]
+        options = [
+            CreateOrderOptions(tick_size="0.01", neg_risk=p % 2 == 0)
+            for p in range(1, 50)
+        ]
+        signed_orders = builder.create_orders(args, options)
+
+        self.assertEqual(len(signed_orders), len(args))
+        for a, o, signed in zip(args, options, signed_orders):
+            expected = builder.create_order(a, o)
+            for field in ("makerAmount", "takerAmount", "side", "tokenId"):
+                self.assertEqual(signed.order[field], expected.order[field])
+
+            # signatures are deterministic, so signing in the parent gives the same
+            order_builder = builder.get_order_builder(o.neg_risk)
+            self.assertEqual(
+                signed.signature,
+                order_builder.build_order_signature(signed.order),
+            )
+
+    def test_signing_pool_is_opt_in(self):
+        builder = OrderBuilder(signer)
+        self.addCleanup(builder.close)
+        args = [
+            OrderArgs(token_id="123", price=0.5, size=10 + p, side=BUY)
+            for p in range(3)
+        ]
+        options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+
+        # inline by default, and for batches under signing_pool_min_batch
+        builder.create_orders(args, options)
+        self.assertIsNone(builder.start_signing_pool())
+        builder.signing_workers = 2
+        builder.create_orders(args, options)
+        self.assertIsNone(builder._signing_pool)
+
+        pool = builder.start_signing_pool()
+        self.assertIs(builder.start_signing_pool(), pool)
+        self.assertNotEqual(pool._executor._mp_context.get_start_method(), "fork")
+
+    def test_build_ladder(self):
+        builder = OrderBuilder(signer)
+        builder.signing_workers = 1
+        prices = [0.4, 0.41, 0.42, 0.43, 0.44]
+        sizes = [10, 20.5, 30, 40.25, 50]
+        options = CreateOrderOptions(tick_size="0.01", neg_risk=True)
+
+        ladder = builder.build_ladder(
+            "123", SELL, prices, sizes, options, expiration=50000
+        )
+
+        self.assertEqual(len(ladder), len(prices))
+        for price, size, signed in zip(prices, sizes, ladder):
+            expected = builder.create_order(
+                OrderArgs(
+                    token_id="123", price=price, size=size, side=SELL, expiration=50000
+                ),
+                options,
+            )
+            for field in (
+                "makerAmount",
+                "takerAmount",
+                "side",
+                "tokenId",
+                "expiration",
+            ):
+                self.assertEqual(signed.order[field], expected.order[field])
+            self.assertEqual(
+                signed.signature,
+                builder.get_order_builder(True).build_order_signature(signed.order),
+            )
+
+        # one size for every level
+        ladder = builder.build_ladder("123", BUY, prices, 10, options)
+        self.assertEqual([o.order["takerAmount"] for o in ladder], [10000000] * 5)
@@ -0,0 +1,101 @@
+from unittest import TestCase, skipUnless
+
+from py_clob_client.clob_types import CreateOrderOptions, OrderArgs
+from py_clob_client.constants import AMOY
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.order_builder.constants import BUY, SELL
+from py_clob_client.signer import Signer
+from py_clob_client.signing import backends
+from py_clob_client.signing.backends import (
+    CoincurveBackend,
+    EthAccountBackend,
+    default_backend,
+    get_backend,
+)
+from py_clob_client.signing.eip712 import sign_clob_auth_message
+
+# publicly known private key
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+chain_id = AMOY
+
+# vector from tests/signing/test_eip712.py
+clob_auth_signature = "0xf62319a987514da40e57e2f4d7529f7bac38f0355bd88bb5adbb3768d80de6c1682518e0af677d5260366425f4361e7b70c25ae232aff0ab2331e2b164a1aedc1b"
+
+
+def signed_orders(backend: str) -> list:
+    """
+    Signs the order shapes of tests/order_builder/test_builder.py with fixed salts
+    """
+    builder = OrderBuilder(Signer(private_key, chain_id, backend))
+    signatures = []
+    for neg_risk in (False, True):
+        builder.get_order_builder(neg_risk).salt_generator = lambda: 479249096354
+        for tick_size in ("0.1", "0.01", "0.001", "0.0001"):
+            for side in (BUY, SELL):
+                for price, size in ((0.5, 21.04), (0.56, 21.04), (0.0056, 21.04)):
+                    if price < float(tick_size):
+                        continue
+                    signed = builder.create_order(
+                        OrderArgs(
+                            token_id="123",
+                            price=price,
+                            size=size,
+                            side=side,
+                            fee_rate_bps=111,
+                            nonce=123,
+                            expiration=50000,
+                        ),
+                        CreateOrderOptions(tick_size=tick_size, neg_risk=neg_risk),
+                    )
+                    signatures.append(
+                        (
+                            signed.signature,
+                            builder.get_order_builder(neg_risk).build_order_signature(
+                                signed.order
+                            ),
+                        )
+                    )
+    return signatures
+
+
+class TestSigningBackends(TestCase):
+    def test_eth_account_backend(self):
+        signer = Signer(private_key, chain_id, EthAccountBackend.name)
+        self.assertIsInstance(signer.backend, EthAccountBackend)
+        self.assertEqual(
+            sign_clob_auth_message(signer, 10000000, 23), clob_auth_signature
+        )
+        for signature, reference in signed_orders(EthAccountBackend.name):
+            self.assertEqual(signature, reference)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend("openssl")
+
+    def test_default_backend(self):
+        expected = (
+            CoincurveBackend.name
+            if backends.coincurve is not None
+            else EthAccountBackend.name
+        )
+        self.assertEqual(default_backend(), expected)
+        self.assertEqual(Signer(private_key, chain_id).backend.name, expected)
+
+    @skipUnless(backends.coincurve is not None, "coincurve is not installed")
+    def test_coincurve_backend_matches_eth_account(self):
+        signer = Signer(private_key, chain_id, CoincurveBackend.name)
+        self.assertIsInstance(signer.backend, CoincurveBackend)
+        self.assertEqual(
+            sign_clob_auth_message(signer, 10000000, 23), clob_auth_signature
+        )
+        self.assertEqual(
+            signed_orders(CoincurveBackend.name), signed_orders(EthAccountBackend.name)
+        )
+        for signature, reference in signed_orders(CoincurveBackend.name):
+            self.assertEqual(signature, reference)
+
+        eth_account = EthAccountBackend(private_key)
+        coincurve = CoincurveBackend(private_key)
+        for i in range(200):
+            digest = "0x" + (i.to_bytes(2, "big") * 16).hex()
+            self.assertEqual(coincurve.sign(digest), eth_account.sign(digest))
@@ -1,8 +1,22 @@
+import random
 from unittest import TestCase
-from py_clob_client.constants import AMOY
+
+from eth_utils import keccak
+from py_order_utils.model.order import Order
+from py_order_utils.utils import prepend_zx
+
+from py_clob_client.config import get_contract_config
+from py_clob_client.constants import AMOY, POLYGON
 
 from py_clob_client.signer import Signer
-from py_clob_client.signing.eip712 import sign_clob_auth_message
+from py_clob_client.signing.eip712 import (
+    get_clob_auth_domain,
+    get_exchange_domain,
+    get_signing_context,
+    sign_clob_auth_message,
+    MSG_TO_SIGN,
+)
+from py_clob_client.signing.model import ClobAuth
 
 # publicly known private key
 private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
@@ -18,3 +32,52 @@ class TestEIP712(TestCase):
             signature,
             "0xf62319a987514da40e57e2f4d7529f7bac38f0355bd88bb5adbb3768d80de6c1682518e0af677d5260366425f4361e7b70c25ae232aff0ab2331e2b164a1aedc1b",
         )
+
+    def test_clob_auth_hash_matches_struct_encoding(self):
+        for chain in (AMOY, POLYGON):
+            context = get_signing_context(chain)
+            for timestamp, nonce in ((0, 0), (1700000000, 1), (10000000, 2**64)):
+                msg = ClobAuth(
+                    address=signer.address(),
+                    timestamp=str(timestamp),
+                    nonce=nonce,
+                    message=MSG_TO_SIGN,
+                )
+                self.assertEqual(
+                    context.clob_auth_hash(signer.address(), timestamp, nonce),
+                    prepend_zx(
+                        keccak(msg.signable_bytes(get_clob_auth_domain(chain))).hex()
+                    ),
+                )
+
+    def test_order_hash_matches_struct_encoding(self):
+        rng = random.Random(0)
+        for chain in (AMOY, POLYGON):
+            for neg_risk in (False, True):
+                exchange = get_contract_config(chain, neg_risk).exchange
+                context = get_signing_context(chain, exchange)
+                domain = get_exchange_domain(chain, exchange)
+                for _ in range(20):
+                    order = Order(
+                        salt=rng.getrandbits(32),
+                        maker=signer.address(),
+                        signer=signer.address(),
+                        taker="0x" + "%040x" % rng.getrandbits(160),
+                        tokenId=rng.getrandbits(256),
+                        makerAmount=rng.getrandbits(64),
+                        takerAmount=rng.getrandbits(64),
+                        expiration=rng.getrandbits(32),
+                        nonce=rng.getrandbits(16),
+                        feeRateBps=rng.getrandbits(10),
+                        side=rng.getrandbits(1),
+                        signatureType=rng.getrandbits(1),
+                    )
+                    self.assertEqual(
+                        context.order_hash(order),
+                        prepend_zx(keccak(order.signable_bytes(domain)).hex()),
+                    )
+
+    def test_signing_contexts_are_shared(self):
+        self.assertIs(get_signing_context(AMOY), get_signing_context(AMOY))
+        with self.assertRaises(ValueError):
+            get_signing_context(AMOY).order_hash(Order())
@@ -1,6 +1,10 @@
 from unittest import TestCase
 
-from py_clob_client.signing.hmac import build_hmac_signature
+from py_clob_client.signing.hmac import (
+    HmacContext,
+    build_hmac_signature,
+    get_hmac_context,
+)
 
 
 class TestHMAC(TestCase):
@@ -17,3 +21,44 @@ class TestHMAC(TestCase):
             signature,
             "ZwAdJKvoYRlEKDkNMwd5BuwNNtg93kNaR_oU2HrfVvc=",
         )
+
+    def test_build_hmac_signature_bytes_body(self):
+        signature = build_hmac_signature(
+            "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+            "1000000",
+            "test-sign",
+            "/orders",
+            b'{"hash": "0x123"}',
+        )
+        self.assertEqual(
+            signature,
+            "ZwAdJKvoYRlEKDkNMwd5BuwNNtg93kNaR_oU2HrfVvc=",
+        )
+
+    def test_structured_body_is_signed_as_canonical_json(self):
+        secret = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA="
+        body = [{"orderID": "0x1", "note": 'it\'s "quoted"'}, {"orderID": "0x2"}]
+        self.assertEqual(
+            build_hmac_signature(secret, "1000000", "DELETE", "/orders", body),
+            build_hmac_signature(
+                secret,
+                "1000000",
+                "DELETE",
+                "/orders",
+                b'[{"orderID":"0x1","note":"it\'s \\"quoted\\""},{"orderID":"0x2"}]',
+            ),
+        )
+
+    def test_hmac_context_is_reused(self):
+        secret = "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA="
+        context = get_hmac_context(secret)
+        self.assertIs(get_hmac_context(secret), context)
+        for _ in range(2):
+            self.assertEqual(
+                context.sign("1000000", "test-sign", "/orders", b'{"hash": "0x123"}'),
+                "ZwAdJKvoYRlEKDkNMwd5BuwNNtg93kNaR_oU2HrfVvc=",
+            )
+        self.assertNotEqual(
+            HmacContext(secret).sign("1000000", "test-sign", "/orders"),
+            context.sign("1000000", "test-sign", "/orders", b"{}"),
+        )
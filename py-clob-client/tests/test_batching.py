@@ -0,0 +1,99 @@
+import threading
+from unittest import TestCase
+
+from py_clob_client.batching import BatchLoader
+from py_clob_client.exceptions import PolyApiException, PolyBatchException
+
+
+def run_concurrently(targets):
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+class TestBatchLoader(TestCase):
+    def test_loads_within_window_share_one_batch(self):
+        batches = []
+
+        def batch_fn(keys):
+            batches.append(sorted(keys))
+            return {k: k * 2 for k in keys}
+
+        loader = BatchLoader(batch_fn, window=0.05)
+        results = {}
+
+        def load(k):
+            return lambda: results.__setitem__(k, loader.load(k))
+
+        run_concurrently([load(k) for k in [1, 2, 3, 2]])
+
+        self.assertEqual(batches, [[1, 2, 3]])
+        self.assertEqual(results, {1: 2, 2: 4, 3: 6})
+        self.assertEqual(loader.stats(), {"loads": 4, "batches": 1})
+
+    def test_max_batch_dispatches_early(self):
+        batches = []
+
+        def batch_fn(keys):
+            batches.append(len(keys))
+            return {k: k for k in keys}
+
+        loader = BatchLoader(batch_fn, window=10, max_batch=2)
+        run_concurrently([lambda: loader.load(1), lambda: loader.load(2)])
+        self.assertEqual(batches, [2])
+
+    def test_errors_are_per_key(self):
+        def batch_fn(keys):
+            raise PolyBatchException(
+                {2: PolyApiException(error_msg="failed")}, {1: "ok"}
+            )
+
+        loader = BatchLoader(batch_fn, window=0.05)
+        outcomes = {}
+
+        def load(k):
+            def run():
+                try:
+                    outcomes[k] = loader.load(k)
+                except PolyApiException as e:
+                    outcomes[k] = e.error_msg
+
+            return run
+
+        run_concurrently([load(1), load(2), load(3)])
+        self.assertEqual(outcomes[1], "ok")
+        self.assertEqual(outcomes[2], "failed")
+        self.assertEqual(outcomes[3], "no result returned for 3")
+
+    def test_batch_failure_reaches_every_caller(self):
+        def batch_fn(keys):
+            raise PolyApiException(error_msg="down")
+
+        loader = BatchLoader(batch_fn, window=0.01)
+        with self.assertRaises(PolyApiException):
+            loader.load("1")
+
+    def test_interrupted_batch_releases_every_caller(self):
+        def batch_fn(keys):
+            raise KeyboardInterrupt
+
+        loader = BatchLoader(batch_fn, window=10, max_batch=2)
+        outcomes = {}
+
+        def load(k):
+            def run():
+                try:
+                    loader.load(k)
+                except BaseException as e:
+                    outcomes[k] = type(e)
+
+            return run
+
+        threads = [threading.Thread(target=load(k), daemon=True) for k in (1, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(5)
+        self.assertEqual(outcomes, {1: KeyboardInterrupt, 2: KeyboardInterrupt})
@@ -0,0 +1,228 @@
+import random
+from unittest import TestCase
+
+from py_clob_client.book import (
+    BookSide,
+    CompactBook,
+    NumericBook,
+    format_units,
+    parse_units,
+)
+from py_clob_client.clob_types import OrderBookSummary, OrderSummary
+from py_clob_client.utilities import (
+    generate_orderbook_summary_hash,
+    parse_raw_orderbook_summary,
+)
+
+
+def legacy_buy_price(positions, amount):
+    total = 0
+    for p in positions:
+        total += float(p.size) * float(p.price)
+        if total >= amount:
+            return float(p.price)
+    raise Exception("no match")
+
+
+def legacy_sell_price(positions, amount):
+    total = 0
+    for p in reversed(positions):
+        total += float(p.size)
+        if total >= amount:
+            return float(p.price)
+    raise Exception("no match")
+
+
+def levels(pairs):
+    return [OrderSummary(price=p, size=s) for p, s in pairs]
+
+
+class TestBookSide(TestCase):
+    def setUp(self):
+        # asks in fill order, best first
+        self.asks = BookSide([0.5, 0.51, 0.53], [100, 200, 100], buy=True)
+        # bids in fill order, best first
+        self.bids = BookSide([0.49, 0.48, 0.45], [100, 100, 300], buy=False)
+
+    def test_cumulative(self):
+        self.assertEqual(list(self.asks.cum_size), [100, 300, 400])
+        self.assertEqual(list(self.asks.cum_notional), [50, 152, 205])
+        self.assertEqual(self.asks.total_size, 400)
+        self.assertEqual(self.asks.total_notional, 205)
+        self.assertEqual(BookSide([], [], buy=True).total_size, 0)
+
+    def test_marginal_price(self):
+        self.assertEqual(self.asks.marginal_price(100), 0.5)
+        self.assertEqual(self.asks.marginal_price(101), 0.51)
+        self.assertEqual(self.asks.marginal_price(152, notional=True), 0.51)
+        self.assertEqual(self.bids.marginal_price(250), 0.45)
+        with self.assertRaises(Exception):
+            self.asks.marginal_price(401)
+        with self.assertRaises(Exception):
+            BookSide([], [], buy=False).marginal_price(1)
+
+    def test_vwap_and_slippage(self):
+        self.assertAlmostEqual(self.asks.vwap(100), 0.5)
+        self.assertAlmostEqual(self.asks.vwap(200), (50 + 51) / 200)
+        self.assertAlmostEqual(self.asks.vwap(101, notional=True), 101 / 200)
+        self.assertAlmostEqual(self.asks.slippage(200), (50 + 51) / 200 - 0.5)
+        self.assertAlmostEqual(self.bids.vwap(300), (49 + 48 + 45) / 300)
+        self.assertAlmostEqual(self.bids.slippage(300), 0.49 - (49 + 48 + 45) / 300)
+        self.assertEqual(self.bids.slippage(50), 0)
+
+    def test_max_fillable(self):
+        self.assertEqual(self.asks.max_fillable(), 400)
+        self.assertEqual(self.asks.max_fillable(0.51), 300)
+        self.assertEqual(self.asks.max_fillable(0.51, notional=True), 152)
+        self.assertEqual(self.asks.max_fillable(0.49), 0)
+        self.assertEqual(self.bids.max_fillable(0.48), 200)
+        self.assertEqual(self.bids.max_fillable(0.5), 0)
+        self.assertEqual(self.bids.max_fillable(0.1), 500)
+
+        # a better level after a worse one is not reached
+        side = BookSide([0.5, 0.6, 0.55], [10, 10, 10], buy=True)
+        self.assertEqual(side.max_fillable(0.56), 10)
+
+    def test_matches_legacy_market_price(self):
+        rng = random.Random(0)
+
+        def server_side(descending):
+            pairs = [
+                (round(rng.uniform(0.01, 0.99), 2), rng.randint(1, 500))
+                for _ in range(rng.randint(0, 20))
+            ]
+            pairs.sort(reverse=descending)
+            return levels((str(p), str(s)) for p, s in pairs)
+
+        for _ in range(300):
+            # /book lists asks by descending and bids by ascending price
+            asks = server_side(descending=True)
+            bids = server_side(descending=False)
+            book = NumericBook.from_summary(OrderBookSummary(asks=asks, bids=bids))
+            for amount in (1, 10, 77.7, 250, 1000, 5000):
+                for side, legacy, positions in (
+                    ("BUY", legacy_buy_price, asks[::-1]),
+                    ("SELL", legacy_sell_price, bids),
+                ):
+                    try:
+                        expected = legacy(positions, amount)
+                    except Exception:
+                        with self.assertRaises(Exception):
+                            book.market_price(side, amount)
+                        continue
+                    self.assertEqual(book.market_price(side, amount), expected)
+
+
+class TestNumericBook(TestCase):
+    def test_from_summary(self):
+        summary = OrderBookSummary(
+            market="0xaabbcc",
+            asset_id="123",
+            timestamp="1",
+            bids=levels([("0.3", "10"), ("0.4", "20")]),
+            asks=levels([("0.6", "30"), ("0.5", "40")]),
+            hash="abc",
+        )
+        book = NumericBook.from_summary(summary)
+
+        self.assertEqual(list(book.buy.prices), [0.5, 0.6])
+        self.assertEqual(list(book.buy.sizes), [40, 30])
+        self.assertEqual(list(book.sell.prices), [0.4, 0.3])
+        self.assertEqual(list(book.sell.sizes), [20, 10])
+        self.assertIs(book.side("BUY"), book.buy)
+        self.assertIs(book.side("SELL"), book.sell)
+        self.assertEqual(book.asset_id, "123")
+        with self.assertRaises(ValueError):
+            book.side("HOLD")
+
+    def test_server_ordered_levels_fill_best_first(self):
+        # worst first, as returned by /book
+        summary = OrderBookSummary(
+            bids=levels([("0.45", "300"), ("0.48", "100"), ("0.49", "100")]),
+            asks=levels([("0.53", "100"), ("0.51", "200"), ("0.5", "100")]),
+        )
+        book = NumericBook.from_summary(summary)
+
+        self.assertAlmostEqual(book.buy.vwap(200), (50 + 51) / 200)
+        self.assertAlmostEqual(book.buy.slippage(200), (50 + 51) / 200 - 0.5)
+        self.assertGreater(book.buy.slippage(400), 0)
+        self.assertEqual(book.buy.max_fillable(0.51), 300)
+        self.assertEqual(book.buy.max_fillable(0.5), 100)
+        self.assertEqual(book.buy.max_fillable(0.49), 0)
+        self.assertEqual(book.market_price("BUY", 50), 0.5)
+
+        self.assertAlmostEqual(book.sell.vwap(300), (49 + 48 + 45) / 300)
+        self.assertAlmostEqual(book.sell.slippage(300), 0.49 - (49 + 48 + 45) / 300)
+        self.assertEqual(book.sell.max_fillable(0.48), 200)
+        self.assertEqual(book.sell.max_fillable(0.5), 0)
+        self.assertEqual(book.market_price("SELL", 150), 0.48)
+
+
+class TestCompactBook(TestCase):
+    def setUp(self):
+        self.raw = {
+            "market": "0xbd31dc8a",
+            "asset_id": "123",
+            "timestamp": "123456789",
+            "bids": [
+                {"price": "0.15", "size": "100"},
+                {"price": "0.31", "size": "148.56"},
+                {"price": "0.5", "size": "0.000001"},
+            ],
+            "asks": [
+                {"price": "0.9999", "size": "12"},
+                {"price": "0.52", "size": "3.5"},
+            ],
+            "hash": "abc",
+        }
+
+    def test_units(self):
+        self.assertEqual(parse_units("0.31", 4), 3100)
+        self.assertEqual(parse_units("148.56", 6), 148560000)
+        self.assertEqual(parse_units("12", 6), 12000000)
+        for value in ("10.50", "01", "1.", ".5", "-1", "0.00001", "1e3"):
+            self.assertIsNone(parse_units(value, 4), value)
+        self.assertEqual(format_units(3100, 4), "0.31")
+        self.assertEqual(format_units(1, 6), "0.000001")
+        self.assertEqual(format_units(0, 4), "0")
+
+    def test_matches_legacy_summary(self):
+        book = CompactBook.from_raw(self.raw)
+        legacy = parse_raw_orderbook_summary(self.raw)
+
+        self.assertIsNone(book._legacy)
+        self.assertEqual(book.n_bids, 3)
+        self.assertEqual(list(book.prices), [1500, 3100, 5000, 9999, 5200])
+        self.assertEqual(book.bids, legacy.bids)
+        self.assertEqual(book.asks, legacy.asks)
+        self.assertEqual(book.to_summary(), legacy)
+        self.assertEqual(book.json, legacy.json)
+        self.assertEqual(
+            generate_orderbook_summary_hash(book),
+            generate_orderbook_summary_hash(legacy),
+        )
+
+    def test_non_canonical_levels_are_kept_exact(self):
+        self.raw["asks"][1]["size"] = "3.50"
+        book = CompactBook.from_raw(self.raw)
+
+        self.assertEqual(book.sizes[4], 3500000)
+        self.assertEqual(book.to_summary(), parse_raw_orderbook_summary(self.raw))
+
+    def test_to_numeric(self):
+        book = CompactBook.from_raw(self.raw)
+        expected = NumericBook.from_summary(parse_raw_orderbook_summary(self.raw))
+        numeric = book.to_numeric()
+
+        for side in ("buy", "sell"):
+            self.assertEqual(
+                getattr(numeric, side).prices, getattr(expected, side).prices
+            )
+            self.assertEqual(
+                getattr(numeric, side).sizes, getattr(expected, side).sizes
+            )
+        self.assertEqual(list(numeric.buy.prices), [0.52, 0.9999])
+        self.assertEqual(list(numeric.sell.prices), [0.5, 0.31, 0.15])
+        self.assertEqual(
+            numeric.market_price("BUY", 5), expected.market_price("BUY", 5)
+        )
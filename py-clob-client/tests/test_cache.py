@@ -0,0 +1,133 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_clob_client.cache import MetadataCache, TICK_SIZE, NEG_RISK, MARKETS
+from py_clob_client.client import ClobClient
+
+
+class TestMetadataCache(TestCase):
+    def test_hit_miss_counters(self):
+        cache = MetadataCache()
+        self.assertIsNone(cache.get(TICK_SIZE, "1"))
+        cache.set(TICK_SIZE, "1", "0.01")
+        self.assertEqual(cache.get(TICK_SIZE, "1"), "0.01")
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_ttl(self):
+        cache = MetadataCache(ttl=10, ttls={NEG_RISK: None})
+        with patch("py_clob_client.cache.time.time", return_value=1000):
+            cache.set(TICK_SIZE, "1", "0.01")
+            cache.set(NEG_RISK, "1", True)
+        with patch("py_clob_client.cache.time.time", return_value=1009):
+            self.assertEqual(cache.get(TICK_SIZE, "1"), "0.01")
+        with patch("py_clob_client.cache.time.time", return_value=1011):
+            self.assertIsNone(cache.get(TICK_SIZE, "1"))
+            self.assertTrue(cache.get(NEG_RISK, "1"))
+
+    def test_lru_eviction(self):
+        cache = MetadataCache(maxsize=2)
+        cache.set(TICK_SIZE, "1", "0.1")
+        cache.set(TICK_SIZE, "2", "0.01")
+        cache.get(TICK_SIZE, "1")
+        cache.set(TICK_SIZE, "3", "0.001")
+        self.assertIsNone(cache.get(TICK_SIZE, "2"))
+        self.assertEqual(cache.get(TICK_SIZE, "1"), "0.1")
+        self.assertEqual(cache.get(TICK_SIZE, "3"), "0.001")
+
+    def test_get_or_fetch(self):
+        cache = MetadataCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return "0.01"
+
+        self.assertEqual(cache.get_or_fetch(TICK_SIZE, "1", fetch), "0.01")
+        self.assertEqual(cache.get_or_fetch(TICK_SIZE, "1", fetch), "0.01")
+        self.assertEqual(len(calls), 1)
+
+    def test_invalidation_hooks(self):
+        cache = MetadataCache(ttl=10)
+        events = []
+        cache.add_invalidation_hook(lambda *args: events.append(args))
+
+        with patch("py_clob_client.cache.time.time", return_value=1000):
+            cache.set(TICK_SIZE, "1", "0.01")
+            cache.set(TICK_SIZE, "1", "0.01")
+        self.assertEqual(events, [])
+
+        # the tick size changed once the entry expired and was refetched
+        with patch("py_clob_client.cache.time.time", return_value=1020):
+            self.assertEqual(
+                cache.get_or_fetch(TICK_SIZE, "1", lambda: "0.001"), "0.001"
+            )
+        self.assertEqual(events, [(TICK_SIZE, "1", "0.01", "0.001")])
+
+        cache.invalidate(TICK_SIZE, "1")
+        self.assertEqual(events[-1], (TICK_SIZE, "1", None, None))
+        self.assertIsNone(cache.get(TICK_SIZE, "1"))
+
+    def test_disk_store_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metadata.db")
+            first = MetadataCache(path=path)
+            first.set(TICK_SIZE, "1", "0.01")
+            first.set(MARKETS, "MA==", {"data": [{"condition_id": "0x1"}]})
+
+            second = MetadataCache(path=path)
+            self.assertEqual(second.get(TICK_SIZE, "1"), "0.01")
+            self.assertEqual(
+                second.get(MARKETS, "MA=="), {"data": [{"condition_id": "0x1"}]}
+            )
+            self.assertEqual(second.stats()["disk_hits"], 2)
+
+            first.invalidate(TICK_SIZE)
+            self.assertIsNone(MetadataCache(path=path).get(TICK_SIZE, "1"))
+
+
+class TestClientMetadataCache(TestCase):
+    def test_tick_size_and_neg_risk_are_cached(self):
+        client = ClobClient("http://clob")
+        responses = {
+            "http://clob/tick-size?token_id=1": {"minimum_tick_size": 0.01},
+            "http://clob/neg-risk?token_id=1": {"neg_risk": False},
+        }
+        with patch(
+            "py_clob_client.client.get", side_effect=lambda url: responses[url]
+        ) as get:
+            self.assertEqual(client.get_tick_size("1"), "0.01")
+            self.assertEqual(client.get_tick_size("1"), "0.01")
+            self.assertFalse(client.get_neg_risk("1"))
+            self.assertFalse(client.get_neg_risk("1"))
+            self.assertEqual(get.call_count, 2)
+
+            client.invalidate_tick_size("1")
+            self.assertEqual(client.get_tick_size("1"), "0.01")
+            self.assertEqual(get.call_count, 3)
+
+    def test_tick_sizes_expire_by_default(self):
+        cache = MetadataCache()
+        with patch("py_clob_client.cache.time.time", return_value=1000.0):
+            cache.set(TICK_SIZE, "1", "0.01")
+        with patch("py_clob_client.cache.time.time", return_value=1299.0):
+            self.assertEqual(cache.get(TICK_SIZE, "1"), "0.01")
+        with patch("py_clob_client.cache.time.time", return_value=1301.0):
+            self.assertIsNone(cache.get(TICK_SIZE, "1"))
+        self.assertIsNone(MetadataCache(ttls={TICK_SIZE: None}).ttls[TICK_SIZE])
+
+    def test_market_pages_are_cached_only_when_configured(self):
+        page = {"data": [], "next_cursor": "LTE="}
+        with patch("py_clob_client.client.get", return_value=page) as get:
+            client = ClobClient("http://clob")
+            client.get_markets()
+            client.get_markets()
+            self.assertEqual(get.call_count, 2)
+            self.assertIsNone(client.cache.get(MARKETS, "MA=="))
+
+            client = ClobClient("http://clob", cache=MetadataCache(ttls={MARKETS: 60}))
+            client.get_markets()
+            client.get_markets()
+            self.assertEqual(get.call_count, 3)
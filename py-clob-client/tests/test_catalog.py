@@ -0,0 +1,121 @@
+from unittest import TestCase
+
+from py_clob_client.catalog import MarketCatalog, parse_end_date
+from py_clob_client.constants import END_CURSOR
+
+
+def market(i, question, end_date_iso, closed=False):
+    return {
+        "condition_id": "0x{}".format(i),
+        "question": question,
+        "market_slug": "m-{}".format(i),
+        "end_date_iso": end_date_iso,
+        "active": True,
+        "closed": closed,
+        "neg_risk": False,
+        "minimum_tick_size": 0.01,
+        "tokens": [
+            {"token_id": "{}1".format(i), "outcome": "Yes"},
+            {"token_id": "{}2".format(i), "outcome": "No"},
+        ],
+    }
+
+
+class FakeClient:
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+
+    def get_markets(self, next_cursor="MA=="):
+        self.requested.append(next_cursor)
+        return self.pages[next_cursor]
+
+
+class TestMarketCatalog(TestCase):
+    def setUp(self):
+        self.pages = {
+            "MA==": {
+                "data": [
+                    market(
+                        1,
+                        "Will BTC be above $100,000 on Friday?",
+                        "2024-06-07T00:00:00Z",
+                    ),
+                    market(
+                        2, "Will ETH be above $4,000 on Friday?", "2024-06-07T00:00:00Z"
+                    ),
+                ],
+                "next_cursor": "Mg==",
+            },
+            "Mg==": {
+                "data": [
+                    market(
+                        3, "Will BTC be above $90,000 in June?", "2024-06-30T00:00:00Z"
+                    ),
+                ],
+                "next_cursor": END_CURSOR,
+            },
+        }
+        self.catalog = MarketCatalog(":memory:")
+
+    def tearDown(self):
+        self.catalog.close()
+
+    def test_parse_end_date(self):
+        self.assertEqual(parse_end_date("2024-06-07T00:00:00Z"), 1717718400)
+        self.assertIsNone(parse_end_date(None))
+        self.assertIsNone(parse_end_date("not a date"))
+
+    def test_sync_and_lookups(self):
+        self.assertEqual(self.catalog.sync(FakeClient(self.pages)), 3)
+
+        m = self.catalog.get_market("0x2")
+        self.assertEqual(m["question"], "Will ETH be above $4,000 on Friday?")
+        self.assertEqual(m["end_ts"], 1717718400)
+        self.assertTrue(m["active"])
+        self.assertEqual(m["minimum_tick_size"], "0.01")
+        self.assertEqual(
+            m["tokens"],
+            [{"token_id": "21", "outcome": "Yes"}, {"token_id": "22", "outcome": "No"}],
+        )
+        self.assertEqual(self.catalog.get_market_by_token("32")["condition_id"], "0x3")
+        self.assertIsNone(self.catalog.get_market("0x9"))
+
+    def test_search(self):
+        self.catalog.sync(FakeClient(self.pages))
+
+        btc = self.catalog.search("btc above")
+        self.assertEqual([m["condition_id"] for m in btc], ["0x1", "0x3"])
+
+        week = self.catalog.search(
+            "BTC",
+            end_after=parse_end_date("2024-06-03T00:00:00Z"),
+            end_before=parse_end_date("2024-06-10T00:00:00Z"),
+        )
+        self.assertEqual([m["condition_id"] for m in week], ["0x1"])
+        self.assertEqual(len(self.catalog.search()), 3)
+
+    def test_incremental_sync(self):
+        client = FakeClient(self.pages)
+        self.catalog.sync(client)
+        self.assertEqual(client.requested, ["MA==", "Mg=="])
+
+        # a new market lands on the last page and an old one closes there
+        self.pages["Mg=="]["data"] = [
+            market(
+                3,
+                "Will BTC be above $90,000 in June?",
+                "2024-06-30T00:00:00Z",
+                closed=True,
+            ),
+            market(4, "Will SOL be above $200 in June?", "2024-06-30T00:00:00Z"),
+        ]
+        client.requested = []
+        self.assertEqual(self.catalog.sync(client), 2)
+        self.assertEqual(client.requested, ["Mg=="])
+        self.assertTrue(self.catalog.get_market("0x3")["closed"])
+        self.assertEqual(len(self.catalog.search("sol")), 1)
+
+        client.requested = []
+        self.catalog.sync(client, full=True)
+        self.assertEqual(client.requested, ["MA==", "Mg=="])
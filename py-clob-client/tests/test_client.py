@@ -0,0 +1,564 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_clob_client.book import CompactBook
+from py_clob_client.cache import TICK_SIZE
+from py_clob_client.client import ClobClient
+from py_clob_client.clob_types import (
+    ApiCreds,
+    BookParams,
+    OrderArgs,
+    MarketOrderArgs,
+    OrderType,
+    CreateOrderOptions,
+    PostOrdersArgs,
+)
+from py_clob_client.constants import AMOY, POST_ORDERS_BATCH_SIZE
+from py_clob_client.exceptions import PolyApiException, PolyBatchException
+from py_clob_client.http_helpers.codec import decode
+from py_clob_client.http_helpers.transport import set_transport
+from py_clob_client.signing.hmac import build_hmac_signature
+
+from .feed_server import LocalFeedServer
+
+
+def raw_book(token_id):
+    return {
+        "market": "0xaabbcc",
+        "asset_id": token_id,
+        "timestamp": "123456789",
+        "bids": [{"price": "0.4", "size": "10"}],
+        "asks": [{"price": "0.6", "size": "10"}],
+        "hash": "",
+    }
+
+
+class FakeBatchServer:
+    def __init__(self, fail_tokens=(), status_code=None):
+        self.bodies = []
+        self.fail_tokens = set(fail_tokens)
+        self.status_code = status_code
+
+    def post(self, endpoint, headers=None, data=None):
+        self.bodies.append(data)
+        if any(item["token_id"] in self.fail_tokens for item in data):
+            e = PolyApiException(error_msg="too many tokens")
+            e.status_code = self.status_code
+            raise e
+        if endpoint.endswith("/books"):
+            return [raw_book(item["token_id"]) for item in data]
+        if endpoint.endswith("/last-trades-prices"):
+            return [{"token_id": item["token_id"], "price": "0.5"} for item in data]
+        return {item["token_id"]: "0.5" for item in data}
+
+
+class TestBatchEndpoints(TestCase):
+    def setUp(self):
+        self.client = ClobClient("http://clob")
+        self.client.batch_chunk_size = 3
+        self.params = [BookParams(token_id=str(i), side="BUY") for i in range(10)]
+
+    def test_single_chunk_is_one_request(self):
+        server = FakeBatchServer()
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            self.assertEqual(
+                self.client.get_midpoints(self.params[:3]),
+                {"0": "0.5", "1": "0.5", "2": "0.5"},
+            )
+        self.assertEqual(len(server.bodies), 1)
+
+    def test_chunks_merge_in_input_order(self):
+        server = FakeBatchServer()
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            books = self.client.get_order_books(self.params)
+            prices = self.client.get_prices(self.params)
+            last = self.client.get_last_trades_prices(self.params)
+
+        self.assertEqual([b.asset_id for b in books], [str(i) for i in range(10)])
+        self.assertEqual(list(prices), [str(i) for i in range(10)])
+        self.assertEqual([p["token_id"] for p in last], [str(i) for i in range(10)])
+        self.assertEqual(sorted(len(b) for b in server.bodies[:4]), [1, 3, 3, 3])
+        self.assertEqual(server.bodies[-1], [{"token_id": "9"}])
+
+    def test_prices_of_a_token_split_across_chunks(self):
+        def post(endpoint, headers=None, data=None):
+            return {
+                item["token_id"]: {
+                    item["side"]: "0.4" if item["side"] == "BUY" else "0.6"
+                }
+                for item in data
+            }
+
+        params = [
+            BookParams(token_id=str(i), side=side)
+            for i in range(2)
+            for side in ("BUY", "SELL")
+        ]
+        self.client.batch_chunk_size = 1
+        with patch("py_clob_client.client.post", side_effect=post):
+            prices = self.client.get_prices(params)
+        self.client.close()
+
+        self.assertEqual(
+            prices,
+            {
+                "0": {"BUY": "0.4", "SELL": "0.6"},
+                "1": {"BUY": "0.4", "SELL": "0.6"},
+            },
+        )
+
+    def test_compact_order_books(self):
+        server = FakeBatchServer()
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            books = self.client.get_order_books(self.params, compact=True)
+            summaries = self.client.get_order_books(self.params)
+
+        self.assertTrue(all(isinstance(b, CompactBook) for b in books))
+        self.assertEqual([b.to_summary() for b in books], summaries)
+
+    def test_partial_failure_is_reported_per_token(self):
+        server = FakeBatchServer(fail_tokens=["4"])
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.get_spreads(self.params)
+        self.assertEqual(sorted(ctx.exception.errors), ["3", "4", "5"])
+        self.assertEqual(
+            list(ctx.exception.results), ["0", "1", "2", "6", "7", "8", "9"]
+        )
+
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.get_order_books(self.params)
+        self.assertEqual(
+            [b.asset_id for b in ctx.exception.results],
+            ["0", "1", "2", "6", "7", "8", "9"],
+        )
+
+    def test_rejected_chunk_is_split_to_isolate_the_bad_token(self):
+        server = FakeBatchServer(fail_tokens=["4"], status_code=400)
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.get_spreads(self.params)
+        self.assertEqual(list(ctx.exception.errors), ["4"])
+        self.assertEqual(
+            list(ctx.exception.results), ["0", "1", "2", "3", "5", "6", "7", "8", "9"]
+        )
+
+    def test_single_chunk_failure_raises_the_batch_exception(self):
+        server = FakeBatchServer(fail_tokens=["1"], status_code=400)
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.get_midpoints(self.params[:3])
+        self.assertIsInstance(ctx.exception, PolyApiException)
+        self.assertEqual(list(ctx.exception.errors), ["1"])
+        self.assertEqual(ctx.exception.results, {"0": "0.5", "2": "0.5"})
+
+        server = FakeBatchServer(fail_tokens=["1"])
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.get_midpoints(self.params[:3])
+        self.assertEqual(sorted(ctx.exception.errors), ["0", "1", "2"])
+        self.assertIsNone(ctx.exception.results)
+        self.assertEqual(len(server.bodies), 1)
+
+
+class TestSingleFlightReads(TestCase):
+    def test_concurrent_order_book_reads_are_coalesced(self):
+        client = ClobClient("http://clob")
+        calls = []
+
+        def slow_get(endpoint):
+            calls.append(endpoint)
+            time.sleep(0.1)
+            return raw_book("1")
+
+        books = []
+        with patch("py_clob_client.client.get", side_effect=slow_get):
+            threads = [
+                threading.Thread(
+                    target=lambda: books.append(client.get_order_book("1"))
+                )
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(calls, ["http://clob/book?token_id=1"])
+        self.assertEqual([b.asset_id for b in books], ["1"] * 5)
+        self.assertEqual(client.single_flight_stats()["coalesced"], 4)
+
+    def test_single_flight_disabled(self):
+        client = ClobClient("http://clob", single_flight=False)
+        with patch("py_clob_client.client.get", return_value={"mid": "0.5"}):
+            self.assertEqual(client.get_midpoint("1"), {"mid": "0.5"})
+        self.assertEqual(client.single_flight_stats()["calls"], 0)
+
+
+class TestBatchingLayer(TestCase):
+    def test_single_token_reads_are_folded_into_batches(self):
+        client = ClobClient("http://clob")
+        client.enable_batching(window_ms=50)
+        server = FakeBatchServer()
+
+        def fake_post(endpoint, headers=None, data=None):
+            if endpoint.endswith("/prices"):
+                server.bodies.append(data)
+                return {item["token_id"]: {item["side"]: "0.5"} for item in data}
+            return server.post(endpoint, data=data)
+
+        results = {}
+
+        def call(name, fn):
+            return lambda: results.__setitem__(name, fn())
+
+        with patch("py_clob_client.client.post", side_effect=fake_post):
+            targets = []
+            for i in range(3):
+                targets += [
+                    call(("price", i), lambda i=i: client.get_price(str(i), "BUY")),
+                    call(("mid", i), lambda i=i: client.get_midpoint(str(i))),
+                    call(("book", i), lambda i=i: client.get_order_book(str(i))),
+                ]
+            threads = [threading.Thread(target=t) for t in targets]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(server.bodies), 3)
+        for i in range(3):
+            self.assertEqual(results[("price", i)], {"price": "0.5"})
+            self.assertEqual(results[("mid", i)], {"mid": "0.5"})
+            self.assertEqual(results[("book", i)].asset_id, str(i))
+        self.assertEqual(
+            client.batching_stats()["/price"],
+            {"loads": 3, "batches": 1},
+        )
+
+        client.disable_batching()
+        self.assertEqual(client.batching_stats(), {})
+
+
+class FakeStreamTransport:
+    name = "fake"
+    errors = (ConnectionError,)
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    @contextmanager
+    def stream(self, method, url, headers=None, chunk_size=65536):
+        self.urls.append(url)
+        raw = json.dumps(self.pages[url.split("next_cursor=")[1]]).encode("utf-8")
+
+        class Resp:
+            status_code = 200
+
+        yield Resp(), iter([raw[i : i + 10] for i in range(0, len(raw), 10)])
+
+    def close(self):
+        pass
+
+
+class TestStreamingMarkets(TestCase):
+    def tearDown(self):
+        set_transport(None)
+
+    def test_iter_markets_streams_every_page(self):
+        transport = FakeStreamTransport(
+            {
+                "MA==": {
+                    "data": [{"condition_id": "0x1", "question": "q1"}],
+                    "next_cursor": "MQ==",
+                },
+                "MQ==": {
+                    "next_cursor": "LTE=",
+                    "data": [{"condition_id": "0x2", "question": "q2"}],
+                },
+            }
+        )
+        set_transport(transport)
+        client = ClobClient("http://clob")
+
+        self.assertEqual(
+            list(client.iter_markets(fields=["condition_id"])),
+            [{"condition_id": "0x1"}, {"condition_id": "0x2"}],
+        )
+        self.assertEqual(
+            transport.urls,
+            [
+                "http://clob/markets?next_cursor=MA==",
+                "http://clob/markets?next_cursor=MQ==",
+            ],
+        )
+
+        page = client.stream_sampling_markets()
+        self.assertEqual(len(list(page)), 1)
+        self.assertEqual(page.next_cursor, "MQ==")
+        self.assertEqual(
+            transport.urls[-1], "http://clob/sampling-markets?next_cursor=MA=="
+        )
+
+
+private_key = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+creds = ApiCreds(
+    api_key="000000000-0000-0000-0000-000000000000",
+    api_secret="AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=",
+    api_passphrase="0000000000000000000000000000000000000000000000000000000000000000",
+)
+
+
+class FakeOrdersServer:
+    def __init__(self, fail_batch=None):
+        self.requests = []
+        self.fail_batch = fail_batch
+        self.lock = threading.Lock()
+
+    def post(self, endpoint, headers=None, data=None):
+        with self.lock:
+            self.requests.append((headers, data))
+        orders = decode(data)
+        if (
+            self.fail_batch is not None
+            and orders[0]["order"]["salt"] in self.fail_batch
+        ):
+            raise PolyApiException(error_msg="batch rejected")
+        return [
+            {"success": True, "orderID": str(o["order"]["salt"]), "errorMsg": ""}
+            for o in orders
+        ]
+
+
+class TestPostOrders(TestCase):
+    def setUp(self):
+        self.client = ClobClient("http://clob", AMOY, key=private_key, creds=creds)
+        options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+        self.orders = [
+            self.client.builder.create_order(
+                OrderArgs(token_id="123", price=0.5, size=10 + i, side="BUY"), options
+            )
+            for i in range(POST_ORDERS_BATCH_SIZE + 5)
+        ]
+
+    def test_orders_are_posted_in_batches_with_one_hmac_each(self):
+        server = FakeOrdersServer()
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            results = self.client.post_orders(
+                [PostOrdersArgs(o, OrderType.GTC) for o in self.orders[:-1]]
+                + [(self.orders[-1], OrderType.FOK)]
+            )
+
+        self.assertEqual(
+            [r["orderID"] for r in results], [str(o.order["salt"]) for o in self.orders]
+        )
+        self.assertEqual(
+            sorted(len(decode(data)) for _, data in server.requests),
+            [5, POST_ORDERS_BATCH_SIZE],
+        )
+        for headers, data in server.requests:
+            self.assertEqual(
+                headers["POLY_SIGNATURE"],
+                build_hmac_signature(
+                    creds.api_secret,
+                    headers["POLY_TIMESTAMP"],
+                    "POST",
+                    "/orders",
+                    data,
+                ),
+            )
+            for o in decode(data):
+                self.assertEqual(o["owner"], creds.api_key)
+        last = [decode(d) for _, d in server.requests if len(decode(d)) == 5][0][-1]
+        self.assertEqual(last["orderType"], OrderType.FOK)
+
+    def test_tick_size_rejection_invalidates_the_cached_tick_size(self):
+        order = self.orders[0]
+        for failure in (
+            PolyApiException(error_msg={"error": "INVALID_ORDER_MIN_TICK_SIZE"}),
+            {"success": False, "errorMsg": "order breaks minimum tick size rule"},
+        ):
+            self.client.cache.set(TICK_SIZE, "123", "0.01")
+
+            def post(endpoint, headers=None, data=None):
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+
+            with patch("py_clob_client.client.post", side_effect=post):
+                try:
+                    self.client.post_order(order)
+                except PolyApiException:
+                    pass
+            self.assertIsNone(self.client.cache.get(TICK_SIZE, "123"))
+
+        # other rejections keep it
+        self.client.cache.set(TICK_SIZE, "123", "0.01")
+        rejection = {"success": False, "errorMsg": "not enough balance"}
+        with patch("py_clob_client.client.post", return_value=rejection):
+            self.client.post_order(order)
+        with patch("py_clob_client.client.post", return_value=[rejection]):
+            self.client.post_orders([(order, OrderType.GTC)])
+        self.assertEqual(self.client.cache.get(TICK_SIZE, "123"), "0.01")
+
+        with patch(
+            "py_clob_client.client.post",
+            return_value=[{"success": False, "errorMsg": "invalid tick size"}],
+        ):
+            self.client.post_orders([(order, OrderType.GTC)])
+        self.assertIsNone(self.client.cache.get(TICK_SIZE, "123"))
+
+    def test_failed_batch_is_reported_per_order(self):
+        server = FakeOrdersServer(fail_batch={self.orders[0].order["salt"]})
+        with patch("py_clob_client.client.post", side_effect=server.post):
+            with self.assertRaises(PolyBatchException) as ctx:
+                self.client.post_orders([(o, OrderType.GTC) for o in self.orders])
+
+        self.assertEqual(
+            sorted(ctx.exception.errors), list(range(POST_ORDERS_BATCH_SIZE))
+        )
+        results = ctx.exception.results
+        self.assertEqual(
+            results[:POST_ORDERS_BATCH_SIZE], [None] * POST_ORDERS_BATCH_SIZE
+        )
+        self.assertEqual(
+            [r["orderID"] for r in results[POST_ORDERS_BATCH_SIZE:]],
+            [str(o.order["salt"]) for o in self.orders[POST_ORDERS_BATCH_SIZE:]],
+        )
+
+    def test_malformed_batch_response_is_reported_per_order(self):
+        orders = [(o, OrderType.GTC) for o in self.orders[:3]]
+        for response in ({"error": "unexpected"}, [{"success": True}]):
+            with patch("py_clob_client.client.post", return_value=response):
+                with self.assertRaises(PolyBatchException) as ctx:
+                    self.client.post_orders(orders)
+            self.assertEqual(sorted(ctx.exception.errors), [0, 1, 2])
+            self.assertEqual(ctx.exception.results, [None] * 3)
+
+    def test_no_orders_sends_nothing(self):
+        with patch("py_clob_client.client.post") as post:
+            self.assertEqual(self.client.post_orders([]), [])
+        post.assert_not_called()
+        self.assertIsNone(self.client._ClobClient__batch_executor)
+
+
+class TestBuildLadder(TestCase):
+    def test_metadata_is_resolved_once(self):
+        client = ClobClient("http://clob", AMOY, key=private_key)
+        client.builder.signing_workers = 1
+        reads = []
+
+        def get(endpoint, headers=None, data=None):
+            reads.append(endpoint)
+            if "/tick-size" in endpoint:
+                return {"minimum_tick_size": 0.01}
+            return {"neg_risk": False}
+
+        with patch("py_clob_client.client.get", side_effect=get):
+            ladder = client.build_ladder("123", "BUY", [0.3, 0.31, 0.32], [5, 6, 7])
+            with self.assertRaises(Exception):
+                client.build_ladder("123", "BUY", [0.3, 0.995], 5)
+
+        self.assertEqual(
+            reads,
+            [
+                "http://clob/tick-size?token_id=123",
+                "http://clob/neg-risk?token_id=123",
+            ],
+        )
+        self.assertEqual(
+            [o.order["makerAmount"] for o in ladder], [1500000, 1860000, 2240000]
+        )
+
+
+class TestMarketOrderBookSnapshot(TestCase):
+    def setUp(self):
+        self.client = ClobClient("http://clob", AMOY, key=private_key)
+        self.reads = []
+
+    def get(self, endpoint, headers=None, data=None):
+        self.reads.append(endpoint.split("?")[0])
+        if "/tick-size" in endpoint:
+            return {"minimum_tick_size": 0.01}
+        if "/neg-risk" in endpoint:
+            return {"neg_risk": False}
+        return {
+            "market": "0xaabb",
+            "asset_id": "123",
+            "timestamp": "1",
+            "hash": "h",
+            "bids": [{"price": "0.4", "size": "100"}],
+            "asks": [{"price": "0.5", "size": "100"}, {"price": "0.6", "size": "100"}],
+        }
+
+    def test_snapshot_is_shared_with_the_order(self):
+        with patch("py_clob_client.client.get", side_effect=self.get):
+            book = self.client.get_book_snapshot("123")
+            self.assertEqual(book.buy.prices[0], 0.5)
+            args = MarketOrderArgs(token_id="123", amount=80, side="BUY")
+            order = self.client.create_market_order(args, book=book)
+
+        self.assertEqual(args.price, 0.6)
+        self.assertEqual(order.order["makerAmount"], 80000000)
+        self.assertEqual(self.reads.count("http://clob/book"), 1)
+
+    def test_stale_snapshot_is_refetched(self):
+        with patch("py_clob_client.client.get", side_effect=self.get):
+            book = self.client.get_book_snapshot("123")
+            book.fetched_at -= 10
+            self.client.create_market_order(
+                MarketOrderArgs(token_id="123", amount=10, side="SELL"), book=book
+            )
+            with self.assertRaises(Exception):
+                self.client.create_market_order(
+                    MarketOrderArgs(token_id="456", amount=10, side="SELL"), book=book
+                )
+
+        self.assertEqual(self.reads.count("http://clob/book"), 2)
+
+
+class TestClose(TestCase):
+    def test_close_releases_background_resources(self):
+        server = FakeBatchServer()
+        replica = LocalFeedServer()
+        replica.set_book("1", [("0.4", "10")], [("0.6", "7")])
+        try:
+            with ClobClient("http://clob", AMOY, key=private_key) as client:
+                client.builder.signing_workers = 2
+                client.builder.signing_pool_min_batch = 2
+                client.batch_chunk_size = 3
+                with patch(
+                    "py_clob_client.client.get",
+                    side_effect=lambda endpoint: (
+                        {"minimum_tick_size": 0.01}
+                        if "/tick-size" in endpoint
+                        else {"neg_risk": False}
+                    ),
+                ):
+                    client.build_ladder("123", "BUY", [0.3, 0.31], 5)
+                with patch("py_clob_client.client.post", side_effect=server.post):
+                    client.get_midpoints(
+                        [BookParams(token_id=str(i)) for i in range(5)]
+                    )
+                client.start_keep_warm(60)
+                book_replica = client.start_book_replica(["1"], url=replica.url)
+                self.assertTrue(book_replica.wait_synced(5))
+
+                pool = client.builder._signing_pool
+                self.assertIsNotNone(pool)
+        finally:
+            replica.close()
+
+        self.assertIsNone(client.builder._signing_pool)
+        with self.assertRaises(RuntimeError):
+            pool._executor.submit(print)
+        self.assertIsNone(client.book_replica)
+        self.assertIsNone(client._ClobClient__keep_warm_stop)
+        self.assertIsNone(client._ClobClient__batch_executor)
+        client.close()
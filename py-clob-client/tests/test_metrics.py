@@ -0,0 +1,123 @@
+from unittest import TestCase
+from urllib.request import urlopen
+
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers.helpers import get, post
+from py_clob_client.http_helpers.transport import set_transport
+from py_clob_client.metrics import (
+    InMemoryMetrics,
+    PrometheusExporter,
+    RequestEvent,
+    add_metrics_hook,
+    remove_metrics_hook,
+    path_template,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.text = content.decode("utf-8")
+
+    def json(self):
+        raise ValueError()
+
+
+class FakeTransport:
+    name = "fake"
+    errors = (ConnectionError,)
+
+    def request(self, method, url, headers=None, data=None):
+        if "down" in url:
+            raise ConnectionError()
+        if "missing" in url:
+            return FakeResponse(404, b"not found")
+        return FakeResponse(200, b'{"mid":"0.5"}')
+
+    def close(self):
+        pass
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        set_transport(FakeTransport())
+        self.metrics = InMemoryMetrics(buckets=(0.1, 1.0))
+        add_metrics_hook(self.metrics)
+
+    def tearDown(self):
+        remove_metrics_hook(self.metrics)
+        set_transport(None)
+
+    def test_path_template(self):
+        self.assertEqual(path_template("https://clob/book?token_id=1"), "/book")
+        self.assertEqual(
+            path_template("https://clob/markets/0xabc"), "/markets/{condition_id}"
+        )
+        self.assertEqual(
+            path_template("https://clob/markets?next_cursor=MA=="), "/markets"
+        )
+        self.assertEqual(
+            path_template("https://clob/data/order/0x1"), "/data/order/{order_id}"
+        )
+        self.assertEqual(
+            path_template("https://clob/live-activity/events/0x1"),
+            "/live-activity/events/{condition_id}",
+        )
+        self.assertEqual(path_template("https://clob"), "/")
+
+    def test_requests_are_recorded(self):
+        get("http://clob/midpoint?token_id=1")
+        post("http://clob/midpoints", data=[{"token_id": "1"}])
+        with self.assertRaises(PolyApiException):
+            get("http://clob/missing")
+        with self.assertRaises(PolyApiException):
+            get("http://down/book")
+
+        snapshot = self.metrics.snapshot()
+        mid = snapshot[("GET", "/midpoint")]
+        self.assertEqual(mid["count"], 1)
+        self.assertEqual(mid["bytes_in"], 13)
+        self.assertEqual(mid["statuses"], {("200", "ok"): 1})
+        self.assertEqual(snapshot[("POST", "/midpoints")]["bytes_out"], 18)
+        self.assertEqual(
+            snapshot[("GET", "/missing")]["statuses"], {("404", "http_error"): 1}
+        )
+        self.assertEqual(
+            snapshot[("GET", "/book")]["statuses"], {("", "transport_error"): 1}
+        )
+
+    def test_histogram_and_prometheus_text(self):
+        for duration in (0.05, 0.5, 5):
+            self.metrics.on_request(
+                RequestEvent("GET", "/book", duration, "ok", 200, 10, 100)
+            )
+        s = self.metrics.snapshot()[("GET", "/book")]
+        self.assertEqual(s["buckets"], [(0.1, 1), (1.0, 2)])
+
+        text = self.metrics.to_prometheus()
+        self.assertIn(
+            'clob_request_duration_seconds_bucket{method="GET",path="/book",le="1.0"} 2',
+            text,
+        )
+        self.assertIn(
+            'clob_request_duration_seconds_bucket{method="GET",path="/book",le="+Inf"} 3',
+            text,
+        )
+        self.assertIn(
+            'clob_request_bytes_total{method="GET",path="/book",direction="in"} 300',
+            text,
+        )
+        self.assertIn(
+            'clob_requests_total{method="GET",path="/book",status="200",outcome="ok"} 3',
+            text,
+        )
+
+    def test_exporter(self):
+        self.metrics.on_request(RequestEvent("GET", "/book", 0.05, "ok", 200))
+        exporter = PrometheusExporter(self.metrics, port=0).start()
+        try:
+            body = urlopen("http://127.0.0.1:{}/metrics".format(exporter.port)).read()
+        finally:
+            exporter.stop()
+        self.assertIn(b"clob_request_duration_seconds_count", body)
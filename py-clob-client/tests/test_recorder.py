@@ -0,0 +1,190 @@
+import os
+import tempfile
+import time
+import zlib
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_clob_client import recorder
+from py_clob_client.book import CompactBook
+from py_clob_client.client import ClobClient
+from py_clob_client.recorder import (
+    BLOCK_HEADER,
+    BookRecorder,
+    book_path,
+    read_book_file,
+    read_book_range,
+)
+from py_clob_client.replica import BookReplica
+from py_clob_client.utilities import parse_raw_orderbook_summary
+
+from .feed_server import LocalFeedServer
+
+DAY = 86400000
+# 2024-05-01T00:00:00Z
+MAY_1 = 1714521600000
+
+
+def raw_book(token_id, timestamp, n):
+    return {
+        "market": "0xaabbcc",
+        "asset_id": token_id,
+        "timestamp": str(timestamp),
+        "bids": [{"price": str((10 + i) / 100), "size": str(i + 1)} for i in range(n)],
+        "asks": [{"price": "0.9", "size": "{}.5".format(n)}],
+        "hash": "",
+    }
+
+
+def levels(book):
+    summary = book.to_summary()
+    return summary.bids, summary.asks
+
+
+class TestBookRecorder(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_partitioned_by_token_and_day(self):
+        rec = BookRecorder(self.root, flush_every=2)
+        raws = [
+            raw_book("1", MAY_1 + 1000, 3),
+            raw_book("2", MAY_1 + 2000, 0),
+            raw_book("1", MAY_1 + 3000, 1),
+            raw_book("1", MAY_1 + DAY + 5, 2),
+            raw_book("1", MAY_1 + 4000, 5),
+        ]
+        for raw in raws:
+            rec.record(CompactBook.from_raw(raw))
+        rec.record(parse_raw_orderbook_summary(raw_book("2", MAY_1 + 6000, 2)))
+        # the first two books of token 1 went to the writer as one block
+        rec._queue.join()
+        self.assertTrue(os.path.exists(book_path(self.root, "1", "2024-05-01")))
+        rec.flush()
+
+        books = read_book_file(book_path(self.root, "1", "2024-05-01"))
+        self.assertEqual(books.asset_id, "1")
+        self.assertEqual(
+            list(books.timestamps), [MAY_1 + 1000, MAY_1 + 3000, MAY_1 + 4000]
+        )
+        self.assertEqual(list(books.n_bids), [3, 1, 5])
+        for i, raw in zip(range(3), (raws[0], raws[2], raws[4])):
+            self.assertEqual(levels(books.book(i)), levels(CompactBook.from_raw(raw)))
+
+        self.assertEqual([len(b) for b in read_book_range(self.root, "1")], [3, 1])
+        self.assertEqual(
+            [len(b) for b in read_book_range(self.root, "1", "2024-05-02")], [1]
+        )
+        self.assertEqual(
+            [list(b.n_bids) for b in read_book_range(self.root, "2")], [[0, 2]]
+        )
+        self.assertEqual(list(read_book_range(self.root, "3")), [])
+
+    def test_partial_block_is_skipped(self):
+        rec = BookRecorder(self.root, flush_every=1)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1, 2)))
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1 + 1, 4)))
+        rec.stop()
+        path = book_path(self.root, "1", "2024-05-01")
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        self.assertEqual(list(read_book_file(path).n_bids), [2])
+
+    def test_append_after_crash_drops_partial_block(self):
+        rec = BookRecorder(self.root, flush_every=1)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1, 2)))
+        rec.stop()
+        path = book_path(self.root, "1", "2024-05-01")
+        with open(path, "rb") as f:
+            block = f.read()
+        # a crash in the middle of writing a second block
+        with open(path, "ab") as f:
+            f.write(block[: len(block) // 2])
+
+        # a new recorder after the restart appends to the same day
+        rec = BookRecorder(self.root, flush_every=1)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1 + 1, 4)))
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1 + 2, 1)))
+        rec.stop()
+
+        self.assertEqual(list(read_book_file(path).n_bids), [2, 4, 1])
+
+    def test_corrupt_block_raises(self):
+        rec = BookRecorder(self.root)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1, 2)))
+        rec.stop()
+        path = book_path(self.root, "1", "2024-05-01")
+        with open(path, "r+b") as f:
+            f.seek(BLOCK_HEADER.size + 2)
+            f.write(b"\xff\xff\xff\xff")
+
+        with self.assertRaises(zlib.error):
+            read_book_file(path)
+
+    def test_flush_raises_write_errors(self):
+        rec = BookRecorder(self.root)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1, 2)))
+        with patch.object(rec, "_write", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                rec.flush()
+        rec.stop()
+
+    def test_read_without_numpy(self):
+        rec = BookRecorder(self.root)
+        rec.record(CompactBook.from_raw(raw_book("1", MAY_1, 2)))
+        rec.flush()
+        path = book_path(self.root, "1", "2024-05-01")
+        expected = levels(read_book_file(path).book(0))
+
+        with patch.object(recorder, "np", None):
+            books = read_book_file(path)
+        self.assertEqual(books.prices.typecode, "i")
+        self.assertEqual(levels(books.book(0)), expected)
+
+    def test_capture_through_books_endpoint(self):
+        client = ClobClient("http://clob")
+        rec = BookRecorder(self.root, client, ["1", "2"])
+
+        def post(endpoint, headers=None, data=None):
+            return [raw_book(item["token_id"], MAY_1, 2) for item in data]
+
+        with patch("py_clob_client.client.post", side_effect=post):
+            self.assertEqual(rec.capture(), 2)
+        rec.stop()
+
+        for token_id in ("1", "2"):
+            books = read_book_file(book_path(self.root, token_id, "2024-05-01"))
+            self.assertEqual(len(books), 1)
+
+    def test_records_replica_updates(self):
+        server = LocalFeedServer()
+        server.set_book("1", [("0.4", "10")], [("0.6", "7")])
+        replica = BookReplica(["1"], server.url)
+        rec = BookRecorder(self.root)
+        rec.attach(replica)
+        try:
+            replica.start()
+            self.assertTrue(replica.wait_synced(5))
+            server.change("1", "0.45", "BUY", "3")
+            server.change("1", "0.6", "SELL", "0")
+            deadline = time.monotonic() + 5
+            while rec.recorded < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            replica.stop()
+            server.close()
+        rec.flush()
+
+        day = recorder.book_day(int(server.books["1"]["timestamp"]))
+        books = read_book_file(book_path(self.root, "1", day))
+        self.assertEqual(len(books), 3)
+        last = books.book(2).to_summary()
+        self.assertEqual(
+            [(l.price, l.size) for l in last.bids], [("0.4", "10"), ("0.45", "3")]
+        )
+        self.assertEqual(last.asks, [])
@@ -0,0 +1,210 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from py_clob_client.cache import TICK_SIZE
+from py_clob_client.client import ClobClient
+from py_clob_client.replica import BookReplica, ReplicaBook
+
+from .feed_server import LocalFeedServer, book_hash
+
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def levels(book, side):
+    return [(l.price, l.size) for l in getattr(book, side)]
+
+
+class TestReplicaBook(TestCase):
+    def test_snapshot_and_changes(self):
+        book = ReplicaBook("1")
+        book.apply_snapshot(
+            {
+                "market": "0xaa",
+                "timestamp": "5",
+                "buys": [{"price": "0.4", "size": "10"}, {"price": "0.3", "size": "5"}],
+                "sells": [{"price": "0.6", "size": "7"}],
+            }
+        )
+        book.apply_change("0.45", "BUY", "3")
+        book.apply_change("0.3", "BUY", "0")
+        book.apply_change("0.55", "SELL", "1")
+
+        summary = book.summary()
+        self.assertEqual(levels(summary, "bids"), [("0.4", "10"), ("0.45", "3")])
+        self.assertEqual(levels(summary, "asks"), [("0.6", "7"), ("0.55", "1")])
+        self.assertTrue(book.matches(book_hash(summary.__dict__)))
+
+
+class TestBookReplica(TestCase):
+    def setUp(self):
+        self.server = LocalFeedServer()
+        self.server.set_book("1", [("0.4", "10"), ("0.3", "5")], [("0.6", "7")])
+        self.server.set_book("2", [("0.1", "1")], [("0.9", "1")])
+        self.fetches = []
+
+    def tearDown(self):
+        self.replica.stop()
+        self.server.close()
+
+    def start(self, **kwargs):
+        self.replica = BookReplica(["1", "2"], self.server.url, **kwargs).start()
+        self.assertTrue(self.replica.wait_synced(5))
+
+    def fetch(self, token_id):
+        self.fetches.append(token_id)
+        return self.server.raw_book(token_id)
+
+    def assertReplicated(self, token_id):
+        raw = self.server.books[token_id]
+        self.assertTrue(
+            wait_until(
+                lambda: getattr(
+                    self.replica.get_order_book(token_id), "timestamp", None
+                )
+                == raw["timestamp"]
+            )
+        )
+        book = self.replica.get_order_book(token_id)
+        self.assertEqual(
+            levels(book, "bids"), [(l["price"], l["size"]) for l in raw["bids"]]
+        )
+        self.assertEqual(
+            levels(book, "asks"), [(l["price"], l["size"]) for l in raw["asks"]]
+        )
+
+    def test_snapshots_and_deltas_are_applied(self):
+        self.start()
+        self.assertEqual(self.server.subscriptions[0]["assets_ids"], ["1", "2"])
+        self.assertEqual(self.server.subscriptions[0]["type"], "market")
+
+        self.server.change("1", "0.45", "BUY", "4")
+        self.server.change("1", "0.3", "BUY", "0")
+        self.server.change("1", "0.58", "SELL", "2")
+        self.server.change("2", "0.9", "SELL", "3")
+
+        self.assertReplicated("1")
+        self.assertReplicated("2")
+        self.assertEqual(self.replica.stats["deltas"], 4)
+        self.assertEqual(self.replica.stats["mismatches"], 0)
+        self.assertIsNone(self.replica.get_order_book("3"))
+
+    def test_hash_mismatch_is_resynced_from_rest(self):
+        self.start(fetch=self.fetch)
+
+        self.server.change("1", "0.45", "BUY", "4", hash="bad")
+
+        self.assertTrue(wait_until(lambda: self.fetches == ["1"]))
+        self.assertEqual(self.replica.stats["mismatches"], 1)
+        self.assertReplicated("1")
+
+    def test_feed_is_read_while_resync_fetches(self):
+        release = threading.Event()
+
+        def fetch(token_id):
+            self.fetches.append(token_id)
+            release.wait(5)
+            return self.server.raw_book(token_id)
+
+        self.start(fetch=fetch)
+        self.server.change("1", "0.45", "BUY", "4", hash="bad")
+        self.assertTrue(wait_until(lambda: self.fetches == ["1"]))
+
+        # the other token keeps updating while the fetch is blocked
+        self.server.change("2", "0.1", "BUY", "2")
+        self.assertReplicated("2")
+        self.assertIsNone(self.replica.get_order_book("1"))
+
+        release.set()
+        self.assertReplicated("1")
+
+    def test_failed_resync_is_retried(self):
+        def fetch(token_id):
+            self.fetches.append(token_id)
+            if len(self.fetches) == 1:
+                raise Exception("server unavailable")
+            return self.server.raw_book(token_id)
+
+        self.start(fetch=fetch)
+        self.server.change("1", "0.45", "BUY", "4", hash="bad")
+
+        self.assertTrue(wait_until(lambda: len(self.fetches) == 2))
+        self.assertReplicated("1")
+        self.assertEqual(self.replica.stats["resyncs"], 1)
+
+    def test_per_level_price_changes(self):
+        self.start()
+
+        self.server.change_levels(
+            [
+                ("1", "0.45", "BUY", "4"),
+                ("2", "0.9", "SELL", "0"),
+                ("1", "0.6", "SELL", "2"),
+            ]
+        )
+
+        self.assertReplicated("1")
+        self.assertReplicated("2")
+        self.assertEqual(self.replica.stats["deltas"], 3)
+        self.assertEqual(self.replica.stats["mismatches"], 0)
+
+    def test_hash_mismatch_without_fetch_resubscribes(self):
+        self.start()
+
+        self.server.change("1", "0.45", "BUY", "4", hash="bad")
+
+        self.assertTrue(wait_until(lambda: len(self.server.subscriptions) == 2))
+        self.assertTrue(self.replica.wait_synced(5))
+        self.assertReplicated("1")
+
+    def test_dropped_feed_reconnects(self):
+        self.start()
+
+        self.server.drop()
+        self.assertTrue(wait_until(lambda: len(self.server.subscriptions) == 2))
+        self.server.change("2", "0.1", "BUY", "0")
+
+        self.assertReplicated("2")
+        self.assertGreaterEqual(self.replica.stats["reconnects"], 1)
+
+
+class TestClientBookReplica(TestCase):
+    def test_get_order_book_reads_the_replica(self):
+        server = LocalFeedServer()
+        server.set_book("1", [("0.4", "10")], [("0.6", "7")])
+        client = ClobClient("http://clob")
+        try:
+            replica = client.start_book_replica(["1"], url=server.url)
+            self.assertTrue(replica.wait_synced(5))
+
+            with patch("py_clob_client.client.get") as get:
+                book = client.get_order_book("1")
+            get.assert_not_called()
+            self.assertEqual(book.hash, server.books["1"]["hash"])
+            self.assertEqual(levels(book, "asks"), [("0.6", "7")])
+
+            client.cache.set(TICK_SIZE, "1", "0.01")
+            server.broadcast(
+                {
+                    "event_type": "tick_size_change",
+                    "asset_id": "1",
+                    "market": "0xaabbcc",
+                    "old_tick_size": "0.01",
+                    "new_tick_size": "0.001",
+                }
+            )
+            self.assertTrue(
+                wait_until(lambda: client.cache.get(TICK_SIZE, "1") == "0.001")
+            )
+            self.assertEqual(replica.stats["tick_size_changes"], 1)
+        finally:
+            client.stop_book_replica()
+            server.close()
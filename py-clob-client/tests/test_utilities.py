@@ -1,9 +1,15 @@
+import hashlib
+import random
+from dataclasses import replace
 from unittest import TestCase
 
+from py_clob_client.book import CompactBook
 from py_clob_client.clob_types import (
     OrderArgs,
     OrderType,
     CreateOrderOptions,
+    OrderBookSummary,
+    OrderSummary,
 )
 from py_clob_client.constants import AMOY
 from py_clob_client.order_builder.constants import BUY, SELL
@@ -12,9 +18,12 @@ from py_clob_client.order_builder.builder import OrderBuilder
 from py_clob_client.utilities import (
     parse_raw_orderbook_summary,
     generate_orderbook_summary_hash,
+    orderbook_summary_hash,
     order_to_json,
     is_tick_size_smaller,
     price_valid,
+    chunked,
+    merge_batch_results,
 )
 
 
@@ -164,6 +173,69 @@ class TestUtilities(TestCase):
             "6d754a2f0304a83544f91a076fa3faa9cbfb9f63",
         )
 
+    def test_orderbook_summary_hash(self):
+        def legacy_hash(orderbook):
+            copy = replace(orderbook, hash="")
+            return hashlib.sha1(str(copy.json).encode("utf-8")).hexdigest()
+
+        rng = random.Random(0)
+        books = [
+            OrderBookSummary(market="0xaabbcc", asset_id="100", hash="abc"),
+            OrderBookSummary(
+                market='0xaabbcc\u00e9"\\',
+                asset_id="100",
+                timestamp=123456789,
+                bids=[OrderSummary(price="0.3", size="100")],
+                asks=[],
+            ),
+        ]
+        for _ in range(50):
+            books.append(
+                OrderBookSummary(
+                    market="0x" + "%064x" % rng.getrandbits(256),
+                    asset_id=str(rng.getrandbits(250)),
+                    timestamp=str(rng.randint(0, 10**13)),
+                    bids=[
+                        OrderSummary(
+                            price=str(rng.randint(1, 999) / 1000),
+                            size=str(rng.randint(1, 10**6) / 100),
+                        )
+                        for _ in range(rng.randint(0, 40))
+                    ],
+                    asks=[
+                        OrderSummary(
+                            price=str(rng.randint(1, 999) / 1000),
+                            size=str(rng.randint(1, 10**6)),
+                        )
+                        for _ in range(rng.randint(0, 40))
+                    ],
+                    hash="0" * 40,
+                )
+            )
+
+        for book in books:
+            before = replace(book)
+            self.assertEqual(orderbook_summary_hash(book), legacy_hash(book))
+            self.assertEqual(book, before)
+
+        compact = CompactBook.from_raw(
+            {
+                "market": "0xaabbcc",
+                "asset_id": "100",
+                "timestamp": "1",
+                "bids": [{"price": "0.3", "size": "100"}],
+                "asks": [
+                    {"price": "0.7", "size": "1.50"},
+                    {"price": "0.6", "size": "2.5"},
+                ],
+                "hash": "abc",
+            }
+        )
+        self.assertEqual(
+            orderbook_summary_hash(compact), legacy_hash(compact.to_summary())
+        )
+        self.assertEqual(compact.hash, "abc")
+
     def test_order_to_json_0_1(self):
         # publicly known private key
         private_key = (
@@ -1561,3 +1633,19 @@ class TestUtilities(TestCase):
         self.assertFalse(price_valid(0.999, "0.1"))
         self.assertFalse(price_valid(0.9999, "0.1"))
         self.assertFalse(price_valid(0.99999, "0.1"))
+
+    def test_chunked(self):
+        self.assertEqual(chunked([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+        self.assertEqual(chunked([], 2), [])
+
+    def test_merge_batch_results(self):
+        self.assertEqual(merge_batch_results([[1, 2], None, [3]]), [1, 2, 3])
+        self.assertEqual(merge_batch_results([{"a": 1}, {"b": 2}]), {"a": 1, "b": 2})
+        self.assertIsNone(merge_batch_results([None]))
+        # the two sides of token "1" were sent in different chunks
+        self.assertEqual(
+            merge_batch_results(
+                [{"1": {"BUY": "0.4"}, "2": {"BUY": "0.1"}}, {"1": {"SELL": "0.6"}}]
+            ),
+            {"1": {"BUY": "0.4", "SELL": "0.6"}, "2": {"BUY": "0.1"}},
+        )
@@ -0,0 +1,119 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+
+from py_clob_client.client import ClobClient
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.metrics import (
+    HTTP_ERROR,
+    TRANSPORT_ERROR,
+    add_metrics_hook,
+    remove_metrics_hook,
+)
+from py_clob_client.http_helpers.transport import RequestsTransport, set_transport
+
+
+class TimeServer:
+    def __init__(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server.lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append(self.path)
+                time.sleep(0.05)
+                body = b"1700000000" if server.status == 200 else b"{}"
+                self.send_response(server.status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.lock = threading.Lock()
+        self.status = 200
+        self.connections = 0
+        self.requests = []
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = "http://127.0.0.1:{}".format(self.httpd.server_port)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class EventLog:
+    def __init__(self, events):
+        self.events = events
+
+    def on_request(self, event):
+        self.events.append(event)
+
+
+class TestWarmup(TestCase):
+    def setUp(self):
+        self.server = TimeServer()
+        set_transport(RequestsTransport())
+
+    def tearDown(self):
+        set_transport(None)
+        self.server.stop()
+
+    def test_warmup_opens_pooled_connections(self):
+        client = ClobClient(self.server.url)
+        self.assertEqual(client.warmup(connections=3), 1700000000)
+        self.assertEqual(self.server.connections, 3)
+        self.assertEqual(self.server.requests, ["/time"] * 3)
+
+        # later requests ride the warm connections
+        client.get_server_time()
+        client.get_server_time()
+        self.assertEqual(self.server.connections, 3)
+
+    def test_keep_warm(self):
+        client = ClobClient(self.server.url)
+        client.warmup(connections=1, keep_warm_interval=0.1)
+        time.sleep(0.45)
+        client.stop_keep_warm()
+        # let a refresh that was already in flight finish
+        time.sleep(0.1)
+        sent = len(self.server.requests)
+        self.assertGreaterEqual(sent, 3)
+        time.sleep(0.25)
+        self.assertEqual(len(self.server.requests), sent)
+
+    def test_warmup_errors(self):
+        events = []
+        hook = EventLog(events)
+        add_metrics_hook(hook)
+        try:
+            self.server.status = 503
+            with self.assertRaises(PolyApiException) as ctx:
+                ClobClient(self.server.url).warmup(connections=2)
+            self.assertEqual(ctx.exception.status_code, 503)
+
+            self.server.stop()
+            # drop the connections kept alive by the first warm-up
+            set_transport(RequestsTransport())
+            with self.assertRaises(PolyApiException) as ctx:
+                ClobClient(self.server.url).warmup(connections=1)
+            self.assertIsNone(ctx.exception.status_code)
+        finally:
+            remove_metrics_hook(hook)
+
+        self.assertEqual(
+            [(e.path, e.outcome) for e in events],
+            [("/time", HTTP_ERROR), ("/time", TRANSPORT_ERROR)],
+        )
+        self.assertEqual(events[0].status_code, 503)